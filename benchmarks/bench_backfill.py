@@ -0,0 +1,98 @@
+"""Benchmark rebuilding a range of daily reports: one run per day versus ``--from/--to``.
+
+Run with ``python -m benchmarks.bench_backfill --days 30 --per-day 20000``. Items are
+spread evenly over the days, then every report is rebuilt twice: once per day the way
+repeated ``--date`` runs do it (open, query, render; in-process, so without the cost
+of launching the CLI each time), and once through the backfill path (the days split
+into ``--jobs`` contiguous chunks, each read with one day-ordered query and rendered
+in its own process).
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from daily_brief_agent.commands.backfill import backfill_reports
+from daily_brief_agent.commands.common import open_db, write_daily_report
+from daily_brief_agent.config import AppConfig, DeliveryConfig, StorageConfig, TelegramConfig
+from daily_brief_agent.db import init_db, insert_items
+
+FIRST = date(2024, 1, 1)
+
+
+def _populate(conn: sqlite3.Connection, days: int, per_day: int, rng: random.Random) -> None:
+    start = datetime.combine(FIRST, datetime.min.time(), tzinfo=timezone.utc)
+    step = 86_400 / per_day
+    for day in range(days):
+        items = []
+        for index in range(per_day):
+            number = day * per_day + index
+            items.append(
+                {
+                    "id": f"item-{number}",
+                    "fetched_at_utc": (
+                        start + timedelta(days=day, seconds=step * index)
+                    ).isoformat(),
+                    "category": f"Category {rng.randrange(12)}",
+                    "source": f"Source {rng.randrange(60)}",
+                    "title": f"Story {rng.randrange(1_000_000):06d}",
+                    "link": f"https://bench.example/{number}",
+                }
+            )
+        insert_items(conn, items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--per-day", type=int, default=20_000)
+    parser.add_argument("--per-category-limit", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=None, help="Defaults to the CPU count")
+    parser.add_argument("--timezone", default="Europe/Istanbul")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = AppConfig(
+            storage=StorageConfig(db_path=Path(tmp) / "bench.sqlite", reports_dir=Path(tmp)),
+            feeds=[],
+            delivery=DeliveryConfig(telegram=TelegramConfig(enabled=False)),
+            timezone=args.timezone,
+        )
+        conn = sqlite3.connect(config.storage.db_path)
+        init_db(conn)
+        _populate(conn, args.days, args.per_day, random.Random(42))
+        conn.close()
+        days = [FIRST + timedelta(days=offset) for offset in range(args.days)]
+
+        started = time.perf_counter()
+        for day in days:
+            conn = open_db(config)
+            write_daily_report(conn, config, day, False, args.per_category_limit)
+            conn.close()
+        per_day_seconds = time.perf_counter() - started
+
+        backfill_args = argparse.Namespace(
+            from_date=days[0].isoformat(),
+            to_date=days[-1].isoformat(),
+            jobs=args.jobs,
+            per_category_limit=args.per_category_limit,
+        )
+        started = time.perf_counter()
+        backfill_reports(backfill_args, config, logging.getLogger("bench_backfill"))
+        backfill_seconds = time.perf_counter() - started
+
+    print(f"{args.days} days x {args.per_day} items, {os.cpu_count()} CPUs")
+    print(f"one run per day   {per_day_seconds:7.2f}s")
+    print(f"--from/--to       {backfill_seconds:7.2f}s  (jobs={args.jobs or os.cpu_count()})")
+
+
+if __name__ == "__main__":
+    main()
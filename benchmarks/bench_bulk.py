@@ -0,0 +1,72 @@
+"""Benchmark streaming export/import: rows per second and peak Python memory.
+
+Run with ``python -m benchmarks.bench_bulk --rows 1000000``. Synthetic items are
+bulk-loaded, exported to gzip NDJSON and CSV, and imported into a fresh database
+through ``insert_items`` batches. Throughput is timed without tracing; peak memory
+comes from a second run under ``tracemalloc`` and should stay flat as ``--rows``
+grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.bench_retention import _populate
+from daily_brief_agent.bulk import batched, iter_items, open_text, read_items, write_items
+from daily_brief_agent.db import init_db, insert_items
+from daily_brief_agent.dedup import NearDuplicateIndex
+
+
+def _measure(label: str, rows: int, call: Callable[[str], object]) -> None:
+    """Time one untraced run, then take peak memory from a second, traced run."""
+    started = time.perf_counter()
+    call("timed")
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    call("traced")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:18} {rows / elapsed:12,.0f} rows/s  peak {peak / 1_000_000:8.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = sqlite3.connect(Path(tmp) / "source.sqlite")
+        init_db(source)
+        _populate(source, args.rows, random.Random(42))
+
+        for fmt in ("ndjson", "csv"):
+            path = str(Path(tmp) / f"items.{fmt}.gz")
+
+            def export(run: str, fmt: str = fmt, path: str = path) -> None:
+                with open_text(path, "w") as handle:
+                    write_items(handle, iter_items(source), fmt)
+
+            def load(run: str, fmt: str = fmt, path: str = path) -> None:
+                target = sqlite3.connect(Path(tmp) / f"target-{fmt}-{run}.sqlite")
+                init_db(target)
+                near_duplicates = NearDuplicateIndex()
+                with open_text(path, "r") as handle:
+                    for batch in batched(read_items(handle, fmt), args.batch_size):
+                        insert_items(target, batch, near_duplicates)
+                target.close()
+
+            _measure(f"export {fmt}", args.rows, export)
+            _measure(f"import {fmt}", args.rows, load)
+        source.close()
+
+
+if __name__ == "__main__":
+    main()
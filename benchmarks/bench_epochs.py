@@ -0,0 +1,149 @@
+"""Benchmark day-range queries on ISO strings versus integer epoch columns.
+
+Run with ``python -m benchmarks.bench_epochs --rows 1000000``. A year of synthetic
+items, with RFC 822 publish dates, is stored through ``insert_items``. For a
+number of random days the same range is selected once with ``BETWEEN`` on the
+``fetched_at_utc`` strings and once on ``fetched_at_epoch`` (both indexes' sizes
+are printed), first counting rows (index only) and then reading the report
+columns; ``query_report_rows`` is timed by fetch and by publish date. Parsing the
+publish dates with ``parse_timestamp`` is compared with ``email.utils``, and with
+dates repeated through the cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable
+
+from daily_brief_agent.db import init_db, insert_items, query_report_rows
+from daily_brief_agent.utils.time import parse_timestamp, to_epoch
+
+END = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SPAN = timedelta(days=365)
+
+
+def _populate(conn: sqlite3.Connection, rows: int, rng: random.Random) -> list[str]:
+    step = SPAN / rows
+    start = END - SPAN
+    published = []
+    batch_size = 50_000
+    for offset in range(0, rows, batch_size):
+        items = []
+        for index in range(offset, min(offset + batch_size, rows)):
+            fetched = start + step * index
+            published_raw = format_datetime(
+                fetched - timedelta(minutes=rng.randrange(600)) if index % 9 else fetched
+            )
+            published.append(published_raw)
+            items.append(
+                {
+                    "id": f"item-{index}",
+                    "fetched_at_utc": fetched.isoformat(),
+                    "published_raw": published_raw,
+                    "category": f"Category {index % 7}",
+                    "source": f"Source {index % 50}",
+                    "title": f"Story {index}",
+                    "link": f"https://bench.example/{index}",
+                    "summary_raw": None,
+                }
+            )
+        insert_items(conn, items)
+    return published
+
+
+def _median_ms(days: list[datetime], call: Callable[[datetime, datetime], object]) -> float:
+    samples = []
+    for day in days:
+        started = time.perf_counter()
+        call(day, day + timedelta(days=1, microseconds=-1))
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30, help="Random days queried")
+    args = parser.parse_args()
+    rng = random.Random(5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.sqlite")
+        init_db(conn)
+        started = time.perf_counter()
+        published = _populate(conn, args.rows, rng)
+        print(f"{args.rows:,} rows stored in {time.perf_counter() - started:.1f}s")
+        days = [END - timedelta(days=rng.randrange(1, 365)) for _ in range(args.days)]
+        try:
+            sizes = conn.execute(
+                """
+                SELECT name, SUM(pgsize) FROM dbstat
+                WHERE name IN ('idx_items_fetched_at', 'idx_items_fetched_at_epoch')
+                GROUP BY name ORDER BY name
+                """
+            ).fetchall()
+        except sqlite3.OperationalError:
+            sizes = []  # SQLite built without the dbstat table
+        for name, size in sizes:
+            print(f"{name:28} {size / 1_000_000:8.1f} MB")
+
+        columns = "category, source, title, link, published_raw"
+        by_string = "fetched_at_utc BETWEEN ? AND ?"
+        by_epoch = "fetched_at_epoch BETWEEN ? AND ?"
+
+        def strings(start: datetime, end: datetime) -> tuple[str, str]:
+            return start.isoformat(), end.isoformat()
+
+        def epochs(start: datetime, end: datetime) -> tuple[int, int]:
+            return to_epoch(start), to_epoch(end)
+
+        cases = [
+            ("count, ISO strings", f"SELECT COUNT(*) FROM items WHERE {by_string}", strings),
+            ("count, epochs", f"SELECT COUNT(*) FROM items WHERE {by_epoch}", epochs),
+            ("rows, ISO strings", f"SELECT {columns} FROM items WHERE {by_string}", strings),
+            ("rows, epochs", f"SELECT {columns} FROM items WHERE {by_epoch}", epochs),
+        ]
+        for label, sql, bounds in cases:
+            milliseconds = _median_ms(
+                days,
+                lambda start, end, sql=sql, bounds=bounds: conn.execute(
+                    sql, bounds(start, end)
+                ).fetchall(),
+            )
+            print(f"{label:28} {milliseconds:8.2f} ms")
+        for by_published in (False, True):
+            milliseconds = _median_ms(
+                days,
+                lambda start, end, by_published=by_published: query_report_rows(
+                    conn, start, end, False, 30, by_published=by_published
+                ).fetchall(),
+            )
+            label = "report, by " + ("publish date" if by_published else "fetch date")
+            print(f"{label:28} {milliseconds:8.2f} ms")
+        conn.close()
+
+    distinct = published[:100_000]
+    # A feed repeats its dates across runs; the cache serves those.
+    repeated = published[:1000] * 100
+    for label, parse, sample in (
+        ("email.utils", lambda value: parsedate_to_datetime(value).timestamp(), distinct),
+        ("parse_timestamp", parse_timestamp.__wrapped__, distinct),
+        ("parse_timestamp, repeated", parse_timestamp, repeated),
+    ):
+        started = time.perf_counter()
+        for value in sample:
+            parse(value)
+        seconds = time.perf_counter() - started
+        print(f"{label:28} {seconds / len(sample) * 1e6:8.2f} µs per date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark large summaries stored as HTML plus excerpt versus excerpt only.
+
+Run with ``python -m benchmarks.bench_excerpts --summary-size 20000``. Generated
+feeds with large summaries are parsed with ``summary_html`` on and off; for each
+setting the parse throughput, peak Python memory of the parsed items, database
+size and the time and peak memory of reading every stored item back through
+``query_items_for_date`` are reported. The HTML run is also read back with
+``summary=True``, the way every query read before excerpts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.feedgen import FeedSpec, generate_feed
+from daily_brief_agent.db import init_db, insert_items, query_items_for_date
+from daily_brief_agent.fetchers.rss import parse_feed_bytes
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _traced(call: Callable[[], Any]) -> tuple[float, float, Any]:
+    """Return seconds of an untraced run, peak MB of a traced run, and the result."""
+    started = time.perf_counter()
+    call()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    result = call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1_000_000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=100, help="Entries per generated feed")
+    parser.add_argument("--summary-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    documents = [
+        generate_feed(
+            FeedSpec(name=f"feed{index}", entries=args.entries, summary_size=args.summary_size)
+        )
+        for index in range(args.feeds)
+    ]
+    megabytes = sum(len(document) for document in documents) / 1_000_000
+    print(f"{args.feeds * args.entries} entries, {megabytes:.1f} MB of feeds")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for summary_html in (True, False):
+            label = "html+excerpt" if summary_html else "excerpt only"
+
+            def parse(summary_html: bool = summary_html) -> list[dict[str, Any]]:
+                items = []
+                for document in documents:
+                    parsed, _ = parse_feed_bytes(
+                        document, "bench", "Bench", args.entries, summary_html=summary_html
+                    )
+                    items.extend(parsed)
+                return items
+
+            seconds, peak, items = _traced(parse)
+            print(
+                f"{label:13} parse {len(items) / seconds:9,.0f} entries/s  "
+                f"items peak {peak:7.1f} MB"
+            )
+
+            path = Path(tmp) / f"{label.replace(' ', '-')}.sqlite"
+            conn = sqlite3.connect(path)
+            init_db(conn)
+            for item in items:
+                item["fetched_at_utc"] = _EPOCH.isoformat()
+            insert_items(conn, items)
+            conn.execute("VACUUM")
+            size = path.stat().st_size / 1_000_000
+
+            reads = [("slim", False)] + ([("summary", True)] if summary_html else [])
+            for read, summary in reads:
+                seconds, peak, _ = _traced(
+                    lambda conn=conn, summary=summary: query_items_for_date(
+                        conn, _EPOCH, _EPOCH, include_history=True, summary=summary
+                    )
+                )
+                print(
+                    f"{label:13} query {read:7} {seconds * 1000:7.1f} ms  "
+                    f"rows peak {peak:7.1f} MB  db {size:6.1f} MB"
+                )
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark concurrent feed fetching against a local server with delayed feeds.
+
+Run with ``python -m benchmarks.bench_fetch_concurrency``. Each feed sleeps for a
+different delay before responding; sequential fetching scales with the sum of the
+delays while concurrent fetching scales with the slowest feed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from benchmarks.feedgen import FeedSpec, generate_feed
+from benchmarks.server import FeedServer
+from daily_brief_agent.config import FeedConfig
+from daily_brief_agent.fetchers.concurrent import fetch_feeds_concurrently
+from daily_brief_agent.fetchers.rss import fetch_feed
+
+
+def _run(feeds: list[FeedConfig], concurrency: int) -> float:
+    logger = logging.getLogger("bench")
+    started = time.perf_counter()
+    fetch_feeds_concurrently(
+        feeds,
+        lambda feed: fetch_feed(feed.name, feed.url, feed.category, 50, timeout=30),
+        logger,
+        concurrency=concurrency,
+        per_host_limit=concurrency,
+    )
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--max-delay", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    documents = {
+        f"feed-{index}": generate_feed(FeedSpec(name=f"feed-{index}", entries=5))
+        for index in range(args.feeds)
+    }
+    delays = [args.max_delay * (index + 1) / args.feeds for index in range(args.feeds)]
+
+    with FeedServer(documents) as server:
+        feeds = [
+            FeedConfig(
+                name=f"feed-{index}",
+                url=f"{server.url(f'feed-{index}')}?delay={delay:.3f}",
+                category="Bench",
+            )
+            for index, delay in enumerate(delays)
+        ]
+        sequential = _run(feeds, concurrency=1)
+        concurrent = _run(feeds, concurrency=args.concurrency)
+
+    print(f"feeds:             {args.feeds}")
+    print(f"sum of delays:     {sum(delays):.3f}s")
+    print(f"slowest feed:      {max(delays):.3f}s")
+    print(f"sequential:        {sequential:.3f}s")
+    print(f"concurrent ({args.concurrency:>3}):  {concurrent:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
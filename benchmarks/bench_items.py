@@ -0,0 +1,114 @@
+"""Benchmark memory of slotted ``Item`` records versus item dicts, ingest to render.
+
+Run with ``python -m benchmarks.bench_items --items 1000000``. Ingest builds every
+item of a run, once as the item dicts used before and once as ``Item``s, and keeps
+them all, as a run's batch or gathered results do. The items are stored, and then
+a report over all of them is rendered twice: once from ``sqlite3.Row`` rows copied
+into dicts, as before, and once from the ``Item``s that ``query_items_for_date``
+builds. Each step reports wall time of an untraced run and peak Python memory of a
+traced run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from daily_brief_agent.db import init_db, insert_items, query_items_for_date
+from daily_brief_agent.items import ITEM_COLUMNS, ITEM_FIELDS, Item
+from daily_brief_agent.reporting.markdown import generate_report
+
+FETCHED_AT = "2024-01-02T08:00:00+00:00"
+DAY = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def _traced(call: Callable[[], Any]) -> tuple[float, float, Any]:
+    """Return seconds of an untraced run, peak MB of a traced run, and the result."""
+    started = time.perf_counter()
+    call()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    result = call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1_000_000, result
+
+
+def _values(index: int) -> tuple[Any, ...]:
+    # Fresh strings per item, as parsing produces them, in ``Item`` field order.
+    return (
+        f"{index:064x}",
+        f"Category {index % 7}",
+        f"Source {index % 50}",
+        f"Story number {index} about markets and policy",
+        f"https://bench.example/articles/{index}",
+        "Tue, 02 Jan 2024 07:30:00 +0000",
+        None,
+        f"Excerpt of story {index}: " + "words " * 20,
+        index * 2654435761 % 2**63,
+        FETCHED_AT,
+    )
+
+
+def _as_dict(index: int) -> dict[str, Any]:
+    return dict(zip(ITEM_FIELDS[:10], _values(index), strict=True))
+
+
+def _render(rows: list[Any]) -> int:
+    generate_report(rows, DAY.date(), 30)
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    args = parser.parse_args()
+    count = args.items
+
+    def report(label: str, seconds: float, peak: float) -> None:
+        print(
+            f"{label:24} {seconds:7.2f}s  peak {peak:8.1f} MB  "
+            f"{peak * 1_000_000 / count:6.0f} B/item"
+        )
+
+    for label, build in (
+        ("ingest, dicts", lambda: [_as_dict(index) for index in range(count)]),
+        ("ingest, Item", lambda: [Item(*_values(index)) for index in range(count)]),
+    ):
+        seconds, peak, _ = _traced(build)
+        report(label, seconds, peak)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.sqlite")
+        init_db(conn)
+        started = time.perf_counter()
+        batch_size = 50_000
+        for offset in range(0, count, batch_size):
+            end = min(offset + batch_size, count)
+            insert_items(conn, [Item(*_values(index)) for index in range(offset, end)])
+        print(f"stored {count:,} items in {time.perf_counter() - started:.1f}s")
+
+        def rows_as_dicts() -> int:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.execute(f"SELECT {ITEM_COLUMNS} FROM items").fetchall()
+            return _render([dict(row) for row in rows])
+
+        def items() -> int:
+            return _render(query_items_for_date(conn, DAY, DAY, include_history=True))
+
+        for label, render in (("render, Row -> dict", rows_as_dicts), ("render, Item", items)):
+            seconds, peak, rendered = _traced(render)
+            assert rendered == count
+            report(label, seconds, peak)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark near-duplicate lookup throughput against a large stored corpus.
+
+Run with ``python -m benchmarks.bench_near_dedup --stored 1000000``. The store is
+bulk-loaded with random fingerprints, then ``insert_items`` runs with the LSH
+index over a batch where half of the titles are near-duplicates of stored ones.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from daily_brief_agent.db import init_db, insert_items
+from daily_brief_agent.dedup import NearDuplicateIndex
+from daily_brief_agent.utils.simhash import band_values
+
+FETCHED_AT = "2024-01-01T00:00:00+00:00"
+
+
+def _random_fingerprint(rng: random.Random) -> int:
+    return rng.getrandbits(64) - (1 << 63)
+
+
+def _populate(conn: sqlite3.Connection, stored: int, rng: random.Random) -> list[int]:
+    fingerprints = []
+    batch_size = 50_000
+    for offset in range(0, stored, batch_size):
+        rows = []
+        bands = []
+        for index in range(offset, min(offset + batch_size, stored)):
+            fingerprint = _random_fingerprint(rng)
+            fingerprints.append(fingerprint)
+            item_id = f"stored-{index}"
+            link = f"https://x.example/{index}"
+            rows.append(
+                (item_id, FETCHED_AT, "Bench", "Source", f"Title {index}", link, fingerprint)
+            )
+            bands.extend(
+                (band, value, item_id) for band, value in enumerate(band_values(fingerprint))
+            )
+        conn.executemany(
+            """
+            INSERT INTO items (id, fetched_at_utc, category, source, title, link, title_simhash)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.executemany(
+            "INSERT INTO title_simhash_bands (band, value, item_id) VALUES (?, ?, ?)", bands
+        )
+        conn.commit()
+    return fingerprints
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stored", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.sqlite")
+        init_db(conn)
+        started = time.perf_counter()
+        fingerprints = _populate(conn, args.stored, rng)
+        print(f"populated {args.stored} items in {time.perf_counter() - started:.1f}s")
+
+        batch = []
+        for index in range(args.batch):
+            if index % 2:
+                fingerprint = rng.choice(fingerprints) ^ (1 << rng.randrange(64))
+                fingerprint = (fingerprint + (1 << 63)) % (1 << 64) - (1 << 63)
+            else:
+                fingerprint = _random_fingerprint(rng)
+            batch.append(
+                {
+                    "id": f"new-{index}",
+                    "fetched_at_utc": FETCHED_AT,
+                    "category": "Bench",
+                    "source": "Other",
+                    "title": f"New {index}",
+                    "link": f"https://y.example/{index}",
+                    "title_simhash": fingerprint,
+                }
+            )
+
+        started = time.perf_counter()
+        insert_items(conn, batch, NearDuplicateIndex(max_distance=3))
+        elapsed = time.perf_counter() - started
+        clustered = conn.execute(
+            "SELECT COUNT(*) FROM items WHERE duplicate_of IS NOT NULL"
+        ).fetchone()[0]
+        conn.close()
+
+    print(f"inserted {args.batch} items in {elapsed:.2f}s ({args.batch / elapsed:,.0f} items/s)")
+    print(f"near-duplicates linked: {clustered}")
+
+
+if __name__ == "__main__":
+    main()
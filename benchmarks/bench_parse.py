@@ -0,0 +1,58 @@
+"""Benchmark feed parse throughput: streaming fast path versus feedparser.
+
+Run with ``python -m benchmarks.bench_parse --entries 500 --max-entries 50``. Each
+generated feed is parsed with ``parse_feed_bytes`` twice, once with the fast path and
+once forced through feedparser, and entries/s are reported per format.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.feedgen import FeedSpec, generate_feed
+from daily_brief_agent.fetchers.rss import parse_feed_bytes
+
+
+def _throughput(documents: list[bytes], max_entries: int, fast: bool) -> tuple[float, int]:
+    started = time.perf_counter()
+    parsed = 0
+    for document in documents:
+        items, _ = parse_feed_bytes(document, "bench", "Bench", max_entries, fast=fast)
+        parsed += len(items)
+    return time.perf_counter() - started, parsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=500, help="Entries per generated feed")
+    parser.add_argument("--max-entries", type=int, default=None, help="Defaults to --entries")
+    parser.add_argument("--summary-size", type=int, default=400)
+    args = parser.parse_args()
+    max_entries = args.max_entries or args.entries
+
+    for fmt in ("rss", "atom"):
+        documents = [
+            generate_feed(
+                FeedSpec(
+                    name=f"feed{index}",
+                    entries=args.entries,
+                    summary_size=args.summary_size,
+                    fmt=fmt,
+                    seed=index,
+                )
+            )
+            for index in range(args.feeds)
+        ]
+        megabytes = sum(len(document) for document in documents) / 1_000_000
+        for label, fast in (("feedparser", False), ("fast", True)):
+            seconds, parsed = _throughput(documents, max_entries, fast)
+            print(
+                f"{fmt:4} {label:10} {parsed} entries from {megabytes:.1f} MB in {seconds:.2f}s "
+                f"({parsed / seconds:,.0f} entries/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
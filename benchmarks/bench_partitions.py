@@ -0,0 +1,79 @@
+"""Benchmark date-bounded reads: one ``items`` table vs. monthly partitions.
+
+Run with ``python -m benchmarks.bench_partitions --rows 2000000``. A year of
+synthetic items is bulk-loaded into one database, which is then split with
+``migrate_to_partitions``. The report and item queries for a recent day are timed
+against both layouts, along with the migration itself and the size of the index
+that a new insert has to touch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from benchmarks.bench_retention import END, _median_ms, _populate
+from daily_brief_agent.db import init_db, query_items_for_date, query_report_rows
+from daily_brief_agent.partitions import (
+    attach_partitions,
+    migrate_to_partitions,
+    months_between,
+    partition_path,
+)
+from daily_brief_agent.retention import database_size
+
+
+def _measure(conn: sqlite3.Connection, runs: int) -> dict[str, float]:
+    day_start = END - timedelta(days=2)
+    day_end = day_start + timedelta(days=1)
+    return {
+        "report ms": _median_ms(
+            runs, lambda: query_report_rows(conn, day_start, day_end, False, 30).fetchall()
+        ),
+        "items ms": _median_ms(
+            runs, lambda: query_items_for_date(conn, day_start, day_end, False)
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.sqlite")
+        init_db(conn)
+        started = time.perf_counter()
+        _populate(conn, args.rows, rng)
+        print(f"inserted {args.rows} items in {time.perf_counter() - started:.1f}s")
+        single_size = database_size(conn)
+        single = _measure(conn, args.runs)
+
+        partitions_dir = Path(tmp) / "partitions"
+        started = time.perf_counter()
+        moved = migrate_to_partitions(conn, partitions_dir)
+        print(f"migrated into {len(moved)} partitions in {time.perf_counter() - started:.1f}s")
+        day_start = END - timedelta(days=2)
+        months = attach_partitions(
+            conn, partitions_dir, months_between(day_start, day_start + timedelta(days=1))
+        )
+        partitioned = _measure(conn, args.runs)
+        single["file MB"] = single_size / 1_000_000
+        newest = partition_path(partitions_dir, months[-1])
+        partitioned["file MB"] = newest.stat().st_size / 1_000_000
+
+        for label in single:
+            print(f"{label:18} single {single[label]:10.1f}  partition {partitioned[label]:10.1f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
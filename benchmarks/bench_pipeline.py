@@ -0,0 +1,146 @@
+"""Benchmark the staged ingest pipeline against fetch-everything-then-insert.
+
+Run with ``python -m benchmarks.bench_pipeline --feeds 40 --entries 500``. Feeds are
+served from a local server with delays spread up to ``--max-delay``. The baseline
+fetches and parses every feed on the fetch threads, gathers all items and stores
+them with one ``insert_items`` call; the pipeline runs once parsing on a thread
+(``parse_workers: 0``) and once in a process pool. Each run writes a fresh
+database. Wall time comes from an untraced run and peak Python memory of the main
+process from a second, traced run; per-stage throughput and queue waits are
+printed for the pipeline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.feedgen import FeedSpec, generate_feed
+from benchmarks.server import FeedServer
+from daily_brief_agent.config import FeedConfig, FetchConfig
+from daily_brief_agent.db import init_db, insert_items
+from daily_brief_agent.fetchers.concurrent import fetch_feeds_concurrently
+from daily_brief_agent.fetchers.rss import fetch_feed
+from daily_brief_agent.pipeline import IngestResult, ParseOptions, ingest_feeds
+
+FETCHED_AT = "2024-01-02T08:00:00+00:00"
+
+
+def _measure(label: str, call: Callable[[str], int]) -> None:
+    started = time.perf_counter()
+    items = call("timed")
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    call("traced")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:22} {elapsed:7.2f}s  {items / elapsed:9,.0f} items/s  "
+        f"peak {peak / 1_000_000:7.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=40)
+    parser.add_argument("--entries", type=int, default=500, help="Entries per generated feed")
+    parser.add_argument("--summary-size", type=int, default=1000)
+    parser.add_argument("--max-delay", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    logger = logging.getLogger("bench")
+
+    documents = {
+        f"feed-{index}": generate_feed(
+            FeedSpec(
+                name=f"feed-{index}",
+                entries=args.entries,
+                summary_size=args.summary_size,
+                seed=index,
+            )
+        )
+        for index in range(args.feeds)
+    }
+    megabytes = sum(map(len, documents.values())) / 1_000_000
+    print(f"{args.feeds} feeds x {args.entries} entries, {megabytes:.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp, FeedServer(documents) as server:
+        feeds = [
+            FeedConfig(
+                name=f"feed-{index}",
+                url=f"{server.url(f'feed-{index}')}?delay={delay:.3f}",
+                category="Bench",
+            )
+            for index, delay in enumerate(
+                args.max_delay * (index + 1) / args.feeds for index in range(args.feeds)
+            )
+        ]
+
+        def database(name: str) -> sqlite3.Connection:
+            conn = sqlite3.connect(Path(tmp) / f"{name}.sqlite", check_same_thread=False)
+            init_db(conn)
+            return conn
+
+        def gather(run: str) -> int:
+            results = fetch_feeds_concurrently(
+                feeds,
+                lambda feed: fetch_feed(feed.name, feed.url, feed.category, args.entries),
+                logger,
+                concurrency=args.concurrency,
+                per_host_limit=args.concurrency,
+            )
+            items = [item for _, feed_items in results for item in feed_items]
+            for item in items:
+                item["fetched_at_utc"] = FETCHED_AT
+            conn = database(f"gather-{run}")
+            inserted = insert_items(conn, items)
+            conn.close()
+            return inserted
+
+        last: dict[str, IngestResult] = {}
+
+        def pipeline(run: str, parse_workers: int) -> int:
+            conn = database(f"pipeline-{parse_workers}-{run}")
+            fetch = FetchConfig(
+                concurrency=args.concurrency,
+                per_host_limit=args.concurrency,
+                parse_workers=parse_workers,
+            )
+            result = ingest_feeds(
+                feeds,
+                {},
+                lambda items: insert_items(conn, items),
+                fetch,
+                ParseOptions(max_entries=args.entries),
+                FETCHED_AT,
+                logger,
+            )
+            conn.close()
+            last[run] = result
+            return result.inserted
+
+        _measure("fetch all, then insert", gather)
+        for parse_workers in (0, args.parse_workers):
+            _measure(
+                f"pipeline, {parse_workers} processes",
+                lambda run, parse_workers=parse_workers: pipeline(run, parse_workers),
+            )
+            result = last["timed"]
+            for name, stats in result.stages.items():
+                print(
+                    f"  {name:8} {stats.processed / result.seconds:9,.1f} {stats.unit}/s  "
+                    f"busy {stats.busy_seconds:6.2f}s  waiting {stats.wait_seconds:6.2f}s"
+                    f"  ({stats.workers} workers)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark the payload archive: stored size with repeated bodies, and replay rate.
+
+Run with ``python -m benchmarks.bench_replay --feeds 40 --fetches 10 --entries 200``.
+Each feed is "fetched" ``--fetches`` times, an hour apart, and every second body
+repeats the one before, as a feed that did not change between two runs. The
+archive's size is compared with the raw bytes fetched. The archive is then
+replayed into a fresh database, once parsing in the main process
+(``parse_workers: 0``) and once on one process per CPU.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
+
+from benchmarks.feedgen import FeedSpec, generate_feed
+from daily_brief_agent.config import FeedConfig, FetchConfig
+from daily_brief_agent.db import init_db, insert_items
+from daily_brief_agent.fetchers.rss import FeedDownload
+from daily_brief_agent.payloads import PayloadArchive
+from daily_brief_agent.pipeline import ParseOptions, replay_payloads
+from daily_brief_agent.utils.hashing import sha256_bytes_hex
+
+START = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=40)
+    parser.add_argument("--fetches", type=int, default=10, help="Fetches per feed")
+    parser.add_argument("--entries", type=int, default=200, help="Entries per body")
+    parser.add_argument("--summary-size", type=int, default=1000)
+    args = parser.parse_args()
+    logger = logging.getLogger("bench")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PayloadArchive(Path(tmp) / "payloads", max_bytes=10**12)
+        raw_bytes = 0
+        started = time.perf_counter()
+        for fetch in range(args.fetches):
+            fetched_at = (START + timedelta(hours=fetch)).isoformat()
+            for index in range(args.feeds):
+                name = f"feed{index}"
+                body = generate_feed(
+                    FeedSpec(
+                        name=name,
+                        entries=args.entries,
+                        summary_size=args.summary_size,
+                        seed=fetch // 2,
+                    )
+                )
+                raw_bytes += len(body)
+                feed = FeedConfig(name=name, url=f"https://{name}.example/rss", category="Tech")
+                download = FeedDownload(
+                    body, "application/rss+xml", feed.url, None, None, sha256_bytes_hex(body)
+                )
+                archive.add(feed, download, fetched_at)
+        elapsed = time.perf_counter() - started
+        print(
+            f"archived {args.feeds * args.fetches} fetches in {elapsed:.2f}s: "
+            f"{raw_bytes / 1_000_000:.1f} MB raw -> {archive.total_bytes / 1_000_000:.1f} MB "
+            f"({archive.stored} bodies stored, {archive.reused} repeats)"
+        )
+
+        fetches = archive.fetches()
+        options = ParseOptions(max_entries=args.entries)
+        for label, workers in (("replay, in process", 0), ("replay, processes", None)):
+            db_path = Path(tmp) / f"replay-{workers}.sqlite"
+            conn = sqlite3.connect(db_path)
+            init_db(conn)
+            fetch = FetchConfig(parse_workers=workers)
+            result = replay_payloads(
+                archive, fetches, partial(insert_items, conn), fetch, options, logger
+            )
+            conn.close()
+            shown = workers if workers is not None else os.cpu_count()
+            print(
+                f"{label:20} {result.seconds:7.2f}s on {shown} workers  "
+                f"{result.fetches / result.seconds:7.1f} parsed/s ({result.unchanged} unchanged)  "
+                f"{result.items / result.seconds:9,.0f} items/s  {result.inserted:,} stored"
+            )
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
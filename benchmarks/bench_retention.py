@@ -0,0 +1,116 @@
+"""Benchmark retention: database size and query latency before and after.
+
+Run with ``python -m benchmarks.bench_retention --rows 5000000``. A year of synthetic
+items is bulk-loaded through ``insert_items``. Then a policy that compresses
+summaries after 30 days and archives items after 180 is applied. Database size,
+report query latency for a recent day, and search latency are measured before and
+after, along with how long retention itself took.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from daily_brief_agent.config import RetentionConfig, RetentionPolicy
+from daily_brief_agent.db import init_db, insert_items, query_report_rows, search_items
+from daily_brief_agent.retention import apply_retention, database_size
+
+_WORDS = (
+    "market policy launch update report growth security cloud model data energy climate "
+    "court league election startup research chip network health science review"
+).split()
+
+END = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SPAN = timedelta(days=365)
+
+
+def _populate(conn: sqlite3.Connection, rows: int, rng: random.Random) -> None:
+    step = SPAN / rows
+    start = END - SPAN
+    batch_size = 50_000
+    for offset in range(0, rows, batch_size):
+        items = []
+        for index in range(offset, min(offset + batch_size, rows)):
+            words = [rng.choice(_WORDS) for _ in range(60)]
+            items.append(
+                {
+                    "id": f"item-{index}",
+                    "fetched_at_utc": (start + step * index).isoformat(),
+                    "category": f"Category {index % 7}",
+                    "source": f"Source {index % 50}",
+                    "title": " ".join(words[:8]).capitalize(),
+                    "link": f"https://bench.example/{index}",
+                    "summary_raw": "<p>" + " ".join(words) + "</p>",
+                }
+            )
+        insert_items(conn, items)
+
+
+def _median_ms(runs: int, call) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def _measure(conn: sqlite3.Connection, runs: int) -> dict[str, float]:
+    day_start = END - timedelta(days=2)
+    return {
+        "size MB": database_size(conn) / 1_000_000,
+        "report ms": _median_ms(
+            runs,
+            lambda: query_report_rows(
+                conn, day_start, day_start + timedelta(days=1), False, 30
+            ).fetchall(),
+        ),
+        "search ms": _median_ms(runs, lambda: search_items(conn, "climate court")),
+        "recent search ms": _median_ms(
+            runs, lambda: search_items(conn, "climate court", since_utc=day_start)
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.sqlite")
+        init_db(conn)
+        started = time.perf_counter()
+        _populate(conn, args.rows, rng)
+        print(f"inserted {args.rows} items in {time.perf_counter() - started:.1f}s")
+        before = _measure(conn, args.runs)
+
+        config = RetentionConfig(
+            policies=[RetentionPolicy(compress_after_days=30, archive_after_days=180)],
+            archive_dir=Path(tmp) / "archive",
+        )
+        started = time.perf_counter()
+        result = apply_retention(conn, config, END)
+        elapsed = time.perf_counter() - started
+        archive_bytes = sum(path.stat().st_size for path in result.archive_files)
+        print(
+            f"retention: archived {result.archived}, compressed {result.compressed} "
+            f"in {elapsed:.1f}s; archive files {archive_bytes / 1_000_000:.1f} MB"
+        )
+        after = _measure(conn, args.runs)
+        for label in before:
+            print(f"{label:18} before {before[label]:10.1f}  after {after[label]:10.1f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark full-text search latency over a large stored corpus.
+
+Run with ``python -m benchmarks.bench_search --stored 1000000``. Items are bulk-loaded
+through ``insert_items`` (so the FTS triggers index them), then ``search_items`` runs
+rare, common and prefix queries with and without filters, and median/p95 latency is
+reported for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from daily_brief_agent.db import init_db, insert_items, rebuild_search_index, search_items
+
+_COMMON = (
+    "market policy launch update report growth security cloud model data energy climate "
+    "court league election startup research chip network health science review"
+).split()
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _word(rng: random.Random) -> str:
+    # A few very common words plus a long tail of rarer ones.
+    if rng.random() < 0.3:
+        return rng.choice(_COMMON)
+    return f"term{int(rng.paretovariate(0.8)) % 200_000}"
+
+
+def _populate(conn: sqlite3.Connection, stored: int, rng: random.Random) -> None:
+    batch_size = 50_000
+    for offset in range(0, stored, batch_size):
+        items = []
+        for index in range(offset, min(offset + batch_size, stored)):
+            items.append(
+                {
+                    "id": f"item-{index}",
+                    "fetched_at_utc": (START + timedelta(seconds=30 * index)).isoformat(),
+                    "category": f"Category {index % 7}",
+                    "source": f"Source {index % 50}",
+                    "title": " ".join(_word(rng) for _ in range(8)).capitalize(),
+                    "link": f"https://bench.example/{index}",
+                    "summary_raw": "<p>" + " ".join(_word(rng) for _ in range(40)) + "</p>",
+                }
+            )
+        insert_items(conn, items)
+
+
+def _latencies(conn: sqlite3.Connection, runs: int, **kwargs) -> tuple[float, float, int]:
+    samples = []
+    hits = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        hits = len(search_items(conn, **kwargs))
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.median(samples), p95, hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stored", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--rebuild", action="store_true", help="Also time a full rebuild")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.sqlite")
+        init_db(conn)
+        started = time.perf_counter()
+        _populate(conn, args.stored, rng)
+        print(f"inserted and indexed {args.stored} items in {time.perf_counter() - started:.1f}s")
+        if args.rebuild:
+            started = time.perf_counter()
+            rebuild_search_index(conn)
+            print(f"rebuilt index in {time.perf_counter() - started:.1f}s")
+
+        # The last ~10% of the corpus, as items are stored in fetch order.
+        since = START + timedelta(seconds=30 * args.stored * 0.9)
+        cases = {
+            "rare term": {"query": "term1000"},
+            "mid-frequency term": {"query": "term20"},
+            "two common terms": {"query": "climate court"},
+            "prefix": {"query": "elect*"},
+            "common + category": {"query": "energy", "category": "Category 3"},
+            "common + since": {"query": "energy", "since_utc": since},
+            "common + source + since": {
+                "query": "energy",
+                "source": "Source 7",
+                "since_utc": since,
+            },
+        }
+        for label, kwargs in cases.items():
+            median, p95, hits = _latencies(conn, args.runs, **kwargs)
+            print(
+                f"{label:24} median {median * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms  "
+                f"({hits} results)"
+            )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
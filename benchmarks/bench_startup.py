@@ -0,0 +1,106 @@
+"""Benchmark CLI startup: import time and time to first useful work.
+
+Run with ``python -m benchmarks.bench_startup --runs 10``. Three measurements, each
+in fresh interpreters:
+
+* ``import daily_brief_agent.cli`` under ``-X importtime`` (cumulative microseconds
+  of the CLI module, plus the slowest modules it pulls in);
+* wall time of ``search`` against a small database with a cold config cache (YAML
+  parsed and validated) and a warm one;
+* which heavy third-party modules each command ends up importing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HEAVY_MODULES = ("feedparser", "requests", "yaml", "dotenv")
+
+CONFIG = """\
+storage:
+  db_path: "{workdir}/bench.sqlite"
+  reports_dir: "{workdir}/reports"
+feeds:
+  - name: "Example"
+    url: "https://example.com/rss"
+    category: "Tech"
+timezone: "UTC"
+"""
+
+
+def _import_profile(args: list[str], env: dict[str, str]) -> dict[str, tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` from ``-X importtime``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    profile: dict[str, tuple[int, int]] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def _wall_time(args: list[str], env: dict[str, str]) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *args], capture_output=True, env=env, check=True)
+    return time.perf_counter() - started
+
+
+def _summary(samples: list[float]) -> str:
+    return f"median {statistics.median(samples) * 1000:7.1f} ms  min {min(samples) * 1000:7.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config_path = workdir / "config.yaml"
+        config_path.write_text(CONFIG.format(workdir=workdir.as_posix()), encoding="utf-8")
+        env = {**os.environ, "DAILY_BRIEF_AGENT_CACHE_DIR": str(workdir / "cache")}
+        search = ["-m", "daily_brief_agent", "search", "anything", "--config", str(config_path)]
+
+        imports = []
+        for _ in range(args.runs):
+            profile = _import_profile(["-c", "import daily_brief_agent.cli"], env)
+            imports.append(profile["daily_brief_agent.cli"][1] / 1_000_000)
+        print(f"import daily_brief_agent.cli  {_summary(imports)}")
+        slowest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)[:8]
+        listed = ", ".join(f"{name} {us / 1000:.1f}ms" for name, (us, _) in slowest)
+        print(f"  slowest modules (self): {listed}")
+
+        cold = []
+        warm = []
+        for _ in range(args.runs):
+            cold_env = {**env, "DAILY_BRIEF_AGENT_CACHE_DIR": tempfile.mkdtemp(dir=workdir)}
+            cold.append(_wall_time(search, cold_env))
+            warm.append(_wall_time(search, cold_env))
+        print(f"search, cold config cache     {_summary(cold)}")
+        print(f"search, warm config cache     {_summary(warm)}")
+
+        commands = {
+            "search (warm cache)": search,
+            "--print-config": [*search[:2], "--config", str(config_path), "--print-config"],
+        }
+        for label, command in commands.items():
+            loaded = [name for name in HEAVY_MODULES if name in _import_profile(command, env)]
+            print(f"{label}: heavy modules imported: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
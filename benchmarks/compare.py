@@ -0,0 +1,56 @@
+"""Compare two benchmark result files and fail on regressions.
+
+Usage: ``python -m benchmarks.compare baseline.json candidate.json --threshold 0.10``.
+Exits with status 1 when any stage/size pair present in both runs got slower by
+more than ``threshold`` (a fraction of the baseline time).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _load(path: str) -> dict[tuple[str, int], dict[str, Any]]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {(result["stage"], result["size"]): result for result in payload["results"]}
+
+
+def compare(
+    baseline: dict[tuple[str, int], dict[str, Any]],
+    candidate: dict[tuple[str, int], dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Print a comparison table and return the regressed ``stage@size`` keys."""
+    regressions: list[str] = []
+    print(f"{'stage':>7} {'size':>9} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before = baseline[key]["seconds"]
+        after = candidate[key]["seconds"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(f"{key[0]}@{key[1]}")
+        print(f"{key[0]:>7} {key[1]:>9,} {before:>9.3f}s {after:>9.3f}s {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    regressions = compare(_load(args.baseline), _load(args.candidate), args.threshold)
+    if regressions:
+        print(f"Regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
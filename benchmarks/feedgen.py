@@ -0,0 +1,105 @@
+"""Synthetic RSS/Atom feed generator for benchmarks."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+_WORDS = (
+    "market policy launch update report growth security cloud model data energy climate "
+    "court league election startup research chip network health science review"
+).split()
+
+
+@dataclass(frozen=True)
+class FeedSpec:
+    """Shape of a generated feed.
+
+    ``duplicate_ratio`` is the fraction of entries whose link repeats an earlier
+    entry's link, exercising ID-based deduplication.
+    """
+
+    name: str = "synthetic"
+    entries: int = 100
+    summary_size: int = 200
+    duplicate_ratio: float = 0.0
+    fmt: str = "rss"
+    seed: int = 0
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _summary(rng: random.Random, size: int) -> str:
+    parts: list[str] = []
+    length = 0
+    while length < size:
+        sentence = _sentence(rng, 12) + "."
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return f"<p>{' '.join(parts)[:size]}</p>"
+
+
+def generate_entries(spec: FeedSpec) -> list[dict[str, str]]:
+    rng = random.Random(f"{spec.seed}:{spec.name}")
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    entries: list[dict[str, str]] = []
+    for index in range(spec.entries):
+        if entries and rng.random() < spec.duplicate_ratio:
+            link = rng.choice(entries)["link"]
+        else:
+            link = f"https://{spec.name}.example/articles/{spec.seed}/{index}"
+        entries.append(
+            {
+                "title": _sentence(rng, 8),
+                "link": link,
+                "published": base - timedelta(minutes=index),
+                "summary": _summary(rng, spec.summary_size),
+            }
+        )
+    return entries
+
+
+def generate_feed(spec: FeedSpec) -> bytes:
+    """Return the encoded RSS 2.0 or Atom document described by ``spec``."""
+    entries = generate_entries(spec)
+    if spec.fmt == "atom":
+        body = "".join(
+            "<entry>"
+            f"<title>{escape(entry['title'])}</title>"
+            f'<link rel="alternate" href="{escape(entry["link"])}"/>'
+            f"<id>{escape(entry['link'])}#{index}</id>"
+            f"<updated>{entry['published'].isoformat()}</updated>"
+            f'<summary type="html">{escape(entry["summary"])}</summary>'
+            "</entry>"
+            for index, entry in enumerate(entries)
+        )
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom">'
+            f"<title>{escape(spec.name)}</title><id>urn:{escape(spec.name)}</id>"
+            "<updated>2024-01-01T00:00:00+00:00</updated>"
+            f"{body}</feed>"
+        )
+    elif spec.fmt == "rss":
+        body = "".join(
+            "<item>"
+            f"<title>{escape(entry['title'])}</title>"
+            f"<link>{escape(entry['link'])}</link>"
+            f"<pubDate>{format_datetime(entry['published'])}</pubDate>"
+            f"<description>{escape(entry['summary'])}</description>"
+            "</item>"
+            for entry in entries
+        )
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(spec.name)}</title><link>https://{escape(spec.name)}.example/</link>"
+            f"{body}</channel></rss>"
+        )
+    else:
+        raise ValueError(f"Unknown feed format: {spec.fmt}")
+    return document.encode("utf-8")
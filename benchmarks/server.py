@@ -0,0 +1,58 @@
+"""Local HTTP server that serves synthetic feeds with tunable latency."""
+
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class FeedServer:
+    """Serve in-memory feed documents on ``127.0.0.1``.
+
+    ``latency`` delays every response; a ``?delay=<seconds>`` query parameter
+    overrides it per request. Use as a context manager.
+    """
+
+    def __init__(self, feeds: dict[str, bytes] | None = None, latency: float = 0.0) -> None:
+        self.feeds: dict[str, bytes] = dict(feeds or {})
+        self.latency = latency
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                parts = urlsplit(self.path)
+                delay = parse_qs(parts.query).get("delay")
+                time.sleep(float(delay[0]) if delay else server.latency)
+                body = server.feeds.get(parts.path.lstrip("/"))
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        return _Handler
+
+    def url(self, name: str) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{name}"
+
+    def __enter__(self) -> FeedServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,181 @@
+"""Per-stage benchmark suite: fetch, parse, hash, insert, query and render.
+
+Run with ``python -m benchmarks.suite --sizes 10000 100000 1000000 --output run.json``
+and compare two runs with ``python -m benchmarks.compare``. Everything runs
+offline: feeds come from ``benchmarks.feedgen`` and are served by
+``benchmarks.server.FeedServer``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import requests
+
+from benchmarks.feedgen import FeedSpec, generate_feed
+from benchmarks.server import FeedServer
+from daily_brief_agent.config import FeedConfig
+from daily_brief_agent.db import init_db, insert_items, query_report_rows
+from daily_brief_agent.fetchers.concurrent import fetch_feeds_concurrently
+from daily_brief_agent.fetchers.rss import parse_feed_bytes
+from daily_brief_agent.reporting.markdown import write_report
+from daily_brief_agent.utils.hashing import sha256_hex
+from daily_brief_agent.utils.urls import canonicalize_url
+
+STAGES = ("fetch", "parse", "hash", "insert", "query", "render")
+FETCHED_AT = "2024-01-01T12:00:00+00:00"
+RESULTS_VERSION = 1
+
+
+def _timed(func: Callable[[], Any]) -> tuple[float, Any]:
+    started = time.perf_counter()
+    value = func()
+    return time.perf_counter() - started, value
+
+
+def _documents(args: argparse.Namespace, size: int) -> dict[str, bytes]:
+    feeds = math.ceil(size / args.entries_per_feed)
+    documents = {}
+    for index in range(feeds):
+        entries = min(args.entries_per_feed, size - index * args.entries_per_feed)
+        spec = FeedSpec(
+            name=f"feed{index}",
+            entries=entries,
+            summary_size=args.summary_size,
+            duplicate_ratio=args.duplicate_ratio,
+            fmt="atom" if index % 2 else "rss",
+            seed=size,
+        )
+        documents[spec.name] = generate_feed(spec)
+    return documents
+
+
+def _bench_size(args: argparse.Namespace, size: int, workdir: Path) -> list[dict[str, Any]]:
+    stages = set(args.stages)
+    documents = _documents(args, size)
+    results: list[dict[str, Any]] = []
+
+    def record(stage: str, seconds: float, items: int, **extra: Any) -> None:
+        results.append(
+            {
+                "stage": stage,
+                "size": size,
+                "items": items,
+                "seconds": round(seconds, 6),
+                "items_per_second": round(items / seconds, 1) if seconds else None,
+                **extra,
+            }
+        )
+        print(f"{stage:>7} {size:>9,} items  {seconds:9.3f}s")
+
+    if "fetch" in stages:
+        with FeedServer(documents, latency=args.latency) as server:
+            feeds = [FeedConfig(name, server.url(name), "Bench") for name in documents]
+            session = requests.Session()
+            seconds, fetched = _timed(
+                lambda: fetch_feeds_concurrently(
+                    feeds,
+                    lambda feed: session.get(feed.url, timeout=60).content,
+                    logging.getLogger("bench"),
+                    concurrency=args.concurrency,
+                    per_host_limit=args.concurrency,
+                )
+            )
+        total_bytes = sum(len(body) for _, body in fetched)
+        record("fetch", seconds, size, bytes=total_bytes)
+
+    items: list[dict[str, Any]] = []
+
+    def parse_all() -> None:
+        for index, (name, body) in enumerate(documents.items()):
+            parsed, _ = parse_feed_bytes(body, name, f"Category {index % 7}", size)
+            items.extend(parsed)
+
+    seconds, _ = _timed(parse_all)
+    if "parse" in stages:
+        record("parse", seconds, len(items))
+
+    if "hash" in stages:
+        links = [item["link"] for item in items]
+        seconds, _ = _timed(lambda: [sha256_hex(canonicalize_url(link)) for link in links])
+        record("hash", seconds, len(links))
+
+    for item in items:
+        item["fetched_at_utc"] = FETCHED_AT
+    db_path = workdir / f"bench-{size}.sqlite"
+    conn = sqlite3.connect(db_path)
+    init_db(conn)
+    seconds, inserted = _timed(lambda: insert_items(conn, items))
+    if "insert" in stages:
+        record("insert", seconds, len(items), inserted=inserted)
+    items.clear()
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 1, 23, 59, 59, tzinfo=timezone.utc)
+    if "query" in stages:
+        seconds, rows = _timed(
+            lambda: list(query_report_rows(conn, start, end, False, args.per_category_limit))
+        )
+        record("query", seconds, len(rows))
+
+    if "render" in stages:
+        rows = query_report_rows(conn, start, end, False, args.per_category_limit)
+        with open(os.devnull, "w", encoding="utf-8") as sink:
+            seconds, _ = _timed(
+                lambda: write_report(rows, date(2024, 1, 1), args.per_category_limit, sink)
+            )
+        record("render", seconds, inserted)
+    conn.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--entries-per-feed", type=int, default=500)
+    parser.add_argument("--summary-size", type=int, default=400)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.0, help="Server delay in seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--per-category-limit",
+        type=int,
+        default=1_000_000_000,
+        help="Report limit for query/render; the default renders every item",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            results.extend(_bench_size(args, size, Path(tmp)))
+
+    payload = {
+        "version": RESULTS_VERSION,
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "params": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
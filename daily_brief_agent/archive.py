@@ -0,0 +1,126 @@
+"""Compressed NDJSON archive for items moved out of the database."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+
+ARCHIVE_GLOB = "items-*.ndjson.gz"
+
+
+def _month(fetched_at_utc: str) -> str:
+    return fetched_at_utc[:7]
+
+
+class ArchiveWriter:
+    """Append item dicts to per-month archive files; ``close`` publishes them."""
+
+    def __init__(self, archive_dir: Path, run_stamp: str, compresslevel: int = 6) -> None:
+        self.archive_dir = archive_dir
+        self.run_stamp = run_stamp
+        self.compresslevel = compresslevel
+        self.count = 0
+        self._files: dict[str, tuple[Path, BinaryIO, gzip.GzipFile]] = {}
+
+    def write(self, item: dict[str, Any]) -> None:
+        month = _month(item["fetched_at_utc"])
+        if month not in self._files:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            path = self.archive_dir / f"items-{month}-{self.run_stamp}.ndjson.gz"
+            suffix = 1
+            # Several databases (partitions) may archive the same month in one run.
+            while path.exists():
+                path = self.archive_dir / f"items-{month}-{self.run_stamp}-{suffix}.ndjson.gz"
+                suffix += 1
+            raw = open(path.with_name(f".{path.name}.tmp"), "wb")
+            self._files[month] = (
+                path,
+                raw,
+                gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self.compresslevel),
+            )
+        line = json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._files[month][2].write(line.encode("utf-8"))
+        self.count += 1
+
+    def close(self) -> list[Path]:
+        """Flush every file to disk and move it into place; returns the published paths."""
+        published = []
+        for path, raw, compressed in self._files.values():
+            compressed.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+            raw.close()
+            os.replace(raw.name, path)
+            published.append(path)
+        self._files.clear()
+        return sorted(published)
+
+    def discard(self) -> None:
+        for _, raw, compressed in self._files.values():
+            compressed.close()
+            raw.close()
+            os.unlink(raw.name)
+        self._files.clear()
+
+
+def archive_files(
+    archive_dir: Path, since_utc: datetime | None = None, until_utc: datetime | None = None
+) -> list[Path]:
+    """Return archive files that may hold items fetched in ``[since_utc, until_utc)``."""
+    first = since_utc.strftime("%Y-%m") if since_utc is not None else None
+    last = until_utc.strftime("%Y-%m") if until_utc is not None else None
+    files = []
+    for path in sorted(archive_dir.glob(ARCHIVE_GLOB)):
+        month = path.name[len("items-") : len("items-YYYY-MM")]
+        if (first is None or month >= first) and (last is None or month <= last):
+            files.append(path)
+    return files
+
+
+def iter_archive(
+    archive_dir: Path,
+    since_utc: datetime | None = None,
+    until_utc: datetime | None = None,
+    category: str | None = None,
+    source: str | None = None,
+    contains: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream archived items matching every given filter, fetched in ``[since_utc, until_utc)``."""
+    since = since_utc.isoformat() if since_utc is not None else None
+    until = until_utc.isoformat() if until_utc is not None else None
+    needle = contains.casefold() if contains else None
+    seen: set[str] = set()
+    for path in archive_files(archive_dir, since_utc, until_utc):
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                item = json.loads(line)
+                fetched_at = item["fetched_at_utc"]
+                if since is not None and fetched_at < since:
+                    continue
+                if until is not None and fetched_at >= until:
+                    continue
+                if category is not None and item["category"] != category:
+                    continue
+                if source is not None and item["source"] != source:
+                    continue
+                if needle is not None:
+                    summary = item.get("summary_raw") or item.get("excerpt") or ""
+                    text = f"{item['title']}\n{summary}".casefold()
+                    if needle not in text:
+                        continue
+                if item["id"] in seen:
+                    continue
+                seen.add(item["id"])
+                yield item
+
+
+def count_archived(paths: Iterable[Path]) -> int:
+    total = 0
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            total += sum(1 for _ in handle)
+    return total
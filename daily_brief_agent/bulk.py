@@ -0,0 +1,176 @@
+"""Streaming bulk export and import of items as NDJSON or CSV, optionally gzipped."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator
+
+from daily_brief_agent.utils.hashing import sha256_hex
+from daily_brief_agent.utils.simhash import simhash64
+from daily_brief_agent.utils.text import EXCERPT_LENGTH, html_excerpt
+from daily_brief_agent.utils.urls import canonicalize_url
+
+FORMATS = ("ndjson", "csv")
+
+COLUMNS = (
+    "id",
+    "fetched_at_utc",
+    "published_raw",
+    "category",
+    "source",
+    "title",
+    "link",
+    "summary_raw",
+    "title_simhash",
+    "duplicate_of",
+    "excerpt",
+)
+
+_REQUIRED = ("fetched_at_utc", "category", "source", "title", "link")
+
+
+def detect_format(path: str) -> str:
+    """Guess ``ndjson`` or ``csv`` from a file name, ignoring a ``.gz`` suffix."""
+    name = path.removesuffix(".gz").lower()
+    return "csv" if name.endswith(".csv") else "ndjson"
+
+
+@contextmanager
+def open_text(path: str, mode: str, compress: bool | None = None) -> Iterator[IO[str]]:
+    """Open ``path`` (``-`` for stdin/stdout) as UTF-8 text, gzipped per ``compress`` or ``.gz``."""
+    if compress is None:
+        compress = path.endswith(".gz")
+    if path == "-":
+        raw = sys.stdin.buffer if mode == "r" else sys.stdout.buffer
+        binary: IO[bytes] = gzip.GzipFile(fileobj=raw, mode=mode + "b") if compress else raw
+        # newline="" leaves line endings to the csv module and to json.
+        handle = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        try:
+            yield handle
+        finally:
+            handle.flush()
+            handle.detach()
+            if compress:
+                binary.close()
+        return
+    if compress:
+        handle = gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    else:
+        handle = open(path, mode, encoding="utf-8", newline="")
+    with handle:
+        yield handle
+
+
+def iter_items(
+    conn: sqlite3.Connection,
+    since_utc: datetime | None = None,
+    until_utc: datetime | None = None,
+    category: str | None = None,
+    source: str | None = None,
+    batch_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """Stream stored items in fetch order, ``batch_size`` rows per ``fetchmany``."""
+    clauses, params = [], []
+    if since_utc is not None:
+        clauses.append("fetched_at_utc >= ?")
+        params.append(since_utc.isoformat())
+    if until_utc is not None:
+        clauses.append("fetched_at_utc < ?")
+        params.append(until_utc.isoformat())
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+    if source is not None:
+        clauses.append("source = ?")
+        params.append(source)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    columns = ", ".join(
+        "summary_text(summary_raw)" if column == "summary_raw" else column for column in COLUMNS
+    )
+    # Ordering by the indexed column alone streams from the index without a sort.
+    cursor = conn.execute(f"SELECT {columns} FROM items {where} ORDER BY fetched_at_utc", params)
+    while rows := cursor.fetchmany(batch_size):
+        for row in rows:
+            yield dict(zip(COLUMNS, row, strict=True))
+
+
+def write_items(handle: IO[str], items: Iterable[dict[str, Any]], fmt: str) -> int:
+    """Write items to ``handle`` as NDJSON or CSV (with a header); returns the count."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(handle, fieldnames=COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        for item in items:
+            writer.writerow(item)
+            count += 1
+        return count
+    for item in items:
+        handle.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def _utc_timestamp(value: str) -> str:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def normalize_item(
+    record: dict[str, Any], excerpt_length: int = EXCERPT_LENGTH, summary_html: bool = True
+) -> dict[str, Any]:
+    """Turn an imported record into an item dict as the fetcher would build it."""
+    for column in _REQUIRED:
+        if record.get(column) in (None, ""):
+            raise ValueError(f"missing {column}")
+    link = record["link"].strip()
+    fingerprint = record.get("title_simhash")
+    summary = record.get("summary_raw") or None
+    return {
+        "id": record.get("id") or sha256_hex(canonicalize_url(link)),
+        "fetched_at_utc": _utc_timestamp(record["fetched_at_utc"]),
+        "published_raw": record.get("published_raw") or None,
+        "category": record["category"],
+        "source": record["source"],
+        "title": record["title"],
+        "link": link,
+        "summary_raw": summary if summary_html else None,
+        "title_simhash": (
+            simhash64(record["title"]) if fingerprint in (None, "") else int(fingerprint)
+        ),
+        "excerpt": record.get("excerpt") or html_excerpt(summary, excerpt_length),
+    }
+
+
+def read_items(
+    handle: IO[str], fmt: str, excerpt_length: int = EXCERPT_LENGTH, summary_html: bool = True
+) -> Iterator[dict[str, Any]]:
+    """Parse NDJSON or CSV records one at a time into normalized item dicts."""
+    records: Iterable[Any]
+    if fmt == "csv":
+        records = csv.DictReader(handle)
+    else:
+        records = (line for line in handle if line.strip())
+    for number, record in enumerate(records, start=1):
+        try:
+            item = normalize_item(
+                record if fmt == "csv" else json.loads(record), excerpt_length, summary_html
+            )
+        except (ValueError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Record {number}: {exc}") from exc
+        yield item
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -4,18 +4,12 @@ from __future__ import annotations
 
 import argparse
 import logging
-import sqlite3
 import sys
 from pathlib import Path
+from typing import Sequence
 
-from dotenv import load_dotenv
-
-from daily_brief_agent.config import AppConfig, ConfigError, load_config
-from daily_brief_agent.db import init_db, insert_items, query_items_for_date
-from daily_brief_agent.delivery.telegram import send_telegram_message
-from daily_brief_agent.fetchers.rss import fetch_feed
-from daily_brief_agent.reporting.markdown import generate_report
-from daily_brief_agent.utils.time import date_range_utc, get_timezone, parse_date, utc_now
+from daily_brief_agent.config import AppConfig, ConfigError, default_cache_dir, load_config
+from daily_brief_agent.partitions import MAX_ATTACHED, stored_months
 
 
 def _configure_logging(verbose: bool) -> logging.Logger:
@@ -27,102 +21,346 @@ def _configure_logging(verbose: bool) -> logging.Logger:
     return logging.getLogger("daily_brief_agent")
 
 
+DEFAULT_MAX_PER_FEED = 50
+DEFAULT_PER_CATEGORY_LIMIT = 30
+
+# Fetch-run options, rejected with a subcommand that does not declare them too.
+_RUN_OPTIONS = {
+    "date": "--date",
+    "from_date": "--from",
+    "to_date": "--to",
+    "jobs": "--jobs",
+    "max_per_feed": "--max-per-feed",
+    "per_category_limit": "--per-category-limit",
+    "include_history": "--include-history",
+    "no_telegram": "--no-telegram",
+    "dry_run": "--dry-run",
+    "print_config": "--print-config",
+}
+_COMMAND_OPTIONS = {
+    "serve": {"max_per_feed", "per_category_limit", "include_history"},
+    "replay": {"max_per_feed"},
+    "retention": {"dry_run"},
+}
+
+
+def _add_report_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max-per-feed",
+        type=int,
+        default=argparse.SUPPRESS,
+        help=f"Entries parsed per feed (default: {DEFAULT_MAX_PER_FEED})",
+    )
+    parser.add_argument(
+        "--per-category-limit",
+        type=int,
+        default=argparse.SUPPRESS,
+        help=f"Items per report section (default: {DEFAULT_PER_CATEGORY_LIMIT})",
+    )
+    parser.add_argument("--include-history", action="store_true", default=argparse.SUPPRESS)
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Daily Brief Agent")
-    parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
+    parser.add_argument(
+        "--config",
+        action="append",
+        help=(
+            "Path to config.yaml (default: config.yaml). Repeat it, or pass a directory of "
+            "*.yaml profiles, to run several configs with one fetch per feed URL"
+        ),
+    )
     parser.add_argument("--date", help="Target date YYYY-MM-DD")
-    parser.add_argument("--max-per-feed", type=int, default=50)
-    parser.add_argument("--per-category-limit", type=int, default=30)
+    parser.add_argument(
+        "--from",
+        dest="from_date",
+        help="Backfill reports from this date YYYY-MM-DD (no fetching; needs --to)",
+    )
+    parser.add_argument("--to", dest="to_date", help="Last backfill date YYYY-MM-DD")
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Backfill render processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--max-per-feed",
+        type=int,
+        help=f"Entries parsed per feed (default: {DEFAULT_MAX_PER_FEED})",
+    )
+    parser.add_argument(
+        "--per-category-limit",
+        type=int,
+        help=f"Items per report section (default: {DEFAULT_PER_CATEGORY_LIMIT})",
+    )
     parser.add_argument("--include-history", action="store_true")
     parser.add_argument("--no-telegram", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--verbose", action="store_true")
     parser.add_argument("--print-config", action="store_true")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--config", action="append", default=argparse.SUPPRESS, help="Path to config.yaml"
+    )
+    common.add_argument("--verbose", action="store_true", default=argparse.SUPPRESS)
+
+    subparsers = parser.add_subparsers(dest="command")
+    serve = subparsers.add_parser(
+        "serve",
+        parents=[common],
+        help="Keep running and poll each feed on its own adaptive interval",
+    )
+    _add_report_options(serve)
+    serve.add_argument("--min-interval", type=float, default=300.0, help="Seconds")
+    serve.add_argument("--max-interval", type=float, default=6 * 3600.0, help="Seconds")
+
+    search = subparsers.add_parser(
+        "search", parents=[common], help="Full-text search over stored items"
+    )
+    search.add_argument("query", help="Words to match; append * for prefix matching")
+    search.add_argument("--since", help="Only items fetched on or after YYYY-MM-DD")
+    search.add_argument("--category")
+    search.add_argument("--source")
+    search.add_argument("--limit", type=int, default=20)
+
+    subparsers.add_parser(
+        "reindex",
+        parents=[common],
+        help=(
+            "Rebuild the full-text search index and fill in missing excerpts "
+            "(once for databases created before them)"
+        ),
+    )
+
+    retention = subparsers.add_parser(
+        "retention",
+        parents=[common],
+        help="Compress and archive old items according to the retention policies",
+    )
+    # SUPPRESS keeps a top-level --dry-run ("--dry-run retention") from being reset.
+    retention.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Only report what would be compressed or archived",
+    )
+
+    archive = subparsers.add_parser(
+        "archive", parents=[common], help="Query items moved to the archive by retention"
+    )
+    archive.add_argument("--contains", help="Case-insensitive text in the title or summary")
+    archive.add_argument("--since", help="Only items fetched on or after YYYY-MM-DD")
+    archive.add_argument("--until", help="Only items fetched on or before YYYY-MM-DD")
+    archive.add_argument("--category")
+    archive.add_argument("--source")
+    archive.add_argument("--limit", type=int, default=20)
+
+    export = subparsers.add_parser(
+        "export", parents=[common], help="Stream stored items to NDJSON or CSV"
+    )
+    export.add_argument("--output", "-o", default="-", help="File to write (default: stdout)")
+    export.add_argument(
+        "--format", choices=("ndjson", "csv"), help="Default: from the file name, else NDJSON"
+    )
+    export.add_argument(
+        "--gzip", action="store_true", default=None, help="Compress (default for *.gz)"
+    )
+    export.add_argument("--since", help="Only items fetched on or after YYYY-MM-DD")
+    export.add_argument("--until", help="Only items fetched on or before YYYY-MM-DD")
+    export.add_argument("--category")
+    export.add_argument("--source")
+    export.add_argument("--batch-size", type=int, default=1000, help="Rows per fetchmany")
+
+    import_ = subparsers.add_parser(
+        "import",
+        parents=[common],
+        help="Load items from NDJSON or CSV (or archive files), skipping stored ones",
+    )
+    import_.add_argument("path", help="File to read, or - for stdin")
+    import_.add_argument(
+        "--format", choices=("ndjson", "csv"), help="Default: from the file name, else NDJSON"
+    )
+    import_.add_argument(
+        "--gzip", action="store_true", default=None, help="Decompress (default for *.gz)"
+    )
+    import_.add_argument(
+        "--batch-size", type=int, default=10_000, help="Rows per insert transaction"
+    )
+
+    replay = subparsers.add_parser(
+        "replay",
+        parents=[common],
+        help="Parse and store feed bodies from storage.payloads_dir again, without fetching",
+    )
+    replay.add_argument("--since", help="Only bodies fetched on or after YYYY-MM-DD")
+    replay.add_argument("--until", help="Only bodies fetched on or before YYYY-MM-DD")
+    replay.add_argument(
+        "--feed", action="append", help="Only this feed (name or URL); may be repeated"
+    )
+    replay.add_argument(
+        "--max-per-feed",
+        type=int,
+        default=argparse.SUPPRESS,
+        help=f"Entries parsed per body (default: {DEFAULT_MAX_PER_FEED})",
+    )
+
+    feeds = subparsers.add_parser("feeds", parents=[common], help="Inspect configured feeds")
+    feeds_commands = feeds.add_subparsers(dest="feeds_command", required=True)
+    feeds_commands.add_parser(
+        "status",
+        parents=[common],
+        help="Show each feed's health: failures, latency, payload size and circuit state",
+    )
+
+    subparsers.add_parser(
+        "partition",
+        parents=[common],
+        help="Move stored items into monthly files under storage.partitions_dir",
+    )
     return parser
 
 
 def _load_config(path: str, logger: logging.Logger) -> AppConfig:
     try:
-        return load_config(path)
+        return load_config(path, cache_dir=default_cache_dir())
     except ConfigError as exc:
         logger.error(str(exc))
         raise
 
 
-def _collect_items(config: AppConfig, max_per_feed: int, logger: logging.Logger) -> list[dict]:
-    items: list[dict] = []
-    fetched_at = utc_now().isoformat()
-    for feed in config.feeds:
-        try:
-            feed_items = fetch_feed(feed.name, feed.url, feed.category, max_per_feed)
-        except Exception as exc:
-            logger.error("Failed to fetch feed %s: %s", feed.name, exc)
-            continue
-        for item in feed_items:
-            item["fetched_at_utc"] = fetched_at
-        items.extend(feed_items)
-    return items
-
+def _config_paths(values: Sequence[str]) -> list[str]:
+    """Expand ``--config`` values; a directory stands for the ``*.yaml`` files in it."""
+    paths: list[str] = []
+    for value in values:
+        path = Path(value)
+        if path.is_dir():
+            paths.extend(
+                str(profile) for profile in sorted([*path.glob("*.yaml"), *path.glob("*.yml")])
+            )
+        else:
+            paths.append(value)
+    return paths
 
-def _write_report(report_path: Path, content: str) -> None:
-    report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text(content, encoding="utf-8", newline="\n")
 
-
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     parser = _build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.command is not None:
+        misplaced = [
+            flag
+            for dest, flag in _RUN_OPTIONS.items()
+            if getattr(args, dest) not in (None, False)
+            and dest not in _COMMAND_OPTIONS.get(args.command, ())
+        ]
+        if misplaced:
+            parser.error(f"{', '.join(misplaced)} cannot be used with '{args.command}'")
+    if args.max_per_feed is None:
+        args.max_per_feed = DEFAULT_MAX_PER_FEED
+    if args.per_category_limit is None:
+        args.per_category_limit = DEFAULT_PER_CATEGORY_LIMIT
+    backfill = args.command is None and (args.from_date or args.to_date)
+    if backfill and not (args.from_date and args.to_date):
+        parser.error("--from and --to must be used together")
+    if backfill and (args.date or args.include_history or args.dry_run):
+        parser.error("--from/--to cannot be combined with --date, --include-history or --dry-run")
+
+    paths = _config_paths(args.config or ["config.yaml"])
+    if len(paths) > 1 and (args.command or backfill or args.dry_run or args.print_config):
+        parser.error("several configs can only be combined for a fetch run")
+    if not paths:
+        parser.error("no *.yaml profiles found in " + ", ".join(args.config))
 
     logger = _configure_logging(args.verbose)
+    # Before the config cache directory and any other setting is read from the environment.
+    from dotenv import load_dotenv
+
     load_dotenv()
 
     try:
-        config = _load_config(args.config, logger)
+        configs = [_load_config(path, logger) for path in paths]
     except ConfigError:
         sys.exit(1)
 
+    for config in configs:
+        partitions_dir = config.storage.partitions_dir
+        if args.include_history and partitions_dir is not None:
+            if len(stored_months(partitions_dir)) > MAX_ATTACHED:
+                logger.error(
+                    "--include-history reads at most %s monthly partitions at once.",
+                    MAX_ATTACHED,
+                )
+                sys.exit(1)
+
+    if len(configs) > 1:
+        from daily_brief_agent.commands.run import run_profiles
+
+        run_profiles(args, configs, logger)
+        return
+    config = configs[0]
+
     if args.print_config:
         import yaml
 
         print(yaml.safe_dump(config.to_safe_dict(), sort_keys=False))
         return
 
-    tz = get_timezone(config.timezone)
-    target_date = parse_date(args.date) if args.date else utc_now().astimezone(tz).date()
+    # Each command's module is imported on use so the others' dependencies are not loaded.
+    if args.command == "serve":
+        from daily_brief_agent.commands.serve import serve
+
+        serve(args, config, logger)
+        return
+    if args.command == "search":
+        from daily_brief_agent.commands.search import search
+
+        search(args, config, logger)
+        return
+    if args.command == "reindex":
+        from daily_brief_agent.commands.search import reindex
+
+        reindex(config, logger)
+        return
+    if args.command == "retention":
+        from daily_brief_agent.commands.retention import retention
+
+        retention(args, config, logger)
+        return
+    if args.command == "archive":
+        from daily_brief_agent.commands.archive import query_archive
+
+        query_archive(args, config)
+        return
+    if args.command == "export":
+        from daily_brief_agent.commands.bulk import export_items
 
-    items = _collect_items(config, args.max_per_feed, logger)
-    if args.dry_run:
-        logger.info("Dry run enabled: skipping database writes.")
-        report = generate_report(items, target_date, args.per_category_limit)
-        print(report)
+        export_items(args, config, logger)
         return
+    if args.command == "import":
+        from daily_brief_agent.commands.bulk import import_items
 
-    db_path = config.storage.db_path
-    if db_path.parent != Path("."):
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        import_items(args, config, logger)
+        return
+    if args.command == "replay":
+        from daily_brief_agent.commands.replay import replay
 
-    conn = sqlite3.connect(db_path)
-    init_db(conn)
-    inserted_count = insert_items(conn, items)
-    logger.info("Inserted %s new items.", inserted_count)
+        replay(args, config, logger)
+        return
+    if args.command == "feeds":
+        from daily_brief_agent.commands.feeds import feeds_status
 
-    date_range = date_range_utc(target_date, tz)
-    rows = query_items_for_date(conn, date_range.start, date_range.end, args.include_history)
-    conn.close()
+        feeds_status(config)
+        return
+    if args.command == "partition":
+        from daily_brief_agent.commands.partition import partition
 
-    report_items = [dict(row) for row in rows]
-    report = generate_report(report_items, target_date, args.per_category_limit)
+        partition(config, logger)
+        return
+    if backfill:
+        from daily_brief_agent.commands.backfill import backfill_reports
 
-    report_path = config.storage.reports_dir / f"{target_date:%Y-%m-%d}.md"
-    _write_report(report_path, report)
-    logger.info("Report written to %s", report_path)
+        backfill_reports(args, config, logger)
+        return
+    from daily_brief_agent.commands.run import run
 
-    if config.delivery.telegram.enabled and not args.no_telegram:
-        message = (
-            f"Daily Brief ready: {target_date:%Y-%m-%d} — {inserted_count} new items. "
-            f"Report: {report_path.resolve()}"
-        )
-        send_telegram_message(message, logger)
+    run(args, config, logger)
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Command subpackage."""
@@ -0,0 +1,32 @@
+"""The ``archive`` command: query items moved to the archive by retention."""
+
+from __future__ import annotations
+
+import argparse
+from itertools import islice
+
+from daily_brief_agent.commands.common import fetched_range
+from daily_brief_agent.config import AppConfig
+
+
+def query_archive(args: argparse.Namespace, config: AppConfig) -> None:
+    from daily_brief_agent.archive import iter_archive
+
+    since_utc, until_utc = fetched_range(args, config)
+    matches = iter_archive(
+        config.retention.archive_dir,
+        since_utc=since_utc,
+        until_utc=until_utc,
+        category=args.category,
+        source=args.source,
+        contains=args.contains,
+    )
+    found = False
+    for position, item in enumerate(islice(matches, args.limit), start=1):
+        found = True
+        published = item["published_raw"] or item["fetched_at_utc"]
+        print(f"{position}. {item['title']}")
+        print(f"   {item['source']} · {item['category']} · {published}")
+        print(f"   {item['link']}")
+    if not found:
+        print("No matches.")
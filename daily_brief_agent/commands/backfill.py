@@ -0,0 +1,110 @@
+"""Backfill: rewrite a range of daily reports from stored items, without fetching."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, Sequence
+
+from daily_brief_agent.commands.common import (
+    attach_range,
+    open_db,
+    report_path,
+    update_report_file,
+)
+from daily_brief_agent.config import AppConfig
+from daily_brief_agent.db import query_report_rows_by_day
+from daily_brief_agent.partitions import TooManyPartitions
+from daily_brief_agent.reporting.incremental import ReportUpdate
+from daily_brief_agent.utils.time import date_range_utc, get_timezone, parse_date
+
+
+def _day_batches(rows: Iterable[Any], days: Sequence[date]) -> Iterator[tuple[date, list[Any]]]:
+    """Split day-ordered rows into one batch per day, including empty days."""
+    grouped = groupby(rows, key=itemgetter("day"))
+    pending = next(grouped, None)
+    for day in days:
+        if pending is not None and pending[0] == day.isoformat():
+            yield day, list(pending[1])
+            pending = next(grouped, None)
+        else:
+            yield day, []
+
+
+def _backfill_days(
+    config: AppConfig, days: list[date], per_category_limit: int
+) -> list[ReportUpdate]:
+    """Write the reports for consecutive ``days`` in a worker process, with its own connection."""
+    tz = get_timezone(config.timezone)
+    ranges = []
+    for day in days:
+        date_range = date_range_utc(day, tz)
+        ranges.append((day.isoformat(), date_range.start, date_range.end))
+    # Partitioned storage can only attach a few months at once: query month by month.
+    if config.storage.partitions_dir is None:
+        groups = [ranges]
+    else:
+        groups = [list(group) for _, group in groupby(ranges, key=lambda day: day[0][:7])]
+    conn = sqlite3.connect(config.storage.db_path)
+    try:
+        updates = []
+        for group in groups:
+            attach_range(conn, config, group[0][1], group[-1][2])
+            rows = query_report_rows_by_day(
+                conn,
+                group,
+                per_category_limit,
+                by_published=config.report.date_field == "published",
+            )
+            batches = list(_day_batches(rows, [date.fromisoformat(day) for day, _, _ in group]))
+            updates.extend(
+                update_report_file(
+                    conn, report_path(config, day), batch, day, per_category_limit
+                )
+                for day, batch in batches
+            )
+        return updates
+    finally:
+        conn.close()
+
+
+def backfill_reports(args: argparse.Namespace, config: AppConfig, logger: logging.Logger) -> None:
+    first, last = parse_date(args.from_date), parse_date(args.to_date)
+    if last < first:
+        logger.error("--to must not be before --from.")
+        sys.exit(1)
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    jobs = min(args.jobs or os.cpu_count() or 1, len(days))
+    open_db(config).close()
+
+    try:
+        if jobs <= 1:
+            updates = _backfill_days(config, days, args.per_category_limit)
+        else:
+            # Contiguous day chunks, so each worker still reads its rows in a single query.
+            size = -(-len(days) // jobs)
+            chunks = [days[index : index + size] for index in range(0, len(days), size)]
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = [
+                    executor.submit(_backfill_days, config, chunk, args.per_category_limit)
+                    for chunk in chunks
+                ]
+                updates = [update for future in futures for update in future.result()]
+    except TooManyPartitions as exc:
+        logger.error("Backfill from %s to %s failed: %s", first, last, exc)
+        sys.exit(1)
+    logger.info(
+        "Backfilled %s reports (%s to %s) into %s; %s rewritten.",
+        len(updates),
+        first,
+        last,
+        config.storage.reports_dir,
+        sum(update.rewritten for update in updates),
+    )
@@ -0,0 +1,69 @@
+"""The ``export`` and ``import`` commands."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+
+from daily_brief_agent.commands.common import fetched_range, item_databases, open_db, store_items
+from daily_brief_agent.config import AppConfig
+
+
+def export_items(args: argparse.Namespace, config: AppConfig, logger: logging.Logger) -> None:
+    from daily_brief_agent.bulk import detect_format, iter_items, open_text, write_items
+
+    since_utc, until_utc = fetched_range(args, config)
+    fmt = args.format or detect_format(args.output)
+    started = time.perf_counter()
+    conn = open_db(config)
+    try:
+        items = (
+            item
+            for database in item_databases(conn, config, since_utc, until_utc, False)
+            for item in iter_items(
+                database, since_utc, until_utc, args.category, args.source, args.batch_size
+            )
+        )
+        with open_text(args.output, "w", args.gzip) as handle:
+            count = write_items(handle, items, fmt)
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Exported %s items in %.1fs (%.0f rows/s).", count, elapsed, count / max(elapsed, 1e-9)
+    )
+
+
+def import_items(args: argparse.Namespace, config: AppConfig, logger: logging.Logger) -> None:
+    from daily_brief_agent.bulk import batched, detect_format, open_text, read_items
+
+    fmt = args.format or detect_format(args.path)
+    started = time.perf_counter()
+    read = inserted = 0
+    conn = open_db(config)
+    try:
+        with open_text(args.path, "r", args.gzip) as handle:
+            # Each batch is one insert_items call, hence one transaction.
+            items = read_items(
+                handle, fmt, config.storage.excerpt_length, config.storage.summary_html
+            )
+            for batch in batched(items, args.batch_size):
+                read += len(batch)
+                inserted += store_items(conn, config, batch)
+                logger.debug("Imported %s of %s records so far.", inserted, read)
+    except (OSError, ValueError) as exc:
+        logger.error("Import stopped after %s records: %s", read, exc)
+        sys.exit(1)
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Imported %s new items from %s records in %.1fs (%.0f rows/s); %s already stored.",
+        inserted,
+        read,
+        elapsed,
+        read / max(elapsed, 1e-9),
+        read - inserted,
+    )
@@ -0,0 +1,393 @@
+"""Helpers shared by the commands: storage, feed state, health and ingest."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence
+
+from daily_brief_agent.config import AppConfig, FeedConfig
+from daily_brief_agent.db import (
+    get_feed_health,
+    get_feed_states,
+    get_report_sections,
+    init_db,
+    insert_items,
+    query_report_rows,
+    save_report_sections,
+    upsert_feed_health,
+    upsert_feed_states,
+)
+from daily_brief_agent.dedup import NearDuplicateIndex
+from daily_brief_agent.health import HALF_OPEN, CircuitBreaker, FeedHealth
+from daily_brief_agent.items import Item
+from daily_brief_agent.metrics import NULL_METRICS, NullMetrics, RunMetrics
+from daily_brief_agent.partitions import (
+    attach_partitions,
+    insert_partitioned_items,
+    months_between,
+    open_partition,
+    published_months,
+    stored_months,
+)
+from daily_brief_agent.reporting.incremental import ReportUpdate, update_report
+from daily_brief_agent.utils.time import (
+    date_range_utc,
+    days_range_utc,
+    get_timezone,
+    parse_date,
+    utc_now,
+)
+
+# Fetching pulls in feedparser and requests; it is imported inside the code paths
+# that need it so report-only commands start quickly.
+if TYPE_CHECKING:
+    from daily_brief_agent.fetchers.rss import FeedState
+    from daily_brief_agent.payloads import PayloadArchive
+    from daily_brief_agent.pipeline import IngestResult
+
+
+def open_db(config: AppConfig) -> sqlite3.Connection:
+    db_path = config.storage.db_path
+    if db_path.parent != Path("."):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    init_db(conn)
+    return conn
+
+
+def read_only_db(config: AppConfig) -> sqlite3.Connection | None:
+    """Open the database read-only if it exists and has feed health, as dry runs do."""
+    db_path = config.storage.db_path
+    if not db_path.exists():
+        return None
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'feed_health'").fetchone() is None:
+        conn.close()
+        return None
+    return conn
+
+
+def warn_unpartitioned_items(
+    conn: sqlite3.Connection, config: AppConfig, logger: logging.Logger
+) -> None:
+    if config.storage.partitions_dir is None:
+        return
+    if conn.execute("SELECT 1 FROM main.items LIMIT 1").fetchone():
+        logger.warning(
+            "Items stored before partitioning are not read; run 'daily-brief-agent partition'."
+        )
+
+
+def store_items(conn: sqlite3.Connection, config: AppConfig, items: list[Item]) -> int:
+    near_duplicates = _near_duplicate_index(config)
+    if config.storage.partitions_dir is None:
+        return insert_items(conn, items, near_duplicates)
+    return insert_partitioned_items(conn, config.storage.partitions_dir, items, near_duplicates)
+
+
+def _near_duplicate_index(config: AppConfig) -> NearDuplicateIndex | None:
+    if not config.dedup.near_duplicates:
+        return None
+    return NearDuplicateIndex(
+        max_distance=config.dedup.max_distance,
+        window=timedelta(hours=config.dedup.window_hours),
+    )
+
+
+def attach_range(
+    conn: sqlite3.Connection,
+    config: AppConfig,
+    start_utc: datetime,
+    end_utc: datetime,
+    include_history: bool = False,
+) -> None:
+    """Attach the partitions a report over ``[start_utc, end_utc]`` reads, if partitioned."""
+    partitions_dir = config.storage.partitions_dir
+    if partitions_dir is None:
+        return
+    if include_history:
+        months = stored_months(partitions_dir)
+    else:
+        # Near-duplicates fetched just after the range still list their sources.
+        window = timedelta(hours=config.dedup.window_hours)
+        months = months_between(start_utc, end_utc + window)
+        if config.report.date_field == "published":
+            # Items may be fetched any number of months after they were published.
+            months += published_months(conn, partitions_dir, start_utc, end_utc)
+    attach_partitions(conn, partitions_dir, months)
+
+
+def item_databases(
+    conn: sqlite3.Connection,
+    config: AppConfig,
+    since_utc: datetime | None = None,
+    until_utc: datetime | None = None,
+    newest_first: bool = True,
+) -> Iterator[sqlite3.Connection]:
+    """Yield ``conn``, then each monthly partition in range if storage is partitioned."""
+    yield conn
+    partitions_dir = config.storage.partitions_dir
+    if partitions_dir is None:
+        return
+    first = months_between(since_utc, since_utc)[0] if since_utc is not None else ""
+    last = months_between(until_utc, until_utc)[0] if until_utc is not None else "9999-12"
+    months = [month for month in stored_months(partitions_dir) if first <= month <= last]
+    for month in reversed(months) if newest_first else months:
+        partition = open_partition(partitions_dir, month)
+        try:
+            yield partition
+        finally:
+            partition.close()
+
+
+def fetched_range(
+    args: argparse.Namespace, config: AppConfig
+) -> tuple[datetime | None, datetime | None]:
+    """Return the half-open UTC range of ``--since`` through ``--until``, in local days."""
+    return days_range_utc(
+        parse_date(args.since) if args.since else None,
+        parse_date(args.until) if args.until else None,
+        get_timezone(config.timezone),
+    )
+
+
+def load_feed_states(conn: sqlite3.Connection) -> dict[str, FeedState]:
+    from daily_brief_agent.fetchers.rss import FeedState
+
+    return {url: FeedState(**state) for url, state in get_feed_states(conn).items()}
+
+
+def save_feed_states(conn: sqlite3.Connection, states: dict[str, FeedState]) -> None:
+    updated_at = utc_now().isoformat()
+    upsert_feed_states(
+        conn,
+        [
+            {"url": url, "updated_at_utc": updated_at, **asdict(state)}
+            for url, state in states.items()
+        ],
+    )
+
+
+def report_path(config: AppConfig, target_date: date) -> Path:
+    return config.storage.reports_dir / f"{target_date:%Y-%m-%d}.md"
+
+
+def update_report_file(
+    conn: sqlite3.Connection,
+    path: Path,
+    rows: Iterable[Any],
+    report_date: date,
+    per_category_limit: int,
+) -> ReportUpdate:
+    report = str(path)
+    update = update_report(
+        rows, report_date, per_category_limit, path, get_report_sections(conn, report)
+    )
+    if update.changed_sections or update.removed_sections:
+        save_report_sections(conn, report, update.sections)
+    return update
+
+
+def write_daily_report(
+    conn: sqlite3.Connection,
+    config: AppConfig,
+    target_date: date,
+    include_history: bool,
+    per_category_limit: int,
+) -> ReportUpdate:
+    date_range = date_range_utc(target_date, get_timezone(config.timezone))
+    attach_range(conn, config, date_range.start, date_range.end, include_history)
+    rows = query_report_rows(
+        conn,
+        date_range.start,
+        date_range.end,
+        include_history,
+        per_category_limit,
+        by_published=config.report.date_field == "published",
+    )
+    path = report_path(config, target_date)
+    return update_report_file(conn, path, rows, target_date, per_category_limit)
+
+
+def log_report_update(update: ReportUpdate, logger: logging.Logger) -> None:
+    if not update.rewritten:
+        logger.info("Report %s unchanged.", update.path)
+        return
+    logger.info(
+        "Report written to %s (changed sections: %s; removed: %s)",
+        update.path,
+        ", ".join(update.changed_sections) or "none",
+        ", ".join(update.removed_sections) or "none",
+    )
+
+
+def payload_archive(config: AppConfig) -> PayloadArchive | None:
+    if config.storage.payloads_dir is None:
+        return None
+    from daily_brief_agent.payloads import PayloadArchive
+
+    return PayloadArchive(
+        config.storage.payloads_dir, int(config.storage.payloads_max_mb * 1_000_000)
+    )
+
+
+def _close_payload_archive(payloads: PayloadArchive | None, logger: logging.Logger) -> None:
+    if payloads is None:
+        return
+    logger.info(
+        "Payload archive: %s new bodies, %s already stored, %s evicted; %.1f of %.0f MB used.",
+        payloads.stored,
+        payloads.reused,
+        payloads.evicted,
+        payloads.total_bytes / 1_000_000,
+        payloads.max_bytes / 1_000_000,
+    )
+    payloads.close()
+
+
+def circuit_breaker(config: AppConfig) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=config.fetch.breaker_failures,
+        cooldown=config.fetch.breaker_cooldown,
+        max_cooldown=config.fetch.breaker_max_cooldown,
+    )
+
+
+def load_feed_health(conn: sqlite3.Connection) -> dict[str, FeedHealth]:
+    return {url: FeedHealth(**row) for url, row in get_feed_health(conn).items()}
+
+
+def _save_feed_health(conn: sqlite3.Connection, health: dict[str, FeedHealth]) -> None:
+    upsert_feed_health(conn, [asdict(entry) for entry in health.values()])
+
+
+def _skip_open_circuits(
+    feeds: Sequence[FeedConfig],
+    health: dict[str, FeedHealth],
+    breaker: CircuitBreaker,
+    now_utc: datetime,
+    logger: logging.Logger,
+    metrics: RunMetrics | NullMetrics = NULL_METRICS,
+) -> list[FeedConfig]:
+    """Return the feeds whose circuit is closed or half-open, logging the others."""
+    allowed, skipped = breaker.split(feeds, health, now_utc)
+    for feed in skipped:
+        entry = health[feed.url]
+        logger.warning(
+            "Skipping feed %s after %s consecutive failures; circuit open until %s.",
+            feed.name,
+            entry.consecutive_failures,
+            entry.open_until_utc,
+        )
+    for feed in allowed:
+        if breaker.state(health.get(feed.url), now_utc) == HALF_OPEN:
+            logger.info(
+                "Probing feed %s after %s consecutive failures.",
+                feed.name,
+                health[feed.url].consecutive_failures,
+            )
+    metrics.count("feeds_skipped", len(skipped))
+    return allowed
+
+
+def ingest(
+    config: AppConfig,
+    databases: Sequence[tuple[sqlite3.Connection | None, Sequence[FeedConfig]]],
+    feeds: Sequence[FeedConfig],
+    feed_states: dict[str, FeedState],
+    store: Callable[[list[Item]], int],
+    max_per_feed: int,
+    logger: logging.Logger,
+    metrics: RunMetrics | NullMetrics = NULL_METRICS,
+    seen_dbs: Sequence[Path] = (),
+    save_health: bool = True,
+) -> IngestResult:
+    """Ingest the ``feeds`` not skipped by the health kept in any of ``databases``."""
+    breaker = circuit_breaker(config)
+    now = utc_now()
+    healths = [{} if conn is None else load_feed_health(conn) for conn, _ in databases]
+    allowed: set[str] = set()
+    for health, (_, listed) in zip(healths, databases, strict=True):
+        allowed.update(
+            feed.url for feed in _skip_open_circuits(listed, health, breaker, now, logger, metrics)
+        )
+    result = _ingest_feeds(
+        config,
+        [feed for feed in feeds if feed.url in allowed],
+        feed_states,
+        store,
+        max_per_feed,
+        logger,
+        metrics,
+        seen_dbs,
+    )
+    for health, (conn, listed) in zip(healths, databases, strict=True):
+        if conn is not None and save_health:
+            attempted = [feed for feed in listed if feed.url in allowed]
+            _save_feed_health(conn, breaker.update(health, attempted, result.feeds, utc_now()))
+    return result
+
+
+def _ingest_feeds(
+    config: AppConfig,
+    feeds: Sequence[FeedConfig],
+    feed_states: dict[str, FeedState],
+    store: Callable[[list[Item]], int],
+    max_per_feed: int,
+    logger: logging.Logger,
+    metrics: RunMetrics | NullMetrics = NULL_METRICS,
+    seen_dbs: Sequence[Path] = (),
+) -> IngestResult:
+    from daily_brief_agent.pipeline import ParseOptions, ingest_feeds
+
+    options = ParseOptions(
+        max_entries=max_per_feed,
+        seen_run_limit=config.fetch.seen_run_limit,
+        excerpt_length=config.storage.excerpt_length,
+        summary_html=config.storage.summary_html,
+        seen_dbs=tuple(str(path) for path in seen_dbs),
+    )
+    payloads = payload_archive(config)
+    try:
+        result = ingest_feeds(
+            feeds,
+            feed_states,
+            store,
+            config.fetch,
+            options,
+            utc_now().isoformat(),
+            logger,
+            metrics,
+            payloads,
+        )
+    finally:
+        _close_payload_archive(payloads, logger)
+    if feed_states:
+        logger.info(
+            "Conditional fetch: %s unchanged feeds, saved %s bytes and %.3fs of parsing.",
+            result.unchanged,
+            result.bytes_saved,
+            result.parse_seconds_saved,
+        )
+    for name, stats in result.stages.items():
+        logger.info(
+            "Stage %s: %s %s in %.2fs (%.1f/s) on %s workers; busy %.2fs, waiting %.2fs.",
+            name,
+            stats.processed,
+            stats.unit,
+            result.seconds,
+            stats.processed / result.seconds if result.seconds else 0.0,
+            stats.workers,
+            stats.busy_seconds,
+            stats.wait_seconds,
+        )
+    metrics.record_pipeline(
+        {name: stats.summary(result.seconds) for name, stats in result.stages.items()}
+    )
+    return result
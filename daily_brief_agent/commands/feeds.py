@@ -0,0 +1,40 @@
+"""The ``feeds status`` command: show each feed's health."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from daily_brief_agent.commands.common import circuit_breaker, load_feed_health, open_db
+from daily_brief_agent.config import AppConfig
+from daily_brief_agent.health import FeedHealth
+from daily_brief_agent.utils.time import utc_now
+
+
+def _format_utc(value: str | None) -> str:
+    return "-" if value is None else datetime.fromisoformat(value).strftime("%Y-%m-%d %H:%M")
+
+
+def feeds_status(config: AppConfig) -> None:
+    conn = open_db(config)
+    try:
+        health = load_feed_health(conn)
+    finally:
+        conn.close()
+    breaker = circuit_breaker(config)
+    now = utc_now()
+    width = max(len("Feed"), *(len(feed.name) for feed in config.feeds))
+    print(
+        f"{'Feed':{width}}  {'State':9}  {'Fails':>5}  {'Last success':16}  "
+        f"{'Avg time':>8}  {'Avg size':>9}  Open until"
+    )
+    for feed in config.feeds:
+        entry = health.get(feed.url) or FeedHealth(url=feed.url, feed=feed.name)
+        avg_time = "-" if entry.avg_seconds is None else f"{entry.avg_seconds:.2f}s"
+        avg_size = "-" if entry.avg_bytes is None else f"{entry.avg_bytes / 1000:.1f} KB"
+        print(
+            f"{feed.name:{width}}  {breaker.state(entry, now):9}  "
+            f"{entry.consecutive_failures:>5}  {_format_utc(entry.last_success_at_utc):16}  "
+            f"{avg_time:>8}  {avg_size:>9}  {_format_utc(entry.open_until_utc)}"
+        )
+        if entry.consecutive_failures:
+            print(f"{'':{width}}  last error: {entry.last_error}")
@@ -0,0 +1,28 @@
+"""The ``partition`` command: move stored items into monthly files."""
+
+from __future__ import annotations
+
+import logging
+import sys
+
+from daily_brief_agent.commands.common import open_db
+from daily_brief_agent.config import AppConfig
+from daily_brief_agent.partitions import migrate_to_partitions, partition_path
+
+
+def partition(config: AppConfig, logger: logging.Logger) -> None:
+    partitions_dir = config.storage.partitions_dir
+    if partitions_dir is None:
+        logger.error("Set storage.partitions_dir to partition the items table.")
+        sys.exit(1)
+    from daily_brief_agent.retention import reclaim_space
+
+    conn = open_db(config)
+    try:
+        moved = migrate_to_partitions(conn, partitions_dir)
+        reclaim_space(conn)
+    finally:
+        conn.close()
+    for month, count in moved.items():
+        logger.info("Moved %s items into %s.", count, partition_path(partitions_dir, month))
+    logger.info("Partitioned %s items into %s months.", sum(moved.values()), len(moved))
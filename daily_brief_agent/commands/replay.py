@@ -0,0 +1,65 @@
+"""The ``replay`` command: parse archived feed bodies again, without fetching."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from dataclasses import replace
+
+from daily_brief_agent.commands.common import (
+    fetched_range,
+    open_db,
+    payload_archive,
+    store_items,
+    warn_unpartitioned_items,
+)
+from daily_brief_agent.config import AppConfig
+
+
+def replay(args: argparse.Namespace, config: AppConfig, logger: logging.Logger) -> None:
+    payloads = payload_archive(config)
+    if payloads is None:
+        logger.error("Set storage.payloads_dir to archive feed bodies for replay.")
+        sys.exit(1)
+    from daily_brief_agent.pipeline import ParseOptions, replay_payloads
+
+    since_utc, until_utc = fetched_range(args, config)
+    by_name = {feed.name: feed.url for feed in config.feeds}
+    feed_urls = None if args.feed is None else [by_name.get(feed, feed) for feed in args.feed]
+    by_url = {feed.url: feed for feed in config.feeds}
+    # Items are labelled with the feed's current name and category where it is still listed.
+    fetches = [
+        replace(fetch, feed_name=feed.name, category=feed.category)
+        if (feed := by_url.get(fetch.feed_url)) is not None
+        else fetch
+        for fetch in payloads.fetches(since_utc, until_utc, feed_urls)
+    ]
+    options = ParseOptions(
+        max_entries=args.max_per_feed,
+        excerpt_length=config.storage.excerpt_length,
+        summary_html=config.storage.summary_html,
+    )
+    conn = open_db(config)
+    try:
+        warn_unpartitioned_items(conn, config, logger)
+        result = replay_payloads(
+            payloads,
+            fetches,
+            lambda items: store_items(conn, config, items),
+            config.fetch,
+            options,
+            logger,
+        )
+    finally:
+        conn.close()
+        payloads.close()
+    logger.info(
+        "Replayed %s fetches (%s unchanged, %s failed) in %.1fs: %s items parsed, %s new.",
+        result.fetches + result.unchanged,
+        result.unchanged,
+        result.failed,
+        result.seconds,
+        result.items,
+        result.inserted,
+    )
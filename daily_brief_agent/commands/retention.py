@@ -0,0 +1,47 @@
+"""The ``retention`` command: compress and archive old items."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from daily_brief_agent.commands.common import item_databases, open_db
+from daily_brief_agent.config import AppConfig
+from daily_brief_agent.utils.time import utc_now
+
+
+def retention(args: argparse.Namespace, config: AppConfig, logger: logging.Logger) -> None:
+    from daily_brief_agent.retention import RetentionResult, apply_retention
+
+    if not config.retention.policies:
+        logger.warning("No retention policies configured.")
+        return
+    now = utc_now()
+    result = RetentionResult()
+    conn = open_db(config)
+    try:
+        for database in item_databases(conn, config):
+            applied = apply_retention(database, config.retention, now, dry_run=args.dry_run)
+            result.compressed += applied.compressed
+            result.archived += applied.archived
+            result.archive_files.extend(applied.archive_files)
+            result.size_before += applied.size_before
+            result.size_after += applied.size_after
+    finally:
+        conn.close()
+    if args.dry_run:
+        logger.info(
+            "Would archive %s items and compress %s summaries.",
+            result.archived,
+            result.compressed,
+        )
+        return
+    for path in result.archive_files:
+        logger.info("Archive written: %s", path)
+    logger.info(
+        "Archived %s items, compressed %s summaries; database %.1f MB -> %.1f MB.",
+        result.archived,
+        result.compressed,
+        result.size_before / 1_000_000,
+        result.size_after / 1_000_000,
+    )
@@ -0,0 +1,356 @@
+"""Fetch runs: ingest the feeds, write the day's report and deliver it."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+import sys
+from collections import Counter
+from dataclasses import replace
+from datetime import date
+from typing import TYPE_CHECKING, Sequence
+
+from daily_brief_agent.commands.common import (
+    ingest,
+    load_feed_states,
+    log_report_update,
+    open_db,
+    read_only_db,
+    save_feed_states,
+    store_items,
+    warn_unpartitioned_items,
+    write_daily_report,
+)
+from daily_brief_agent.config import AppConfig, FeedConfig, StorageConfig, TelegramChat
+from daily_brief_agent.db import enqueue_outbox, outbox_counts, record_run
+from daily_brief_agent.items import Item
+from daily_brief_agent.metrics import (
+    NULL_METRICS,
+    NullMetrics,
+    RunMetrics,
+    write_json_summary,
+    write_prometheus_textfile,
+)
+from daily_brief_agent.partitions import TooManyPartitions
+from daily_brief_agent.reporting.incremental import ReportUpdate
+from daily_brief_agent.reporting.markdown import report_sort_key, write_report
+from daily_brief_agent.scheduler import SystemClock
+from daily_brief_agent.utils.text import html_excerpt
+from daily_brief_agent.utils.time import get_timezone, parse_date, utc_now
+
+if TYPE_CHECKING:
+    from daily_brief_agent.fetchers.rss import FeedState
+
+
+def run(args: argparse.Namespace, config: AppConfig, logger: logging.Logger) -> None:
+    tz = get_timezone(config.timezone)
+    target_date = parse_date(args.date) if args.date else utc_now().astimezone(tz).date()
+
+    if args.dry_run:
+        items: list[Item] = []
+
+        def _collect(batch: list[Item]) -> int:
+            items.extend(batch)
+            return len(batch)
+
+        conn = read_only_db(config)
+        try:
+            ingest(
+                config,
+                [(conn, config.feeds)],
+                config.feeds,
+                {},
+                _collect,
+                args.max_per_feed,
+                logger,
+                save_health=False,
+            )
+        finally:
+            if conn is not None:
+                conn.close()
+        logger.info("Dry run enabled: skipping database writes.")
+        items.sort(key=report_sort_key)
+        write_report(items, target_date, args.per_category_limit, sys.stdout)
+        return
+
+    metrics = RunMetrics() if config.metrics.active else NULL_METRICS
+    with metrics.stage("open_db"):
+        conn = open_db(config)
+        feed_states = load_feed_states(conn)
+    warn_unpartitioned_items(conn, config, logger)
+    with metrics.stage("ingest"):
+        result = ingest(
+            config,
+            [(conn, config.feeds)],
+            config.feeds,
+            feed_states,
+            lambda items: store_items(conn, config, items),
+            args.max_per_feed,
+            logger,
+            metrics,
+            [config.storage.db_path] if config.fetch.incremental else [],
+        )
+        save_feed_states(conn, result.states)
+    if not _report_and_deliver(
+        args, config, conn, target_date, result.inserted, metrics, logger
+    ):
+        sys.exit(1)
+
+
+def _report_and_deliver(
+    args: argparse.Namespace,
+    config: AppConfig,
+    conn: sqlite3.Connection,
+    target_date: date,
+    inserted_count: int,
+    metrics: RunMetrics | NullMetrics,
+    logger: logging.Logger,
+) -> bool:
+    """Write and deliver the day's report, close ``conn`` and return whether it was written."""
+    logger.info("Inserted %s new items.", inserted_count)
+    metrics.count("items_inserted", inserted_count)
+
+    try:
+        with metrics.stage("report"):
+            report = write_daily_report(
+                conn, config, target_date, args.include_history, args.per_category_limit
+            )
+    except TooManyPartitions as exc:
+        # The fetched items are stored already; only the report is missing.
+        logger.error("Report for %s not written: %s", target_date, exc)
+        report = None
+    else:
+        log_report_update(report, logger)
+        metrics.record_report(report.summary())
+        if config.delivery.telegram.enabled and not args.no_telegram:
+            with metrics.stage("deliver"):
+                _deliver_telegram(
+                    conn, config, report, target_date, inserted_count, logger, metrics
+                )
+
+    if isinstance(metrics, RunMetrics):
+        _export_metrics(conn, config, metrics, logger)
+    conn.close()
+    return report is not None
+
+
+def _export_metrics(
+    conn: sqlite3.Connection, config: AppConfig, metrics: RunMetrics, logger: logging.Logger
+) -> None:
+    if config.metrics.enabled:
+        run_id = record_run(conn, metrics.summary(), utc_now().isoformat())
+        logger.debug("Recorded run %s metrics.", run_id)
+    if config.metrics.prometheus_textfile is not None:
+        write_prometheus_textfile(metrics, config.metrics.prometheus_textfile)
+    if config.metrics.json_summary is not None:
+        write_json_summary(metrics, config.metrics.json_summary)
+
+
+def _shared_feeds(
+    configs: Sequence[AppConfig], feed_states: Sequence[dict[str, FeedState]]
+) -> tuple[list[FeedConfig], dict[str, FeedState]]:
+    """Return each distinct feed URL once, uniquely named, with validators all profiles share."""
+    feeds: dict[str, FeedConfig] = {}
+    for config in configs:
+        for feed in config.feeds:
+            feeds.setdefault(feed.url, feed)
+    states: dict[str, FeedState] = {}
+    for url in feeds:
+        listed = [
+            profile_states.get(url)
+            for config, profile_states in zip(configs, feed_states, strict=True)
+            if any(feed.url == url for feed in config.feeds)
+        ]
+        validators = {
+            (state.etag, state.last_modified, state.content_hash)
+            for state in listed
+            if state is not None
+        }
+        # A 304 would leave a profile that never saw the content without its items.
+        if None not in listed and len(validators) == 1:
+            states[url] = listed[0]
+    # Stored items find their profiles' feeds by name, so each name must be one URL's.
+    names = Counter(feed.name for feed in feeds.values())
+    shared = [
+        feed if names[feed.name] == 1 else replace(feed, name=f"{feed.name} <{feed.url}>")
+        for feed in feeds.values()
+    ]
+    return shared, states
+
+
+def _shared_storage(configs: Sequence[AppConfig]) -> StorageConfig:
+    """Return the first profile's storage, keeping summary HTML if a profile needs it."""
+    storage = configs[0].storage
+    keep_html = any(
+        config.storage.summary_html or config.storage.excerpt_length != storage.excerpt_length
+        for config in configs
+    )
+    return replace(storage, summary_html=keep_html)
+
+
+def _profile_items(
+    config: AppConfig, items: list[Item], urls: dict[str, str], excerpt_length: int
+) -> list[Item]:
+    """Relabel the shared items of the profile's feeds with its names, categories and excerpts."""
+    storage = config.storage
+    feeds = {feed.url: feed for feed in config.feeds}
+    profile_items = []
+    for item in items:
+        feed = feeds.get(urls[item.source])
+        if feed is None:
+            continue
+        item = replace(item, source=feed.name, category=feed.category)
+        if storage.excerpt_length != excerpt_length:
+            item.excerpt = html_excerpt(item.summary_raw, storage.excerpt_length)
+        if not storage.summary_html:
+            item.summary_raw = None
+        profile_items.append(item)
+    return profile_items
+
+
+def run_profiles(
+    args: argparse.Namespace, configs: Sequence[AppConfig], logger: logging.Logger
+) -> None:
+    """Run several configs, fetching each distinct feed URL once with the first's settings."""
+    profiles = []
+    for config in configs:
+        metrics = RunMetrics() if config.metrics.active else NULL_METRICS
+        with metrics.stage("open_db"):
+            conn = open_db(config)
+            feed_states = load_feed_states(conn)
+        warn_unpartitioned_items(conn, config, logger)
+        profiles.append((config, conn, feed_states, metrics))
+
+    feeds, shared_states = _shared_feeds(configs, [profile[2] for profile in profiles])
+    urls = {feed.name: feed.url for feed in feeds}
+    seen_dbs = []
+    if all(config.fetch.incremental for config in configs):
+        seen_dbs = [config.storage.db_path for config in configs]
+
+    fetch_config = replace(configs[0], storage=_shared_storage(configs))
+    excerpt_length = fetch_config.storage.excerpt_length
+    inserted = [0] * len(profiles)
+
+    def _store(items: list[Item]) -> int:
+        for index, (config, conn, _, _) in enumerate(profiles):
+            profile_items = _profile_items(config, items, urls, excerpt_length)
+            inserted[index] += store_items(conn, config, profile_items)
+        return len(items)
+
+    fetch_metrics = RunMetrics()
+    with fetch_metrics.stage("ingest"):
+        result = ingest(
+            fetch_config,
+            [(conn, config.feeds) for config, conn, _, _ in profiles],
+            feeds,
+            shared_states,
+            _store,
+            args.max_per_feed,
+            logger,
+            fetch_metrics,
+            seen_dbs,
+        )
+    logger.info(
+        "Fetched %s distinct feeds for %s profiles (%s feeds listed).",
+        len(result.feeds),
+        len(configs),
+        sum(len(config.feeds) for config in configs),
+    )
+
+    written = True
+    for (config, conn, _, metrics), count in zip(profiles, inserted, strict=True):
+        logger.info("Profile %s:", config.storage.db_path)
+        listed = {feed.url for feed in config.feeds}
+        if isinstance(metrics, RunMetrics):
+            metrics.stages["ingest"] = fetch_metrics.stages["ingest"]
+            metrics.pipeline = fetch_metrics.pipeline
+            metrics.feeds = [feed for feed in result.feeds if feed.url in listed]
+            metrics.counters.update(fetch_metrics.counters)
+        save_feed_states(
+            conn, {url: state for url, state in result.states.items() if url in listed}
+        )
+        tz = get_timezone(config.timezone)
+        target_date = parse_date(args.date) if args.date else utc_now().astimezone(tz).date()
+        written &= _report_and_deliver(args, config, conn, target_date, count, metrics, logger)
+    if not written:
+        sys.exit(1)
+
+
+def _telegram_messages(
+    config: AppConfig,
+    chats: Sequence[TelegramChat],
+    report: ReportUpdate,
+    target_date: date,
+    inserted_count: int,
+) -> list[tuple[str, str]]:
+    from daily_brief_agent.delivery.telegram import pack_messages
+
+    if not config.delivery.telegram.digests:
+        notice = (
+            f"Daily Brief ready: {target_date:%Y-%m-%d} — {inserted_count} new items. "
+            f"Report: {report.path.resolve()}"
+        )
+        return [(chat.chat_id, notice) for chat in chats]
+
+    messages = []
+    for chat in chats:
+        sections = [
+            report.sections[category][1].strip()
+            for category in report.changed_sections
+            if not chat.categories or category in chat.categories
+        ]
+        if sections:
+            header = f"Daily Brief — {target_date:%Y-%m-%d}"
+            messages.extend((chat.chat_id, text) for text in pack_messages([header, *sections]))
+    return messages
+
+
+def _deliver_telegram(
+    conn: sqlite3.Connection,
+    config: AppConfig,
+    report: ReportUpdate,
+    target_date: date,
+    inserted_count: int,
+    logger: logging.Logger,
+    metrics: RunMetrics | NullMetrics = NULL_METRICS,
+) -> None:
+    from daily_brief_agent.delivery.outbox import OutboxWorker
+    from daily_brief_agent.delivery.telegram import TelegramClient, telegram_credentials
+
+    telegram = config.delivery.telegram
+    token, env_chat_id = telegram_credentials()
+    chats = telegram.chats or ([TelegramChat(chat_id=env_chat_id)] if env_chat_id else [])
+    if not token or not chats:
+        logger.warning(
+            "Telegram is enabled but TELEGRAM_BOT_TOKEN or a chat ID "
+            "(TELEGRAM_CHAT_ID or delivery.telegram.chats) is missing."
+        )
+        return
+
+    messages = _telegram_messages(config, chats, report, target_date, inserted_count)
+    enqueue_outbox(conn, messages, utc_now().isoformat())
+    client = TelegramClient(token, api_url=telegram.api_url)
+    try:
+        worker = OutboxWorker(
+            conn,
+            client,
+            SystemClock(),
+            logger,
+            messages_per_second=telegram.messages_per_second,
+            chat_messages_per_second=telegram.chat_messages_per_second,
+            max_attempts=telegram.max_attempts,
+        )
+        stats = worker.drain(telegram.drain_timeout)
+    finally:
+        client.close()
+    pending = outbox_counts(conn).get("pending", 0)
+    logger.info(
+        "Telegram: %s sent, %s failed, %s pending for the next run.",
+        stats.sent,
+        stats.failed,
+        pending,
+    )
+    metrics.count("telegram_sent", stats.sent)
+    metrics.count("telegram_failed", stats.failed)
+    metrics.count("telegram_pending", pending)
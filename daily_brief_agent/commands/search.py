@@ -0,0 +1,77 @@
+"""The ``search`` and ``reindex`` commands over the full-text index."""
+
+from __future__ import annotations
+
+import argparse
+import html
+import logging
+import re
+import sys
+from operator import itemgetter
+
+from daily_brief_agent.commands.common import item_databases, open_db
+from daily_brief_agent.config import AppConfig
+from daily_brief_agent.db import fill_excerpts, rebuild_search_index, search_available, search_items
+from daily_brief_agent.utils.time import date_range_utc, get_timezone, parse_date
+
+
+def _plain_snippet(snippet: str) -> str:
+    text = html.unescape(re.sub(r"<[^>]*>?", " ", snippet))
+    return " ".join(text.split())
+
+
+def search(args: argparse.Namespace, config: AppConfig, logger: logging.Logger) -> None:
+    conn = open_db(config)
+    try:
+        if not search_available(conn):
+            logger.error("Full-text search needs SQLite built with FTS5.")
+            sys.exit(1)
+        since_utc = None
+        if args.since:
+            tz = get_timezone(config.timezone)
+            since_utc = date_range_utc(parse_date(args.since), tz).start
+        rows = []
+        for database in item_databases(conn, config, since_utc):
+            rows.extend(
+                search_items(
+                    database,
+                    args.query,
+                    since_utc=since_utc,
+                    category=args.category,
+                    source=args.source,
+                    limit=args.limit,
+                )
+            )
+        # Partitions rank separately; their bm25 scores are close enough to merge.
+        rows = sorted(rows, key=itemgetter("score"))[: args.limit]
+    finally:
+        conn.close()
+
+    if not rows:
+        print("No matches.")
+        return
+    for position, row in enumerate(rows, start=1):
+        published = row["published_raw"] or row["fetched_at_utc"]
+        print(f"{position}. {row['title']}")
+        print(f"   {row['source']} · {row['category']} · {published}")
+        print(f"   {row['link']}")
+        snippet = _plain_snippet(row["snippet"] or "")
+        if snippet and snippet.replace("[", "").replace("]", "") != row["title"]:
+            print(f"   {snippet}")
+
+
+def reindex(config: AppConfig, logger: logging.Logger) -> None:
+    conn = open_db(config)
+    try:
+        if not search_available(conn):
+            logger.error("Full-text search needs SQLite built with FTS5.")
+            sys.exit(1)
+        filled = count = 0
+        for database in item_databases(conn, config):
+            filled += fill_excerpts(database, config.storage.excerpt_length)
+            count += rebuild_search_index(database)
+    finally:
+        conn.close()
+    if filled:
+        logger.info("Excerpts filled in for %s items.", filled)
+    logger.info("Search index rebuilt over %s items.", count)
@@ -0,0 +1,117 @@
+"""The ``serve`` command: poll each feed on its own adaptive interval."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+from collections import Counter
+from itertools import groupby
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from daily_brief_agent.commands.common import (
+    ingest,
+    load_feed_states,
+    log_report_update,
+    open_db,
+    save_feed_states,
+    store_items,
+    warn_unpartitioned_items,
+    write_daily_report,
+)
+from daily_brief_agent.config import AppConfig
+from daily_brief_agent.items import Item
+from daily_brief_agent.partitions import TooManyPartitions
+from daily_brief_agent.scheduler import AdaptiveScheduler, Clock, SystemClock
+from daily_brief_agent.utils.time import get_timezone, utc_now
+
+if TYPE_CHECKING:
+    from daily_brief_agent.fetchers.rss import FeedState
+
+
+def poll_due_feeds(
+    conn: sqlite3.Connection,
+    config: AppConfig,
+    scheduler: AdaptiveScheduler,
+    feed_states: dict[str, FeedState],
+    max_per_feed: int,
+    logger: logging.Logger,
+) -> int:
+    due = scheduler.due()
+    if not due:
+        return 0
+    inserted: Counter[str] = Counter()
+
+    def _store(items: list[Item]) -> int:
+        # A feed's items are consecutive in a batch; the scheduler wants each feed's count.
+        total = 0
+        for source, group in groupby(items, key=attrgetter("source")):
+            count = store_items(conn, config, list(group))
+            inserted[source] += count
+            total += count
+        return total
+
+    result = ingest(
+        config,
+        [(conn, due)],
+        due,
+        feed_states,
+        _store,
+        max_per_feed,
+        logger,
+        seen_dbs=[config.storage.db_path] if config.fetch.incremental else [],
+    )
+    feed_states.update(result.states)
+    for feed in due:
+        if feed.url not in result.states:
+            scheduler.record_failure(feed)
+            continue
+        scheduler.record_success(feed, inserted[feed.name])
+        logger.debug(
+            "Feed %s: %s new items, next poll in %.0fs.",
+            feed.name,
+            inserted[feed.name],
+            scheduler.schedule_for(feed).interval,
+        )
+    save_feed_states(conn, result.states)
+    return result.inserted
+
+
+def serve(
+    args: argparse.Namespace,
+    config: AppConfig,
+    logger: logging.Logger,
+    clock: Clock | None = None,
+) -> None:
+    clock = clock or SystemClock()
+    tz = get_timezone(config.timezone)
+    conn = open_db(config)
+    warn_unpartitioned_items(conn, config, logger)
+    feed_states = load_feed_states(conn)
+    scheduler = AdaptiveScheduler(
+        config.feeds, clock, min_interval=args.min_interval, max_interval=args.max_interval
+    )
+    logger.info("Serving %s feeds.", len(config.feeds))
+    try:
+        while True:
+            inserted = poll_due_feeds(
+                conn, config, scheduler, feed_states, args.max_per_feed, logger
+            )
+            if inserted:
+                target_date = utc_now().astimezone(tz).date()
+                logger.info("Inserted %s new items.", inserted)
+                try:
+                    report = write_daily_report(
+                        conn, config, target_date, args.include_history, args.per_category_limit
+                    )
+                except TooManyPartitions as exc:
+                    # Months keep arriving while serving; keep fetching without the report.
+                    logger.error("Report for %s not written: %s", target_date, exc)
+                else:
+                    log_report_update(report, logger)
+            clock.sleep(scheduler.seconds_until_next())
+    except KeyboardInterrupt:
+        logger.info("Stopping.")
+    finally:
+        conn.close()
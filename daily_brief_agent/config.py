@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from daily_brief_agent import __version__
+from daily_brief_agent.utils.text import EXCERPT_LENGTH
 from daily_brief_agent.utils.time import TimezoneError, get_timezone
 
 
@@ -19,6 +23,14 @@ class ConfigError(ValueError):
 class StorageConfig:
     db_path: Path
     reports_dir: Path
+    # One items file per month here instead of the ``items`` table in ``db_path``.
+    partitions_dir: Path | None = None
+    # Keep each summary's raw HTML next to its plain-text excerpt.
+    summary_html: bool = True
+    excerpt_length: int = EXCERPT_LENGTH
+    # Archive every fetched feed body here for ``replay``, within a size cap in MB.
+    payloads_dir: Path | None = None
+    payloads_max_mb: float = 1024.0
 
 
 @dataclass(frozen=True)
@@ -28,9 +40,22 @@ class FeedConfig:
     category: str
 
 
+@dataclass(frozen=True)
+class TelegramChat:
+    chat_id: str
+    categories: list[str] = field(default_factory=list)
+
+
 @dataclass(frozen=True)
 class TelegramConfig:
     enabled: bool
+    digests: bool = False
+    chats: list[TelegramChat] = field(default_factory=list)
+    api_url: str = "https://api.telegram.org"
+    messages_per_second: float = 25.0
+    chat_messages_per_second: float = 1.0
+    max_attempts: int = 5
+    drain_timeout: float = 60.0
 
 
 @dataclass(frozen=True)
@@ -38,28 +63,159 @@ class DeliveryConfig:
     telegram: TelegramConfig
 
 
+@dataclass(frozen=True)
+class FetchConfig:
+    concurrency: int = 8
+    per_host_limit: int = 2
+    feed_timeout: float = 20.0
+    run_timeout: float | None = None
+    incremental: bool = True
+    seen_run_limit: int = 10
+    # Parse processes (None: one per CPU; 0: parse on a thread of the main process),
+    # feeds buffered between stages, and items stored per transaction.
+    parse_workers: int | None = None
+    queue_size: int = 16
+    write_batch_size: int = 1000
+    # Consecutive failures that open a feed's circuit (0: never skip a feed), and the
+    # seconds it then stays open, doubling per failed probe up to the maximum.
+    breaker_failures: int = 3
+    breaker_cooldown: float = 6 * 3600.0
+    breaker_max_cooldown: float = 7 * 86400.0
+
+
+@dataclass(frozen=True)
+class DedupConfig:
+    near_duplicates: bool = True
+    max_distance: int = 3
+    window_hours: float = 72.0
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    enabled: bool = False
+    prometheus_textfile: Path | None = None
+    json_summary: Path | None = None
+
+    @property
+    def active(self) -> bool:
+        return (
+            self.enabled or self.prometheus_textfile is not None or self.json_summary is not None
+        )
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    category: str | None = None
+    source: str | None = None
+    compress_after_days: float | None = None
+    archive_after_days: float | None = None
+
+
+@dataclass(frozen=True)
+class RetentionConfig:
+    policies: list[RetentionPolicy] = field(default_factory=list)
+    archive_dir: Path = Path("archive")
+    vacuum: bool = True
+
+
+@dataclass(frozen=True)
+class ReportConfig:
+    # "fetched" places items on the day they were fetched, "published" on the day
+    # their feed says they were published (falling back to the fetch time).
+    date_field: str = "fetched"
+
+
+REPORT_DATE_FIELDS = ("fetched", "published")
+
+
 @dataclass(frozen=True)
 class AppConfig:
     storage: StorageConfig
     feeds: list[FeedConfig]
     delivery: DeliveryConfig
     timezone: str | None = None
+    fetch: FetchConfig = field(default_factory=FetchConfig)
+    dedup: DedupConfig = field(default_factory=DedupConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    retention: RetentionConfig = field(default_factory=RetentionConfig)
+    report: ReportConfig = field(default_factory=ReportConfig)
 
     def to_safe_dict(self) -> dict[str, Any]:
         return {
             "storage": {
                 "db_path": str(self.storage.db_path),
                 "reports_dir": str(self.storage.reports_dir),
+                "partitions_dir": _optional_path_str(self.storage.partitions_dir),
+                "summary_html": self.storage.summary_html,
+                "excerpt_length": self.storage.excerpt_length,
+                "payloads_dir": _optional_path_str(self.storage.payloads_dir),
+                "payloads_max_mb": self.storage.payloads_max_mb,
             },
             "feeds": [
                 {"name": feed.name, "url": feed.url, "category": feed.category}
                 for feed in self.feeds
             ],
-            "delivery": {"telegram": {"enabled": self.delivery.telegram.enabled}},
+            "delivery": {
+                "telegram": {
+                    "enabled": self.delivery.telegram.enabled,
+                    "digests": self.delivery.telegram.digests,
+                    "chats": [
+                        {"chat_id": chat.chat_id, "categories": list(chat.categories)}
+                        for chat in self.delivery.telegram.chats
+                    ],
+                    "api_url": self.delivery.telegram.api_url,
+                    "messages_per_second": self.delivery.telegram.messages_per_second,
+                    "chat_messages_per_second": self.delivery.telegram.chat_messages_per_second,
+                    "max_attempts": self.delivery.telegram.max_attempts,
+                    "drain_timeout": self.delivery.telegram.drain_timeout,
+                }
+            },
             "timezone": self.timezone,
+            "fetch": {
+                "concurrency": self.fetch.concurrency,
+                "per_host_limit": self.fetch.per_host_limit,
+                "feed_timeout": self.fetch.feed_timeout,
+                "run_timeout": self.fetch.run_timeout,
+                "incremental": self.fetch.incremental,
+                "seen_run_limit": self.fetch.seen_run_limit,
+                "parse_workers": self.fetch.parse_workers,
+                "queue_size": self.fetch.queue_size,
+                "write_batch_size": self.fetch.write_batch_size,
+                "breaker_failures": self.fetch.breaker_failures,
+                "breaker_cooldown": self.fetch.breaker_cooldown,
+                "breaker_max_cooldown": self.fetch.breaker_max_cooldown,
+            },
+            "dedup": {
+                "near_duplicates": self.dedup.near_duplicates,
+                "max_distance": self.dedup.max_distance,
+                "window_hours": self.dedup.window_hours,
+            },
+            "metrics": {
+                "enabled": self.metrics.enabled,
+                "prometheus_textfile": _optional_path_str(self.metrics.prometheus_textfile),
+                "json_summary": _optional_path_str(self.metrics.json_summary),
+            },
+            "retention": {
+                "policies": [
+                    {
+                        "category": policy.category,
+                        "source": policy.source,
+                        "compress_after_days": policy.compress_after_days,
+                        "archive_after_days": policy.archive_after_days,
+                    }
+                    for policy in self.retention.policies
+                ],
+                "archive_dir": str(self.retention.archive_dir),
+                "vacuum": self.retention.vacuum,
+            },
+            "report": {"date_field": self.report.date_field},
         }
 
 
+def _optional_path_str(path: Path | None) -> str | None:
+    return str(path) if path is not None else None
+
+
 def _require_mapping(data: Any, context: str) -> dict[str, Any]:
     if not isinstance(data, dict):
         raise ConfigError(f"{context} must be a mapping.")
@@ -78,21 +234,319 @@ def _require_bool(value: Any, context: str) -> bool:
     return value
 
 
-def load_config(path: str | Path) -> AppConfig:
+def _require_positive_int(value: Any, context: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ConfigError(f"{context} must be a positive integer.")
+    return value
+
+
+def _require_non_negative_int(value: Any, context: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ConfigError(f"{context} must be a non-negative integer.")
+    return value
+
+
+def _require_positive_number(value: Any, context: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ConfigError(f"{context} must be a positive number.")
+    return float(value)
+
+
+def _load_fetch_config(raw: Any) -> FetchConfig:
+    fetch_raw = _require_mapping(raw or {}, "fetch")
+    defaults = FetchConfig()
+    run_timeout = fetch_raw.get("run_timeout", defaults.run_timeout)
+    parse_workers = fetch_raw.get("parse_workers", defaults.parse_workers)
+    breaker_cooldown = _require_positive_number(
+        fetch_raw.get("breaker_cooldown", defaults.breaker_cooldown), "fetch.breaker_cooldown"
+    )
+    breaker_max_cooldown = _require_positive_number(
+        fetch_raw.get("breaker_max_cooldown", defaults.breaker_max_cooldown),
+        "fetch.breaker_max_cooldown",
+    )
+    if breaker_max_cooldown < breaker_cooldown:
+        raise ConfigError("fetch.breaker_max_cooldown must not be less than breaker_cooldown.")
+    return FetchConfig(
+        concurrency=_require_positive_int(
+            fetch_raw.get("concurrency", defaults.concurrency), "fetch.concurrency"
+        ),
+        per_host_limit=_require_positive_int(
+            fetch_raw.get("per_host_limit", defaults.per_host_limit), "fetch.per_host_limit"
+        ),
+        feed_timeout=_require_positive_number(
+            fetch_raw.get("feed_timeout", defaults.feed_timeout), "fetch.feed_timeout"
+        ),
+        run_timeout=(
+            None
+            if run_timeout is None
+            else _require_positive_number(run_timeout, "fetch.run_timeout")
+        ),
+        incremental=_require_bool(
+            fetch_raw.get("incremental", defaults.incremental), "fetch.incremental"
+        ),
+        seen_run_limit=_require_non_negative_int(
+            fetch_raw.get("seen_run_limit", defaults.seen_run_limit), "fetch.seen_run_limit"
+        ),
+        parse_workers=(
+            None
+            if parse_workers is None
+            else _require_non_negative_int(parse_workers, "fetch.parse_workers")
+        ),
+        queue_size=_require_positive_int(
+            fetch_raw.get("queue_size", defaults.queue_size), "fetch.queue_size"
+        ),
+        write_batch_size=_require_positive_int(
+            fetch_raw.get("write_batch_size", defaults.write_batch_size),
+            "fetch.write_batch_size",
+        ),
+        breaker_failures=_require_non_negative_int(
+            fetch_raw.get("breaker_failures", defaults.breaker_failures),
+            "fetch.breaker_failures",
+        ),
+        breaker_cooldown=breaker_cooldown,
+        breaker_max_cooldown=breaker_max_cooldown,
+    )
+
+
+def _load_dedup_config(raw: Any) -> DedupConfig:
+    dedup_raw = _require_mapping(raw or {}, "dedup")
+    defaults = DedupConfig()
+    max_distance = _require_non_negative_int(
+        dedup_raw.get("max_distance", defaults.max_distance), "dedup.max_distance"
+    )
+    if max_distance > 3:
+        raise ConfigError("dedup.max_distance must be at most 3.")
+    return DedupConfig(
+        near_duplicates=_require_bool(
+            dedup_raw.get("near_duplicates", defaults.near_duplicates), "dedup.near_duplicates"
+        ),
+        max_distance=max_distance,
+        window_hours=_require_positive_number(
+            dedup_raw.get("window_hours", defaults.window_hours), "dedup.window_hours"
+        ),
+    )
+
+
+def _load_telegram_config(raw: Any) -> TelegramConfig:
+    telegram_raw = _require_mapping(raw or {}, "delivery.telegram")
+    defaults = TelegramConfig(enabled=False)
+    chats_raw = telegram_raw.get("chats") or []
+    if not isinstance(chats_raw, list):
+        raise ConfigError("delivery.telegram.chats must be a list.")
+    chats: list[TelegramChat] = []
+    for index, chat in enumerate(chats_raw, start=1):
+        context = f"delivery.telegram.chats[{index}]"
+        chat_map = _require_mapping(chat, context)
+        chat_id = chat_map.get("chat_id")
+        if isinstance(chat_id, int) and not isinstance(chat_id, bool):
+            chat_id = str(chat_id)
+        categories = chat_map.get("categories") or []
+        if not isinstance(categories, list):
+            raise ConfigError(f"{context}.categories must be a list.")
+        chats.append(
+            TelegramChat(
+                chat_id=_require_str(chat_id, f"{context}.chat_id"),
+                categories=[
+                    _require_str(category, f"{context}.categories") for category in categories
+                ],
+            )
+        )
+    return TelegramConfig(
+        enabled=_require_bool(telegram_raw.get("enabled", False), "delivery.telegram.enabled"),
+        digests=_require_bool(
+            telegram_raw.get("digests", defaults.digests), "delivery.telegram.digests"
+        ),
+        chats=chats,
+        api_url=_require_str(
+            telegram_raw.get("api_url", defaults.api_url), "delivery.telegram.api_url"
+        ).rstrip("/"),
+        messages_per_second=_require_positive_number(
+            telegram_raw.get("messages_per_second", defaults.messages_per_second),
+            "delivery.telegram.messages_per_second",
+        ),
+        chat_messages_per_second=_require_positive_number(
+            telegram_raw.get("chat_messages_per_second", defaults.chat_messages_per_second),
+            "delivery.telegram.chat_messages_per_second",
+        ),
+        max_attempts=_require_positive_int(
+            telegram_raw.get("max_attempts", defaults.max_attempts),
+            "delivery.telegram.max_attempts",
+        ),
+        drain_timeout=_require_positive_number(
+            telegram_raw.get("drain_timeout", defaults.drain_timeout),
+            "delivery.telegram.drain_timeout",
+        ),
+    )
+
+
+def _load_retention_config(raw: Any) -> RetentionConfig:
+    retention_raw = _require_mapping(raw or {}, "retention")
+    defaults = RetentionConfig()
+    policies_raw = retention_raw.get("policies") or []
+    if not isinstance(policies_raw, list):
+        raise ConfigError("retention.policies must be a list.")
+    policies: list[RetentionPolicy] = []
+    for index, policy in enumerate(policies_raw, start=1):
+        context = f"retention.policies[{index}]"
+        policy_map = _require_mapping(policy, context)
+        values: dict[str, Any] = {}
+        for key in ("category", "source"):
+            value = policy_map.get(key)
+            values[key] = None if value is None else _require_str(value, f"{context}.{key}")
+        for key in ("compress_after_days", "archive_after_days"):
+            value = policy_map.get(key)
+            values[key] = (
+                None if value is None else _require_positive_number(value, f"{context}.{key}")
+            )
+        if values["compress_after_days"] is None and values["archive_after_days"] is None:
+            raise ConfigError(f"{context} needs compress_after_days or archive_after_days.")
+        policies.append(RetentionPolicy(**values))
+    return RetentionConfig(
+        policies=policies,
+        archive_dir=Path(
+            _require_str(
+                retention_raw.get("archive_dir", str(defaults.archive_dir)),
+                "retention.archive_dir",
+            )
+        ),
+        vacuum=_require_bool(retention_raw.get("vacuum", defaults.vacuum), "retention.vacuum"),
+    )
+
+
+def _load_metrics_config(raw: Any) -> MetricsConfig:
+    metrics_raw = _require_mapping(raw or {}, "metrics")
+    paths: dict[str, Path | None] = {}
+    for key in ("prometheus_textfile", "json_summary"):
+        value = metrics_raw.get(key)
+        paths[key] = None if value is None else Path(_require_str(value, f"metrics.{key}"))
+    return MetricsConfig(
+        enabled=_require_bool(metrics_raw.get("enabled", False), "metrics.enabled"),
+        **paths,
+    )
+
+
+def _load_report_config(raw: Any) -> ReportConfig:
+    report_raw = _require_mapping(raw or {}, "report")
+    date_field = _require_str(
+        report_raw.get("date_field", ReportConfig.date_field), "report.date_field"
+    )
+    if date_field not in REPORT_DATE_FIELDS:
+        raise ConfigError(f"report.date_field must be one of {', '.join(REPORT_DATE_FIELDS)}.")
+    return ReportConfig(date_field=date_field)
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory (``DAILY_BRIEF_AGENT_CACHE_DIR`` overrides it)."""
+    override = os.getenv("DAILY_BRIEF_AGENT_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "daily-brief-agent"
+
+
+def _cache_key(config_path: Path) -> dict[str, Any]:
+    stat = config_path.stat()
+    return {
+        "version": __version__,
+        "path": str(config_path.resolve()),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+def _cache_file(cache_dir: Path, key: dict[str, Any]) -> Path:
+    digest = hashlib.sha256(key["path"].encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"config-{digest}.json"
+
+
+def _read_cached_config(cache_file: Path, key: dict[str, Any]) -> dict[str, Any] | None:
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached.get("config")
+
+
+def _write_cached_config(cache_file: Path, key: dict[str, Any], config: AppConfig) -> None:
+    # Best effort: an unwritable cache only costs the next run a YAML parse.
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"key": key, "config": config.to_safe_dict()}), encoding="utf-8"
+        )
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        pass
+
+
+def load_config(path: str | Path, cache_dir: Path | None = None) -> AppConfig:
+    """Load and validate a config file."""
     config_path = Path(path)
     if not config_path.exists():
         raise ConfigError(f"Config file not found: {config_path}")
+
+    if cache_dir is not None:
+        key = _cache_key(config_path)
+        cache_file = _cache_file(cache_dir, key)
+        cached = _read_cached_config(cache_file, key)
+        if cached is not None:
+            try:
+                return _build_config(cached)
+            except ConfigError:
+                pass
+        config = _build_config(_read_yaml(config_path))
+        _write_cached_config(cache_file, key, config)
+        return config
+    return _build_config(_read_yaml(config_path))
+
+
+def _read_yaml(config_path: Path) -> Any:
+    import yaml
+
     try:
-        raw = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+        return yaml.safe_load(config_path.read_text(encoding="utf-8"))
     except yaml.YAMLError as exc:
         raise ConfigError("Config file is not valid YAML.") from exc
 
+
+def _build_config(raw: Any) -> AppConfig:
     raw = _require_mapping(raw, "Config root")
 
     storage_raw = _require_mapping(raw.get("storage"), "storage")
     db_path = _require_str(storage_raw.get("db_path"), "storage.db_path")
     reports_dir = _require_str(storage_raw.get("reports_dir"), "storage.reports_dir")
-    storage = StorageConfig(db_path=Path(db_path), reports_dir=Path(reports_dir))
+    partitions_dir = storage_raw.get("partitions_dir")
+    payloads_dir = storage_raw.get("payloads_dir")
+    storage = StorageConfig(
+        db_path=Path(db_path),
+        reports_dir=Path(reports_dir),
+        partitions_dir=(
+            None
+            if partitions_dir is None
+            else Path(_require_str(partitions_dir, "storage.partitions_dir"))
+        ),
+        summary_html=_require_bool(
+            storage_raw.get("summary_html", True), "storage.summary_html"
+        ),
+        excerpt_length=_require_positive_int(
+            storage_raw.get("excerpt_length", EXCERPT_LENGTH), "storage.excerpt_length"
+        ),
+        payloads_dir=(
+            None
+            if payloads_dir is None
+            else Path(_require_str(payloads_dir, "storage.payloads_dir"))
+        ),
+        payloads_max_mb=_require_positive_number(
+            storage_raw.get("payloads_max_mb", StorageConfig.payloads_max_mb),
+            "storage.payloads_max_mb",
+        ),
+    )
 
     feeds_raw = raw.get("feeds")
     if not isinstance(feeds_raw, list) or not feeds_raw:
@@ -106,9 +560,7 @@ def load_config(path: str | Path) -> AppConfig:
         feeds.append(FeedConfig(name=name, url=url, category=category))
 
     delivery_raw = _require_mapping(raw.get("delivery") or {}, "delivery")
-    telegram_raw = _require_mapping(delivery_raw.get("telegram") or {}, "delivery.telegram")
-    telegram_enabled = telegram_raw.get("enabled", False)
-    telegram = TelegramConfig(enabled=_require_bool(telegram_enabled, "delivery.telegram.enabled"))
+    telegram = _load_telegram_config(delivery_raw.get("telegram"))
 
     timezone_value = raw.get("timezone")
     if timezone_value is not None:
@@ -118,9 +570,20 @@ def load_config(path: str | Path) -> AppConfig:
         except TimezoneError as exc:
             raise ConfigError(str(exc)) from exc
 
+    fetch = _load_fetch_config(raw.get("fetch"))
+    dedup = _load_dedup_config(raw.get("dedup"))
+    metrics = _load_metrics_config(raw.get("metrics"))
+    retention = _load_retention_config(raw.get("retention"))
+    report = _load_report_config(raw.get("report"))
+
     return AppConfig(
         storage=storage,
         feeds=feeds,
         delivery=DeliveryConfig(telegram=telegram),
         timezone=timezone_value,
+        fetch=fetch,
+        dedup=dedup,
+        metrics=metrics,
+        retention=retention,
+        report=report,
     )
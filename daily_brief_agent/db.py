@@ -2,12 +2,191 @@
 
 from __future__ import annotations
 
+import json
 import sqlite3
+import zlib
 from datetime import datetime
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+from daily_brief_agent.items import (
+    ITEM_COLUMNS,
+    Item,
+    as_item,
+    item_factory,
+    item_factory_without_summary,
+)
+from daily_brief_agent.utils.hashing import sha256_hex
+from daily_brief_agent.utils.text import EXCERPT_LENGTH, html_excerpt
+from daily_brief_agent.utils.time import parse_timestamp, to_epoch
+
+if TYPE_CHECKING:
+    from daily_brief_agent.dedup import NearDuplicateIndex
+
+
+def _ensure_columns(
+    conn: sqlite3.Connection, table: str, columns: dict[str, str]
+) -> list[str]:
+    """Add missing ``columns`` to ``table`` and return the names that were added."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    added = []
+    for name, declaration in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+            added.append(name)
+    return added
+
+
+def decode_summary(value: str | bytes | None) -> str | None:
+    """Return ``summary_raw`` as text, inflating summaries that retention compressed."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+def compress_summary(value: str | bytes | None, level: int = 9) -> str | bytes | None:
+    """Deflate a text summary into a BLOB; other values are returned unchanged."""
+    if isinstance(value, str):
+        return zlib.compress(value.encode("utf-8"), level)
+    return value
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    """Register the SQL functions that queries and migrations here call."""
+    conn.create_function("summary_text", 1, decode_summary, deterministic=True)
+    conn.create_function("compress_summary", 2, compress_summary, deterministic=True)
+    conn.create_function("html_excerpt", 2, html_excerpt, deterministic=True)
+    conn.create_function("parse_timestamp", 1, parse_timestamp, deterministic=True)
 
 
 def init_db(conn: sqlite3.Connection) -> None:
+    register_functions(conn)
+    # Only takes effect on a new database; existing ones are converted by
+    # ``enable_incremental_vacuum``.
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    _init_items_schema(conn)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS feed_state (
+            url TEXT PRIMARY KEY,
+            etag TEXT NULL,
+            last_modified TEXT NULL,
+            content_hash TEXT NULL,
+            content_length INTEGER NOT NULL DEFAULT 0,
+            parse_seconds REAL NOT NULL DEFAULT 0,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS feed_health (
+            url TEXT PRIMARY KEY,
+            feed TEXT NOT NULL,
+            consecutive_failures INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            last_success_at_utc TEXT NULL,
+            last_failure_at_utc TEXT NULL,
+            last_error TEXT NULL,
+            avg_seconds REAL NULL,
+            avg_bytes REAL NULL,
+            open_until_utc TEXT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at_utc TEXT NOT NULL,
+            finished_at_utc TEXT NOT NULL,
+            total_seconds REAL NOT NULL,
+            stages_json TEXT NOT NULL,
+            counters_json TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS feed_runs (
+            run_id INTEGER NOT NULL REFERENCES runs (id),
+            feed TEXT NOT NULL,
+            url TEXT NOT NULL,
+            seconds REAL NOT NULL,
+            bytes_downloaded INTEGER NOT NULL,
+            entries_parsed INTEGER NOT NULL,
+            new_items INTEGER NOT NULL,
+            not_modified INTEGER NOT NULL,
+            error TEXT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feed_runs_run ON feed_runs (run_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feed_runs_url ON feed_runs (url)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_id TEXT NOT NULL,
+            text TEXT NOT NULL,
+            created_at_utc TEXT NOT NULL,
+            next_attempt_at_utc TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            sent_at_utc TEXT NULL,
+            last_error TEXT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_outbox_pending
+        ON outbox (next_attempt_at_utc, id) WHERE status = 'pending'
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS report_sections (
+            report TEXT NOT NULL,
+            category TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            body TEXT NOT NULL,
+            PRIMARY KEY (report, category)
+        ) WITHOUT ROWID
+        """
+    )
+    # Global ID index for partitioned storage; empty when items live in ``items``.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS item_ids (
+            id TEXT PRIMARY KEY,
+            month TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    # Publish-time span of each partition, so reports by publish date attach only
+    # the months holding items published in their range.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS partition_published (
+            month TEXT PRIMARY KEY,
+            min_published_epoch INTEGER NULL,
+            max_published_epoch INTEGER NULL
+        ) WITHOUT ROWID
+        """
+    )
+    conn.commit()
+
+
+def init_partition(conn: sqlite3.Connection) -> None:
+    """Create one monthly partition file: ``items`` with its indexes and search index."""
+    register_functions(conn)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    _init_items_schema(conn)
+    conn.commit()
+
+
+def _init_items_schema(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS items (
@@ -18,54 +197,793 @@ def init_db(conn: sqlite3.Connection) -> None:
             source TEXT NOT NULL,
             title TEXT NOT NULL,
             link TEXT NOT NULL,
-            summary_raw TEXT NULL
+            summary_raw TEXT NULL,
+            title_simhash INTEGER NULL,
+            duplicate_of TEXT NULL,
+            excerpt TEXT NULL,
+            fetched_at_epoch INTEGER NULL,
+            published_at_epoch INTEGER NULL
         )
         """
     )
+    added = _ensure_columns(
+        conn,
+        "items",
+        {
+            "title_simhash": "INTEGER NULL",
+            "duplicate_of": "TEXT NULL",
+            "excerpt": "TEXT NULL",
+            "fetched_at_epoch": "INTEGER NULL",
+            "published_at_epoch": "INTEGER NULL",
+        },
+    )
+    if "fetched_at_epoch" in added:
+        # One pass over items stored before the epoch columns existed.
+        conn.execute(
+            """
+            UPDATE items SET
+                fetched_at_epoch = parse_timestamp(fetched_at_utc),
+                published_at_epoch = parse_timestamp(published_raw)
+            """
+        )
     conn.execute("CREATE INDEX IF NOT EXISTS idx_items_fetched_at ON items (fetched_at_utc)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_items_fetched_at_epoch ON items (fetched_at_epoch)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_items_published_at_epoch ON items (published_at_epoch)"
+    )
     conn.execute("CREATE INDEX IF NOT EXISTS idx_items_category ON items (category)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_items_source ON items (source)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_items_title_simhash ON items (title_simhash)")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_duplicate_of
+        ON items (duplicate_of, source) WHERE duplicate_of IS NOT NULL
+        """
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_items_report")
+    conn.execute("DROP INDEX IF EXISTS idx_items_report_primary")
+    # Index entries end with the rowid, so ties come out in insertion order.
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_report_order
+        ON items (category, source, title) WHERE duplicate_of IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS title_simhash_bands (
+            band INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            item_id TEXT NOT NULL,
+            PRIMARY KEY (band, value, item_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS archived_ids (
+            id TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+        """
+    )
+    # Archived items must not come back as new when a feed still lists them.
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS items_skip_archived BEFORE INSERT ON items
+        WHEN EXISTS (SELECT 1 FROM archived_ids WHERE id = new.id) BEGIN
+            SELECT RAISE(IGNORE);
+        END
+        """
+    )
+    _init_search_index(conn)
+
+
+def _init_search_index(conn: sqlite3.Connection) -> None:
+    """Create the FTS5 index over ``items`` and the triggers that keep it in sync."""
+    if search_available(conn):
+        _upgrade_search_triggers(conn)
+        return
+    _create_search_view(conn)
+    try:
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE items_fts USING fts5 (
+                title, summary_raw,
+                content = 'items_search', content_rowid = 'item_rowid',
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+            """
+        )
+    except sqlite3.OperationalError:
+        return
+    _create_search_triggers(conn)
+
+
+def _search_text(row: str) -> str:
+    summary = f"{row}summary_raw"
+    return f"coalesce(CASE WHEN typeof({summary}) = 'text' THEN {summary} END, {row}excerpt)"
+
+
+def _create_search_view(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE VIEW IF NOT EXISTS items_search AS
+        SELECT rowid AS item_rowid, title, {_search_text("")} AS summary_raw
+        FROM items
+        """
+    )
+
+
+def _create_search_triggers(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+            INSERT INTO items_fts (rowid, title, summary_raw)
+            VALUES (new.rowid, new.title, {_search_text("new.")});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+            INSERT INTO items_fts (items_fts, rowid, title, summary_raw)
+            VALUES ('delete', old.rowid, old.title, {_search_text("old.")});
+        END
+        """
+    )
+    # Compressing a summary re-indexes the item by its excerpt.
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS items_fts_update
+        AFTER UPDATE OF title, summary_raw, excerpt ON items
+        WHEN old.title IS NOT new.title
+            OR old.summary_raw IS NOT new.summary_raw
+            OR old.excerpt IS NOT new.excerpt
+        BEGIN
+            INSERT INTO items_fts (items_fts, rowid, title, summary_raw)
+            VALUES ('delete', old.rowid, old.title, {_search_text("old.")});
+            INSERT INTO items_fts (rowid, title, summary_raw)
+            VALUES (new.rowid, new.title, {_search_text("new.")});
+        END
+        """
+    )
+
+
+def _upgrade_search_triggers(conn: sqlite3.Connection) -> None:
+    """Recreate a view and triggers that called ``summary_text`` as plain SQL."""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'items_search'"
+    ).fetchone()
+    if row is None or "summary_text" not in row[0]:
+        return
+    conn.execute("DROP VIEW items_search")
+    for trigger in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS items_fts_{trigger}")
+    _create_search_view(conn)
+    _create_search_triggers(conn)
+    if conn.execute("SELECT 1 FROM items WHERE typeof(summary_raw) = 'blob' LIMIT 1").fetchone():
+        rebuild_search_index(conn)
+
+
+def upgrade_search_index(conn: sqlite3.Connection) -> bool:
+    """Move an index built directly over ``items`` onto ``items_search``."""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+    ).fetchone()
+    if row is None or "items_search" in row[0]:
+        return False
+    for trigger in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS items_fts_{trigger}")
+    conn.execute("DROP TABLE items_fts")
+    _init_search_index(conn)
+    rebuild_search_index(conn)
+    return True
+
+
+def search_available(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+    ).fetchone()
+    return row is not None
+
+
+# Schema names under which ``daily_brief_agent.partitions`` attaches monthly files.
+PARTITION_SCHEMA_PREFIX = "part_"
+
+
+def item_schemas(conn: sqlite3.Connection) -> list[str]:
+    """Return the schemas item queries read: the attached partitions, else ``main``."""
+    schemas = [
+        row[1]
+        for row in conn.execute("PRAGMA database_list")
+        if row[1].startswith(PARTITION_SCHEMA_PREFIX)
+    ]
+    return sorted(schemas) or ["main"]
+
+
+_ITEM_COLUMNS = (
+    "id, fetched_at_utc, published_raw, category, source, title, link, title_simhash, "
+    "duplicate_of, fetched_at_epoch, published_at_epoch"
+)
+
+
+def _day_filter(by_published: bool, prefix: str = "") -> str:
+    """Match items whose report time lies between two epoch-second placeholders."""
+    if not by_published:
+        return f"{prefix}fetched_at_epoch BETWEEN ? AND ?"
+    return (
+        f"({prefix}published_at_epoch BETWEEN ? AND ? OR ({prefix}published_at_epoch IS NULL "
+        f"AND {prefix}fetched_at_epoch BETWEEN ? AND ?))"
+    )
+
+
+def _day_params(start_utc: datetime, end_utc: datetime, by_published: bool) -> tuple[int, ...]:
+    bounds = (to_epoch(start_utc), to_epoch(end_utc))
+    return bounds * 2 if by_published else bounds
+
+
+def _items_source(schemas: Sequence[str], columns: str = _ITEM_COLUMNS) -> str:
+    """Return a ``FROM`` source over ``items`` in every schema."""
+    if len(schemas) == 1:
+        return f"{schemas[0]}.items"
+    union = " UNION ALL ".join(
+        f"SELECT {columns}, {index} AS part, rowid AS rowid FROM {schema}.items"
+        for index, schema in enumerate(schemas)
+    )
+    return f"({union})"
+
+
+def _insertion_order(schemas: Sequence[str], prefix: str = "") -> str:
+    """Order rows of ``_items_source`` as they were inserted, month by month."""
+    if len(schemas) == 1:
+        return f"{prefix}rowid"
+    return f"{prefix}part, {prefix}rowid"
+
+
+_INSERT_ITEM_SQL = """
+    INSERT OR IGNORE INTO {schema}.items (
+        id, fetched_at_utc, published_raw, category, source, title, link, summary_raw,
+        title_simhash, duplicate_of, excerpt, fetched_at_epoch, published_at_epoch
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _item_row(item: Item, duplicate_of: str | None = None) -> tuple[Any, ...]:
+    return (
+        item.id,
+        item.fetched_at_utc,
+        item.published_raw,
+        item.category,
+        item.source,
+        item.title,
+        item.link,
+        item.summary_raw,
+        item.title_simhash,
+        duplicate_of,
+        item.excerpt,
+        parse_timestamp(item.fetched_at_utc),
+        parse_timestamp(item.published_raw),
+    )
+
+
+def insert_items(
+    conn: sqlite3.Connection,
+    items: Iterable[Item | dict[str, Any]],
+    near_duplicates: NearDuplicateIndex | None = None,
+    schema: str = "main",
+) -> int:
+    """Insert items into ``schema``'s ``items``, skipping stored IDs; returns rows inserted."""
+    insert_sql = _INSERT_ITEM_SQL.format(schema=schema)
+    items = [as_item(item) for item in items]
+    if schema == "main":
+        # Partitioned inserts drop these before recording the IDs in ``item_ids``.
+        items = without_legacy_ids(conn, items)
+    if near_duplicates is None:
+        cursor = conn.cursor()
+        cursor.executemany(insert_sql, [_item_row(item) for item in items])
+        conn.commit()
+        return cursor.rowcount
+
+    inserted = 0
+    for item in items:
+        fingerprint = item.title_simhash
+        duplicate_of = None
+        if fingerprint is not None:
+            if conn.execute(
+                f"SELECT 1 FROM {schema}.items WHERE id = ?", (item.id,)
+            ).fetchone():
+                continue
+            duplicate_of = near_duplicates.find_duplicate(conn, fingerprint, item.fetched_at_utc)
+        cursor = conn.execute(insert_sql, _item_row(item, duplicate_of))
+        if cursor.rowcount:
+            inserted += 1
+            if fingerprint is not None:
+                near_duplicates.add(conn, item.id, fingerprint, schema)
     conn.commit()
+    return inserted
 
 
-def insert_items(conn: sqlite3.Connection, items: Iterable[dict[str, str | None]]) -> int:
+def without_legacy_ids(conn: sqlite3.Connection, items: list[Item]) -> list[Item]:
+    """Drop items already stored under the ID of their raw link."""
+    legacy = [sha256_hex(item.link) for item in items]
+    candidates = {
+        legacy_id for legacy_id, item in zip(legacy, items, strict=True) if legacy_id != item.id
+    }
+    if not candidates:
+        return items
+    stored = existing_ids(conn, candidates)
+    return [item for legacy_id, item in zip(legacy, items, strict=True) if legacy_id not in stored]
+
+
+def existing_ids(
+    conn: sqlite3.Connection, ids: Iterable[str], batch_size: int = 500
+) -> set[str]:
+    """Return the subset of ``ids`` already stored, in ``items`` or a partition, or archived."""
+    pending = list(ids)
+    found: set[str] = set()
+    for offset in range(0, len(pending), batch_size):
+        batch = pending[offset : offset + batch_size]
+        placeholders = ", ".join("?" * len(batch))
+        cursor = conn.execute(
+            f"""
+            SELECT id FROM main.items WHERE id IN ({placeholders})
+            UNION ALL
+            SELECT id FROM main.item_ids WHERE id IN ({placeholders})
+            UNION ALL
+            SELECT id FROM main.archived_ids WHERE id IN ({placeholders})
+            """,
+            batch * 3,
+        )
+        found.update(row[0] for row in cursor)
+    return found
+
+
+def query_items_for_date(
+    conn: sqlite3.Connection,
+    start_utc: datetime,
+    end_utc: datetime,
+    include_history: bool,
+    summary: bool = False,
+    by_published: bool = False,
+) -> list[Item]:
+    """Return the items fetched in ``[start_utc, end_utc]``, or all with ``include_history``."""
+    columns = ITEM_COLUMNS.replace(
+        "summary_raw", "summary_text(summary_raw)" if summary else "NULL"
+    )
+    source = _items_source(
+        item_schemas(conn), f"{ITEM_COLUMNS}, fetched_at_epoch, published_at_epoch"
+    )
     cursor = conn.cursor()
-    cursor.executemany(
+    cursor.row_factory = item_factory if summary else item_factory_without_summary
+    if include_history:
+        cursor.execute(f"SELECT {columns} FROM {source}")
+    else:
+        cursor.execute(
+            f"SELECT {columns} FROM {source} WHERE {_day_filter(by_published)}",
+            _day_params(start_utc, end_utc, by_published),
+        )
+    return cursor.fetchall()
+
+
+def get_feed_states(conn: sqlite3.Connection) -> dict[str, dict[str, Any]]:
+    cursor = conn.execute(
         """
-        INSERT OR IGNORE INTO items (
-            id, fetched_at_utc, published_raw, category, source, title, link, summary_raw
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        SELECT url, etag, last_modified, content_hash, content_length, parse_seconds
+        FROM feed_state
+        """
+    )
+    return {
+        row[0]: {
+            "etag": row[1],
+            "last_modified": row[2],
+            "content_hash": row[3],
+            "content_length": row[4],
+            "parse_seconds": row[5],
+        }
+        for row in cursor
+    }
+
+
+def upsert_feed_states(conn: sqlite3.Connection, states: Iterable[dict[str, Any]]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO feed_state (
+            url, etag, last_modified, content_hash, content_length, parse_seconds,
+            updated_at_utc
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            etag = excluded.etag,
+            last_modified = excluded.last_modified,
+            content_hash = excluded.content_hash,
+            content_length = excluded.content_length,
+            parse_seconds = excluded.parse_seconds,
+            updated_at_utc = excluded.updated_at_utc
         """,
         [
             (
-                item["id"],
-                item["fetched_at_utc"],
-                item.get("published_raw"),
-                item["category"],
-                item["source"],
-                item["title"],
-                item["link"],
-                item.get("summary_raw"),
+                state["url"],
+                state.get("etag"),
+                state.get("last_modified"),
+                state.get("content_hash"),
+                state.get("content_length", 0),
+                state.get("parse_seconds", 0.0),
+                state["updated_at_utc"],
             )
-            for item in items
+            for state in states
         ],
     )
     conn.commit()
-    return cursor.rowcount
 
 
-def query_items_for_date(
+_FEED_HEALTH_COLUMNS = (
+    "url",
+    "feed",
+    "consecutive_failures",
+    "successes",
+    "failures",
+    "last_success_at_utc",
+    "last_failure_at_utc",
+    "last_error",
+    "avg_seconds",
+    "avg_bytes",
+    "open_until_utc",
+)
+
+
+def get_feed_health(conn: sqlite3.Connection) -> dict[str, dict[str, Any]]:
+    """Return every stored ``feed_health`` row by URL, as column-keyed dicts."""
+    cursor = conn.execute(f"SELECT {', '.join(_FEED_HEALTH_COLUMNS)} FROM feed_health")
+    return {row[0]: dict(zip(_FEED_HEALTH_COLUMNS, row, strict=True)) for row in cursor}
+
+
+def upsert_feed_health(conn: sqlite3.Connection, rows: Iterable[dict[str, Any]]) -> None:
+    columns = ", ".join(_FEED_HEALTH_COLUMNS)
+    updates = ", ".join(f"{column} = excluded.{column}" for column in _FEED_HEALTH_COLUMNS[1:])
+    conn.executemany(
+        f"""
+        INSERT INTO feed_health ({columns})
+        VALUES ({", ".join("?" * len(_FEED_HEALTH_COLUMNS))})
+        ON CONFLICT(url) DO UPDATE SET {updates}
+        """,
+        [tuple(row[column] for column in _FEED_HEALTH_COLUMNS) for row in rows],
+    )
+    conn.commit()
+
+
+def _other_sources_sql(schemas: Sequence[str]) -> str:
+    # One correlated arm per schema: a union view here would be scanned for every row.
+    arms = " UNION ".join(
+        f"""
+                    SELECT DISTINCT duplicate.source
+                    FROM {schema}.items AS duplicate
+                    WHERE duplicate.duplicate_of = ranked.id
+                        AND duplicate.source != ranked.source"""
+        for schema in schemas
+    )
+    return f"""(
+                SELECT group_concat(source, char(31)) FROM ({arms}
+                    ORDER BY 1
+                )
+            ) AS other_sources"""
+
+
+def query_report_rows(
     conn: sqlite3.Connection,
     start_utc: datetime,
     end_utc: datetime,
     include_history: bool,
-) -> list[sqlite3.Row]:
+    per_category_limit: int,
+    by_published: bool = False,
+) -> sqlite3.Cursor:
+    """Return a cursor over only the rows a report renders, in render order."""
     conn.row_factory = sqlite3.Row
-    if include_history:
-        cursor = conn.execute("SELECT * FROM items")
+    schemas = item_schemas(conn)
+    where = "" if include_history else f"AND {_day_filter(by_published)}"
+    params: tuple[int, ...] = ()
+    if not include_history:
+        params = _day_params(start_utc, end_utc, by_published)
+    cursor = conn.execute(
+        f"""
+        SELECT
+            ranked.category, ranked.source, ranked.title, ranked.link, ranked.published_raw,
+            {_other_sources_sql(schemas)}
+        FROM (
+            SELECT
+                id, category, source, title, link, published_raw,
+                ROW_NUMBER() OVER (
+                    PARTITION BY category ORDER BY source, title, {_insertion_order(schemas)}
+                ) AS position
+            FROM {_items_source(schemas)}
+            WHERE duplicate_of IS NULL {where}
+        ) AS ranked
+        WHERE ranked.position <= ?
+        ORDER BY ranked.category, ranked.position
+        """,
+        (*params, per_category_limit),
+    )
+    return cursor
+
+
+def query_report_rows_by_day(
+    conn: sqlite3.Connection,
+    days: Sequence[tuple[str, datetime, datetime]],
+    per_category_limit: int,
+    by_published: bool = False,
+) -> sqlite3.Cursor:
+    """Return report rows for many days in one query, ordered by day then render order."""
+    if not days:
+        raise ValueError("At least one day is required.")
+    conn.row_factory = sqlite3.Row
+    schemas = item_schemas(conn)
+    # One JSON parameter however many days, which would otherwise overrun SQLite's
+    # limit on bound variables (999 before 3.32) after 333 days.
+    bounds = json.dumps(
+        [[day, to_epoch(start_utc), to_epoch(end_utc)] for day, start_utc, end_utc in days]
+    )
+    if by_published:
+        in_day = """(items.published_at_epoch BETWEEN days.start_epoch AND days.end_epoch
+            OR (items.published_at_epoch IS NULL
+                AND items.fetched_at_epoch BETWEEN days.start_epoch AND days.end_epoch))"""
     else:
-        cursor = conn.execute(
-            "SELECT * FROM items WHERE fetched_at_utc BETWEEN ? AND ?",
-            (start_utc.isoformat(), end_utc.isoformat()),
+        in_day = "items.fetched_at_epoch BETWEEN days.start_epoch AND days.end_epoch"
+    cursor = conn.execute(
+        f"""
+        WITH days (day, start_epoch, end_epoch) AS (
+            SELECT
+                json_extract(value, '$[0]'), json_extract(value, '$[1]'),
+                json_extract(value, '$[2]')
+            FROM json_each(?)
+        )
+        SELECT
+            ranked.day, ranked.category, ranked.source, ranked.title, ranked.link,
+            ranked.published_raw,
+            {_other_sources_sql(schemas)}
+        FROM (
+            SELECT
+                days.day, items.id, items.category, items.source, items.title, items.link,
+                items.published_raw,
+                ROW_NUMBER() OVER (
+                    PARTITION BY days.day, items.category
+                    ORDER BY items.source, items.title, {_insertion_order(schemas, "items.")}
+                ) AS position
+            FROM days
+            JOIN {_items_source(schemas)} AS items ON {in_day}
+            WHERE items.duplicate_of IS NULL
+        ) AS ranked
+        WHERE ranked.position <= ?
+        ORDER BY ranked.day, ranked.category, ranked.position
+        """,
+        (bounds, per_category_limit),
+    )
+    return cursor
+
+
+def get_report_sections(conn: sqlite3.Connection, report: str) -> dict[str, tuple[str, str]]:
+    """Return ``{category: (digest, body)}`` cached for a report file."""
+    cursor = conn.execute(
+        "SELECT category, digest, body FROM report_sections WHERE report = ?", (report,)
+    )
+    return {category: (digest, body) for category, digest, body in cursor}
+
+
+def save_report_sections(
+    conn: sqlite3.Connection, report: str, sections: dict[str, tuple[str, str]]
+) -> None:
+    """Replace the cached sections of a report file."""
+    with conn:
+        conn.execute("DELETE FROM report_sections WHERE report = ?", (report,))
+        conn.executemany(
+            "INSERT INTO report_sections (report, category, digest, body) VALUES (?, ?, ?, ?)",
+            [(report, category, digest, body) for category, (digest, body) in sections.items()],
+        )
+
+
+def enqueue_outbox(
+    conn: sqlite3.Connection, messages: Iterable[tuple[str, str]], now_utc: str
+) -> int:
+    """Queue ``(chat_id, text)`` messages for delivery and return how many were added."""
+    rows = [(chat_id, text, now_utc, now_utc) for chat_id, text in messages]
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO outbox (chat_id, text, created_at_utc, next_attempt_at_utc)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows,
         )
+    return len(rows)
+
+
+def due_outbox(conn: sqlite3.Connection, now_utc: str, limit: int = 100) -> list[sqlite3.Row]:
+    """Return pending messages whose next attempt is due, oldest first."""
+    conn.row_factory = sqlite3.Row
+    return conn.execute(
+        """
+        SELECT id, chat_id, text, attempts FROM outbox
+        WHERE status = 'pending' AND next_attempt_at_utc <= ?
+        ORDER BY next_attempt_at_utc, id
+        LIMIT ?
+        """,
+        (now_utc, limit),
+    ).fetchall()
+
+
+def next_outbox_attempt(conn: sqlite3.Connection) -> str | None:
+    """Return the earliest ``next_attempt_at_utc`` of any pending message."""
+    row = conn.execute(
+        "SELECT min(next_attempt_at_utc) FROM outbox WHERE status = 'pending'"
+    ).fetchone()
+    return row[0]
+
+
+def update_outbox(
+    conn: sqlite3.Connection,
+    message_id: int,
+    status: str,
+    attempts: int,
+    now_utc: str,
+    next_attempt_at_utc: str | None = None,
+    error: str | None = None,
+) -> None:
+    """Record a delivery attempt: ``sent``, ``failed``, or ``pending`` again."""
+    with conn:
+        conn.execute(
+            """
+            UPDATE outbox SET
+                status = ?,
+                attempts = ?,
+                next_attempt_at_utc = coalesce(?, next_attempt_at_utc),
+                sent_at_utc = CASE WHEN ? = 'sent' THEN ? ELSE sent_at_utc END,
+                last_error = ?
+            WHERE id = ?
+            """,
+            (status, attempts, next_attempt_at_utc, status, now_utc, error, message_id),
+        )
+
+
+def outbox_counts(conn: sqlite3.Connection) -> dict[str, int]:
+    """Return the number of outbox messages per status."""
+    return dict(conn.execute("SELECT status, count(*) FROM outbox GROUP BY status").fetchall())
+
+
+def record_run(
+    conn: sqlite3.Connection, summary: dict[str, Any], finished_at_utc: str
+) -> int:
+    """Store a ``RunMetrics.summary()`` in ``runs``/``feed_runs`` and return the run ID."""
+    cursor = conn.execute(
+        """
+        INSERT INTO runs (
+            started_at_utc, finished_at_utc, total_seconds, stages_json, counters_json
+        ) VALUES (?, ?, ?, ?, ?)
+        """,
+        (
+            summary["started_at_utc"],
+            finished_at_utc,
+            summary["total_seconds"],
+            json.dumps(summary["stages"]),
+            json.dumps(summary["counters"]),
+        ),
+    )
+    run_id = cursor.lastrowid
+    conn.executemany(
+        """
+        INSERT INTO feed_runs (
+            run_id, feed, url, seconds, bytes_downloaded, entries_parsed, new_items,
+            not_modified, error
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                run_id,
+                feed["feed"],
+                feed["url"],
+                feed["seconds"],
+                feed["bytes_downloaded"],
+                feed["entries_parsed"],
+                feed["new_items"],
+                int(feed["not_modified"]),
+                feed["error"],
+            )
+            for feed in summary["feeds"]
+        ],
+    )
+    conn.commit()
+    return run_id
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> int:
+    """Re-index every stored item and return how many rows ``items`` holds."""
+    conn.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO items_fts (items_fts) VALUES ('optimize')")
+    conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+
+def fill_excerpts(
+    conn: sqlite3.Connection, max_length: int = EXCERPT_LENGTH, schema: str = "main"
+) -> int:
+    """Derive the excerpt of items stored before excerpts existed; returns rows filled."""
+    cursor = conn.execute(
+        f"""
+        UPDATE {schema}.items SET excerpt = html_excerpt(summary_text(summary_raw), ?)
+        WHERE excerpt IS NULL AND summary_raw IS NOT NULL
+        """,
+        (max_length,),
+    )
+    conn.commit()
+    return cursor.rowcount
+
+
+def _match_expression(query: str) -> str:
+    """Quote each word of a free-text query; a trailing ``*`` keeps prefix matching."""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*") if prefix else word
+        terms.append('"{}"{}'.format(word.replace('"', '""'), "*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_items(
+    conn: sqlite3.Connection,
+    query: str,
+    since_utc: datetime | None = None,
+    category: str | None = None,
+    source: str | None = None,
+    limit: int = 20,
+) -> list[sqlite3.Row]:
+    """Return items matching every word of ``query``, best bm25 score first."""
+    expression = _match_expression(query)
+    if not expression:
+        return []
+    conn.row_factory = sqlite3.Row
+    filters = []
+    if since_utc is not None:
+        # The rowid bound lets FTS5 skip older postings before scoring them.
+        filters.append(
+            """
+            AND items_fts.rowid >= (
+                SELECT coalesce(min(rowid), -1) FROM items WHERE fetched_at_utc >= :since
+            )
+            AND items.fetched_at_utc >= :since
+            """
+        )
+    if category is not None:
+        filters.append("AND items.category = :category")
+    if source is not None:
+        filters.append("AND items.source = :source")
+    join = "JOIN items ON items.rowid = items_fts.rowid" if filters else ""
+    # Rank first, then build snippets for the surviving rows only.
+    cursor = conn.execute(
+        f"""
+        WITH hits AS (
+            SELECT items_fts.rowid AS rowid, bm25(items_fts, 4.0, 1.0) AS score
+            FROM items_fts {join}
+            WHERE items_fts MATCH :match {" ".join(filters)}
+            ORDER BY score
+            LIMIT :limit
+        )
+        SELECT
+            items.id, items.title, items.link, items.source, items.category,
+            items.published_raw, items.fetched_at_utc,
+            snippet(items_fts, -1, '[', ']', '…', 12) AS snippet,
+            hits.score
+        FROM hits
+        CROSS JOIN items_fts
+        CROSS JOIN items
+        WHERE items_fts.rowid = hits.rowid
+            AND items_fts MATCH :match
+            AND items.rowid = hits.rowid
+        ORDER BY hits.score
+        """,
+        {
+            "match": expression,
+            "since": since_utc.isoformat() if since_utc is not None else None,
+            "category": category,
+            "source": source,
+            "limit": limit,
+        },
+    )
     return cursor.fetchall()
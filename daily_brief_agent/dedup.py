@@ -0,0 +1,63 @@
+"""Near-duplicate detection across sources."""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from daily_brief_agent.db import item_schemas
+from daily_brief_agent.utils.simhash import BANDS, band_values, hamming_distance
+
+
+@dataclass(frozen=True)
+class NearDuplicateIndex:
+    """LSH lookup of stored title fingerprints."""
+
+    max_distance: int = 3
+    window: timedelta = timedelta(hours=72)
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.max_distance < BANDS:
+            raise ValueError(f"max_distance must be between 0 and {BANDS - 1}.")
+
+    def find_duplicate(
+        self, conn: sqlite3.Connection, fingerprint: int, fetched_at_utc: str
+    ) -> str | None:
+        """Return the cluster root ID of the closest stored near-duplicate, if any."""
+        since = (datetime.fromisoformat(fetched_at_utc) - self.window).isoformat()
+        bands = band_values(fingerprint)
+        clauses = " OR ".join("(b.band = ? AND b.value = ?)" for _ in bands)
+        params: list[object] = []
+        for band, value in enumerate(bands):
+            params.extend((band, value))
+        params.append(since)
+        schemas = item_schemas(conn)
+        # Each partition keeps its own bands, so candidates are gathered per schema.
+        cursor = conn.execute(
+            " UNION ".join(
+                f"""
+                SELECT DISTINCT i.id, i.duplicate_of, i.title_simhash
+                FROM {schema}.title_simhash_bands AS b
+                JOIN {schema}.items AS i ON i.id = b.item_id
+                WHERE ({clauses}) AND i.fetched_at_utc >= ?
+                """
+                for schema in schemas
+            ),
+            params * len(schemas),
+        )
+        best: tuple[int, str] | None = None
+        for item_id, duplicate_of, candidate in cursor:
+            distance = hamming_distance(fingerprint, candidate)
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, duplicate_of or item_id)
+        return best[1] if best else None
+
+    def add(
+        self, conn: sqlite3.Connection, item_id: str, fingerprint: int, schema: str = "main"
+    ) -> None:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {schema}.title_simhash_bands (band, value, item_id) "
+            "VALUES (?, ?, ?)",
+            [(band, value, item_id) for band, value in enumerate(band_values(fingerprint))],
+        )
@@ -0,0 +1,181 @@
+"""Durable delivery outbox drained by a rate-limited, retrying worker."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from daily_brief_agent.db import due_outbox, next_outbox_attempt, update_outbox
+from daily_brief_agent.delivery.telegram import SendResult
+from daily_brief_agent.scheduler import Clock
+from daily_brief_agent.utils.time import utc_now
+
+
+class Sender(Protocol):
+    def send(self, chat_id: str, text: str) -> SendResult: ...
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float, clock: Clock) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock.monotonic()
+        self._paused_until = self._updated
+
+    def _refill(self) -> None:
+        now = self._clock.monotonic()
+        # Nothing accrues while paused.
+        elapsed = max(0.0, now - max(self._updated, self._paused_until))
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` and start from empty afterwards."""
+        self._paused_until = max(self._paused_until, self._clock.monotonic() + seconds)
+        self._tokens = 0.0
+
+    def wait_time(self) -> float:
+        self._refill()
+        paused = max(0.0, self._paused_until - self._clock.monotonic())
+        return max(paused, (1 - self._tokens) / self.rate)
+
+    def acquire(self) -> None:
+        while (wait := self.wait_time()) > 0:
+            self._clock.sleep(wait)
+        self._tokens -= 1
+
+
+@dataclass
+class DeliveryStats:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class OutboxWorker:
+    """Send due outbox messages, oldest first, until the outbox is empty or time is up."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        sender: Sender,
+        clock: Clock,
+        logger: logging.Logger,
+        messages_per_second: float = 25.0,
+        chat_messages_per_second: float = 1.0,
+        max_attempts: int = 5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+    ) -> None:
+        self._conn = conn
+        self._sender = sender
+        self._clock = clock
+        self._logger = logger
+        self._bucket = TokenBucket(messages_per_second, max(1.0, messages_per_second), clock)
+        self._chat_rate = chat_messages_per_second
+        self._chat_buckets: dict[str, TokenBucket] = {}
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._started_utc = utc_now()
+        self._started = clock.monotonic()
+
+    def _now(self) -> datetime:
+        # Wall time derived from the clock, so tests can drive both with one fake.
+        return self._started_utc + timedelta(seconds=self._clock.monotonic() - self._started)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        if chat_id not in self._chat_buckets:
+            self._chat_buckets[chat_id] = TokenBucket(self._chat_rate, 1, self._clock)
+        return self._chat_buckets[chat_id]
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+
+    def _send_wait(self, chat_id: str) -> float:
+        return max(self._bucket.wait_time(), self._chat_bucket(chat_id).wait_time())
+
+    def _deliver(self, message: sqlite3.Row, stats: DeliveryStats) -> None:
+        chat_bucket = self._chat_bucket(message["chat_id"])
+        while (wait := self._send_wait(message["chat_id"])) > 0:
+            self._clock.sleep(wait)
+        self._bucket.acquire()
+        chat_bucket.acquire()
+
+        result = self._sender.send(message["chat_id"], message["text"])
+        now = self._now()
+        attempts = message["attempts"] + 1
+        if result.ok:
+            update_outbox(self._conn, message["id"], "sent", attempts, now.isoformat())
+            stats.sent += 1
+            return
+        if result.retry_after is not None:
+            self._bucket.pause(result.retry_after)
+            retry_at = now + timedelta(seconds=result.retry_after)
+            update_outbox(
+                self._conn,
+                message["id"],
+                "pending",
+                message["attempts"],
+                now.isoformat(),
+                retry_at.isoformat(),
+                result.error,
+            )
+            stats.retried += 1
+            self._logger.warning("Telegram rate limit hit; retrying in %.0fs.", result.retry_after)
+            return
+        if result.retryable and attempts < self.max_attempts:
+            retry_at = now + timedelta(seconds=self._backoff(attempts))
+            update_outbox(
+                self._conn,
+                message["id"],
+                "pending",
+                attempts,
+                now.isoformat(),
+                retry_at.isoformat(),
+                result.error,
+            )
+            stats.retried += 1
+            self._logger.warning(
+                "Telegram message %s failed (%s); attempt %s of %s.",
+                message["id"],
+                result.error,
+                attempts,
+                self.max_attempts,
+            )
+            return
+        update_outbox(
+            self._conn, message["id"], "failed", attempts, now.isoformat(), error=result.error
+        )
+        stats.failed += 1
+        self._logger.error("Telegram message %s failed: %s", message["id"], result.error)
+
+    def drain(self, timeout: float) -> DeliveryStats:
+        """Deliver until nothing is pending or waiting longer would pass ``timeout`` seconds."""
+        deadline = self._clock.monotonic() + timeout
+        stats = DeliveryStats()
+        while True:
+            now = self._now()
+            due = due_outbox(self._conn, now.isoformat())
+            if not due:
+                next_attempt = next_outbox_attempt(self._conn)
+                if next_attempt is None:
+                    return stats
+                wait = max(0.0, (datetime.fromisoformat(next_attempt) - now).total_seconds())
+                if self._clock.monotonic() + wait > deadline:
+                    return stats
+                self._clock.sleep(wait)
+                continue
+            for message in due:
+                if self._clock.monotonic() + self._send_wait(message["chat_id"]) > deadline:
+                    return stats
+                self._deliver(message, stats)
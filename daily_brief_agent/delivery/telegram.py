@@ -4,23 +4,140 @@ from __future__ import annotations
 
 import logging
 import os
+from dataclasses import dataclass
+from typing import Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
 
+# Bot API limit for the text of one message, in characters.
+MESSAGE_LIMIT = 4096
 
-def send_telegram_message(message: str, logger: logging.Logger, timeout: int = 10) -> bool:
-    token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+
+@dataclass(frozen=True)
+class SendResult:
+    ok: bool
+    status: int | None = None
+    retryable: bool = False
+    retry_after: float | None = None
+    error: str | None = None
+
+
+def telegram_credentials() -> tuple[str | None, str | None]:
+    """Return ``(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)`` from the environment."""
+    return os.getenv("TELEGRAM_BOT_TOKEN"), os.getenv("TELEGRAM_CHAT_ID")
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT) -> list[str]:
+    """Split ``text`` into chunks of at most ``limit`` characters, at line breaks if possible."""
+    chunks: list[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if len(current) + len(line) > limit:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current:
+        chunks.append(current)
+    return [chunk for chunk in (chunk.strip("\n") for chunk in chunks) if chunk]
+
+
+def pack_messages(parts: Iterable[str], limit: int = MESSAGE_LIMIT) -> list[str]:
+    """Batch short ``parts`` into as few messages as fit, splitting parts that are too long."""
+    messages: list[str] = []
+    current = ""
+    for part in parts:
+        for chunk in split_message(part, limit):
+            if current and len(current) + 2 + len(chunk) <= limit:
+                current = f"{current}\n\n{chunk}"
+                continue
+            if current:
+                messages.append(current)
+            current = chunk
+    if current:
+        messages.append(current)
+    return messages
+
+
+class TelegramClient:
+    """Bot API ``sendMessage`` over one pooled keep-alive session."""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = "https://api.telegram.org",
+        timeout: float = 10.0,
+        session: requests.Session | None = None,
+    ) -> None:
+        self._url = f"{api_url.rstrip('/')}/bot{token}/sendMessage"
+        self._timeout = timeout
+        if session is None:
+            session = requests.Session()
+            session.mount(api_url, HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._session = session
+
+    def send(self, chat_id: str, text: str) -> SendResult:
+        try:
+            response = self._session.post(
+                self._url,
+                json={"chat_id": chat_id, "text": text, "disable_web_page_preview": True},
+                timeout=self._timeout,
+            )
+        except requests.RequestException as exc:
+            # The exception text contains the URL, and with it the bot token.
+            return SendResult(ok=False, retryable=True, error=type(exc).__name__)
+
+        status = response.status_code
+        if status == 200:
+            return SendResult(ok=True, status=status)
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+        error = payload.get("description") or f"HTTP {status}"
+        if status == 429:
+            parameters = payload.get("parameters") or {}
+            retry_after = parameters.get("retry_after") or response.headers.get("Retry-After")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = 1.0
+            return SendResult(
+                ok=False, status=status, retryable=True, retry_after=delay, error=error
+            )
+        return SendResult(ok=False, status=status, retryable=status >= 500, error=error)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+def send_telegram_message(
+    message: str,
+    logger: logging.Logger,
+    timeout: int = 10,
+    api_url: str = "https://api.telegram.org",
+) -> bool:
+    """Send ``message`` to ``TELEGRAM_CHAT_ID`` at once, split to fit, without the outbox."""
+    token, chat_id = telegram_credentials()
     if not token or not chat_id:
         logger.warning("Telegram is enabled but TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID is missing.")
         return False
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-    payload = {"chat_id": chat_id, "text": message}
+    client = TelegramClient(token, api_url=api_url, timeout=timeout)
     try:
-        response = requests.post(url, json=payload, timeout=timeout)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        logger.error("Failed to send Telegram message: %s", exc)
-        return False
+        for text in pack_messages([message]):
+            result = client.send(chat_id, text)
+            if not result.ok:
+                logger.error("Failed to send Telegram message: %s", result.error)
+                return False
+    finally:
+        client.close()
     return True
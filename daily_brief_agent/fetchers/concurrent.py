@@ -0,0 +1,69 @@
+"""Concurrent feed fetching."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Sequence, TypeVar
+from urllib.parse import urlsplit
+
+from daily_brief_agent.config import FeedConfig
+
+T = TypeVar("T")
+
+
+class HostLimiter:
+    """Cap the number of in-flight requests per host."""
+
+    def __init__(self, per_host_limit: int) -> None:
+        self._per_host_limit = per_host_limit
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._per_host_limit)
+                self._semaphores[host] = semaphore
+        return semaphore
+
+
+def fetch_feeds_concurrently(
+    feeds: Sequence[FeedConfig],
+    fetch: Callable[[FeedConfig], T],
+    logger: logging.Logger,
+    concurrency: int = 8,
+    per_host_limit: int = 2,
+    run_timeout: float | None = None,
+) -> list[tuple[FeedConfig, T]]:
+    """Fetch feeds on a bounded thread pool and return results in feed order."""
+    limiter = HostLimiter(per_host_limit)
+
+    def _run(feed: FeedConfig) -> T:
+        with limiter.for_url(feed.url):
+            return fetch(feed)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, len(feeds))), thread_name_prefix="fetch"
+    )
+    try:
+        futures: list[Future[T]] = [executor.submit(_run, feed) for feed in feeds]
+        _, not_done = wait(futures, timeout=run_timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results: list[tuple[FeedConfig, T]] = []
+    for feed, future in zip(feeds, futures, strict=True):
+        if future in not_done:
+            future.cancel()
+            logger.error("Failed to fetch feed %s: run timeout exceeded", feed.name)
+            continue
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Failed to fetch feed %s: %s", feed.name, exc)
+            continue
+        results.append((feed, future.result()))
+    return results
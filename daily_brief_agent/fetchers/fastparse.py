@@ -0,0 +1,294 @@
+"""Streaming RSS 2.0 / Atom 1.0 entry parser."""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from io import BytesIO
+from typing import Any
+
+# feedparser internals, so output matches it; pyproject.toml pins the 6.0 series they come from.
+try:
+    from feedparser.html import _cp1252
+    from feedparser.mixin import _FeedParserMixin
+    from feedparser.sanitizer import _sanitize_html
+    from feedparser.urls import _urljoin, resolve_relative_uris
+except ImportError:  # pragma: no cover - feedparser internals moved
+    _FeedParserMixin = None
+
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+_XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+_XML_MEDIA_TYPES = {"", "application/xml", "application/rss+xml", "application/atom+xml"}
+_HTML_TYPES = {"text/html", "application/xhtml+xml"}
+_ENCODING_DECLARATION = re.compile(
+    rb"^(?:\xef\xbb\xbf)?\s*<\?xml[^>]*?encoding\s*=\s*[\"']([^\"']+)"
+)
+
+# Entry children turned into fields, keyed by feedparser's handler suffix.
+_TEXT_ELEMENTS = {
+    # key: (field, default content type, may contain markup)
+    "title": ("title", "text/plain", True),
+    "description": ("summary", "text/html", True),
+    "summary": ("summary", "text/plain", True),
+    "content": ("content", "text/plain", True),
+    "content_encoded": ("content", "text/html", True),
+    "pubdate": ("published", None, False),
+    "published": ("published", None, False),
+    "updated": ("updated", None, False),
+}
+
+# Entry children feedparser handles without touching the fields above.
+_IGNORED_ELEMENTS = {
+    "author",
+    "category",
+    "comments",
+    "contributor",
+    "email",
+    "enclosure",
+    "name",
+    "rights",
+    "uri",
+    "dc_contributor",
+    "dc_creator",
+    "dc_language",
+    "dc_publisher",
+    "dc_rights",
+    "dc_subject",
+    "media_category",
+    "media_content",
+    "media_credit",
+    "media_rating",
+    "media_thumbnail",
+}
+
+if _FeedParserMixin is not None:
+    _PREFIXES = {uri.lower(): prefix for uri, prefix in _FeedParserMixin.namespaces.items()}
+    _looks_like_html = _FeedParserMixin.looks_like_html
+
+
+class UnsupportedFeed(Exception):
+    """Raised when a document needs feedparser's full parser."""
+
+
+def _is_utf8_content_type(content_type: str) -> bool:
+    media_type, _, params = content_type.partition(";")
+    media_type = media_type.strip().lower()
+    charset = ""
+    for param in params.split(";"):
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            charset = value.strip().strip("\"'").lower()
+    if charset:
+        return charset == "utf-8" and (media_type in _XML_MEDIA_TYPES or media_type == "text/xml")
+    return media_type in _XML_MEDIA_TYPES
+
+
+def _check_document(content: bytes, content_type: str, content_location: str) -> None:
+    if _FeedParserMixin is None:
+        raise UnsupportedFeed("feedparser helpers unavailable")
+    if content_location and not content_type:
+        # feedparser flags HTTP responses without a Content-Type as bozo.
+        raise UnsupportedFeed("no content type")
+    if not _is_utf8_content_type(content_type):
+        raise UnsupportedFeed(f"content type {content_type!r}")
+    if content[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        raise UnsupportedFeed("UTF-16 document")
+    declared = _ENCODING_DECLARATION.match(content)
+    if declared and declared.group(1).lower() != b"utf-8":
+        raise UnsupportedFeed(f"encoding {declared.group(1).decode('ascii', 'replace')}")
+    if b"<!DOCTYPE" in content:
+        raise UnsupportedFeed("DOCTYPE")
+
+
+def _key(tag: str) -> str | None:
+    """Map an ElementTree tag to feedparser's handler suffix (``dc_creator``)."""
+    if tag[0] != "{":
+        return tag.lower()
+    uri, _, local = tag[1:].partition("}")
+    uri = uri.lower()
+    if "backend.userland.com/rss" in uri:
+        uri = "http://backend.userland.com/rss"
+    prefix = _PREFIXES.get(uri)
+    if prefix is None:
+        return None
+    return f"{prefix}_{local.lower()}" if prefix else local.lower()
+
+
+def _has_handler(key: str) -> bool:
+    return hasattr(_FeedParserMixin, "_start_" + key)
+
+
+def _finish(output: str) -> str:
+    # feedparser undoes UTF-8 read as latin-1 and maps cp1252 code points.
+    try:
+        output = output.encode("iso-8859-1").decode("utf-8")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        pass
+    return output.translate(_cp1252)
+
+
+def _markup(output: str, content_type: str, base: str) -> str:
+    # Text without tags or entities comes back from the sanitiser unchanged.
+    if "<" not in output and "&" not in output:
+        return output
+    output = resolve_relative_uris(output, base, "utf-8", content_type)
+    output = _sanitize_html(output, "utf-8", content_type)
+    if isinstance(output, bytes):
+        output = output.decode("utf-8", "ignore")
+    return output
+
+
+def _content_type(element: ET.Element, default: str) -> str:
+    content_type = element.get("type", default).lower()
+    if content_type in ("text", "plain"):
+        return "text/plain"
+    if content_type == "html":
+        return "text/html"
+    if content_type not in ("text/plain", "text/html"):
+        raise UnsupportedFeed(f"content type {content_type!r}")
+    return content_type
+
+
+def _text_field(element: ET.Element, key: str, atom: bool, base: str) -> tuple[str, str | None]:
+    _, default_type, may_contain_markup = _TEXT_ELEMENTS[key]
+    if len(element):
+        raise UnsupportedFeed(f"markup inside <{key}>")
+    if "mode" in element.attrib or "src" in element.attrib:
+        raise UnsupportedFeed(f"<{key}> attributes")
+    output = (element.text or "").strip()
+    content_type = None
+    if may_contain_markup:
+        content_type = _content_type(element, default_type)
+        if not atom and content_type == "text/plain" and _looks_like_html(output):
+            content_type = "text/html"
+        if content_type in _HTML_TYPES:
+            output = _markup(output, content_type, base)
+    return _finish(output), content_type
+
+
+def _link(element: ET.Element, entry: dict[str, Any], base: str) -> None:
+    attrs = {name.lower(): value for name, value in element.attrib.items()}
+    if "url" in attrs or "uri" in attrs:
+        raise UnsupportedFeed("link url attribute")
+    for name in ("rel", "type"):
+        if name in attrs:
+            attrs[name] = attrs[name].lower()
+    attrs.setdefault("rel", "alternate")
+    attrs.setdefault("type", "application/atom+xml" if attrs["rel"] == "self" else "text/html")
+    links = entry.setdefault("links", [])
+    if attrs.get("href"):
+        attrs["href"] = _urljoin(base, attrs["href"])
+        links.append(attrs)
+        if attrs["rel"] == "alternate" and attrs["type"] in _HTML_TYPES:
+            entry["link"] = attrs["href"]
+        return
+    if len(element):
+        raise UnsupportedFeed("markup inside <link>")
+    attrs.pop("href", None)
+    links.append(attrs)
+    output = (element.text or "").strip()
+    if output:
+        output = _urljoin(base, output)
+    output = _finish(output).replace("&amp;", "&")
+    output = re.sub("&([A-Za-z0-9_]+);", r"&\g<1>", output)
+    entry["link"] = output
+    if output:
+        attrs["href"] = output
+
+
+def _guid(element: ET.Element, entry: dict[str, Any], base: str) -> None:
+    if len(element):
+        raise UnsupportedFeed("markup inside <guid>")
+    attrs = {name.lower(): value for name, value in element.attrib.items()}
+    if attrs.get("ispermalink", "true") != "true":
+        return
+    output = (element.text or "").strip()
+    if output:
+        output = _urljoin(base, output)
+    entry.setdefault("link", _finish(output))
+
+
+def _check_descendants(element: ET.Element) -> None:
+    for child in element:
+        key = _key(child.tag)
+        if key is not None and key not in _IGNORED_ELEMENTS and _has_handler(key):
+            raise UnsupportedFeed(f"nested <{key}>")
+        _check_descendants(child)
+
+
+def _entry(element: ET.Element, atom: bool, base: str) -> dict[str, Any]:
+    entry: dict[str, Any] = {}
+    content: tuple[str, str | None] | None = None
+    seen: set[str] = set()
+    for child in element:
+        key = _key(child.tag)
+        if key is None:
+            _check_descendants(child)
+            continue
+        if key == "link":
+            _link(child, entry, base)
+            continue
+        if key in seen:
+            raise UnsupportedFeed(f"repeated <{key}>")
+        seen.add(key)
+        if key in ("guid", "id"):
+            _guid(child, entry, base)
+        elif key in _TEXT_ELEMENTS:
+            value = _text_field(child, key, atom, base)
+            field = _TEXT_ELEMENTS[key][0]
+            if field == "content":
+                if content is not None:
+                    raise UnsupportedFeed("repeated content")
+                content = value
+            elif field in entry:
+                raise UnsupportedFeed(f"repeated {field}")
+            else:
+                entry[field] = value[0]
+        elif key in _IGNORED_ELEMENTS or not _has_handler(key):
+            _check_descendants(child)
+        else:
+            raise UnsupportedFeed(f"<{key}>")
+    if content is not None and "summary" not in entry:
+        entry["summary"] = content[0]
+    return entry
+
+
+def parse_entries(
+    content: bytes, max_entries: int, content_type: str = "", content_location: str = ""
+) -> list[dict[str, Any]]:
+    """Return up to ``max_entries`` feedparser-compatible entry dicts."""
+    _check_document(content, content_type, content_location)
+    base = content_location
+    entries: list[dict[str, Any]] = []
+    if max_entries <= 0:
+        return entries
+
+    root: ET.Element | None = None
+    atom = False
+    entry_depth = 0
+    try:
+        for event, element in ET.iterparse(BytesIO(content), events=("start", "end")):
+            if event == "start":
+                if _XML_BASE in element.attrib or "base" in element.attrib:
+                    raise UnsupportedFeed("xml:base")
+                if root is None:
+                    root = element
+                    if element.tag == f"{{{_ATOM_NS}}}feed":
+                        atom = True
+                    elif _key(element.tag) != "rss":
+                        raise UnsupportedFeed(f"root <{element.tag}>")
+                elif _key(element.tag) in ("item", "entry"):
+                    entry_depth += 1
+                continue
+            if _key(element.tag) not in ("item", "entry"):
+                continue
+            entry_depth -= 1
+            if entry_depth:
+                raise UnsupportedFeed("nested entries")
+            entries.append(_entry(element, atom, base))
+            element.clear()
+            if len(entries) >= max_entries:
+                break
+    except ET.ParseError as exc:
+        raise UnsupportedFeed(f"XML error: {exc}") from exc
+    return entries
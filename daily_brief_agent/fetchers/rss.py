@@ -2,11 +2,58 @@
 
 from __future__ import annotations
 
-from typing import Any
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
 
 import feedparser
+import requests
 
-from daily_brief_agent.utils.hashing import sha256_hex
+from daily_brief_agent.fetchers.fastparse import UnsupportedFeed, parse_entries
+from daily_brief_agent.items import Item
+from daily_brief_agent.utils.hashing import sha256_bytes_hex, sha256_hex
+from daily_brief_agent.utils.simhash import simhash64
+from daily_brief_agent.utils.text import EXCERPT_LENGTH, html_excerpt
+from daily_brief_agent.utils.urls import canonicalize_url
+
+SeenLookup = Callable[[list[str]], set[str]]
+
+USER_AGENT = "daily-brief-agent/0.1 (+https://github.com/SSerkanYavuzcan/Daily-Brief-Agent)"
+
+
+@dataclass(frozen=True)
+class FeedState:
+    """Validators remembered from the last successful fetch of a feed."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    content_length: int = 0
+    parse_seconds: float = 0.0
+
+
+@dataclass
+class FetchResult:
+    items: list[Item]
+    state: FeedState
+    not_modified: bool = False
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0
+    parse_seconds_saved: float = 0.0
+    seen_count: int = 0
+    entries_parsed: int = 0
+
+
+@dataclass(frozen=True)
+class FeedDownload:
+    """A changed feed body, downloaded and waiting to be parsed."""
+
+    content: bytes
+    content_type: str
+    url: str
+    etag: str | None
+    last_modified: str | None
+    content_hash: str
 
 
 def _select_canonical_link(entry: dict[str, Any]) -> str | None:
@@ -17,26 +64,232 @@ def _select_canonical_link(entry: dict[str, Any]) -> str | None:
     return entry.get("link")
 
 
-def fetch_feed(
-    feed_name: str, url: str, category: str, max_entries: int
-) -> list[dict[str, str | None]]:
-    parsed = feedparser.parse(url)
+def _conditional_headers(state: FeedState | None) -> dict[str, str]:
+    headers = {"User-Agent": USER_AGENT}
+    if state is not None:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+def _linked_entries(entries: list[Any]) -> list[tuple[Any, str, str]]:
+    """Return ``(entry, link, item_id)``; the ID hashes the canonical link, ``link`` is kept."""
+    linked = []
+    for entry in entries:
+        link = (_select_canonical_link(entry) or "").strip()
+        if link:
+            linked.append((entry, link, sha256_hex(canonicalize_url(link))))
+    return linked
+
+
+def _new_entries(
+    candidates: list[tuple[Any, str, str]], seen_lookup: SeenLookup, seen_run_limit: int
+) -> tuple[list[tuple[Any, str, str]], int]:
+    # Items stored before IDs hashed the canonical link are keyed by the raw link's hash.
+    legacy_ids = [sha256_hex(link) for _, link, _ in candidates]
+    seen = seen_lookup([item_id for _, _, item_id in candidates] + legacy_ids)
+
+    fresh: list[tuple[Any, str, str]] = []
+    seen_count = 0
+    seen_run = 0
+    for candidate, legacy_id in zip(candidates, legacy_ids, strict=True):
+        if candidate[2] not in seen and legacy_id not in seen:
+            seen_run = 0
+            fresh.append(candidate)
+            continue
+        seen_count += 1
+        seen_run += 1
+        if seen_run_limit and seen_run >= seen_run_limit:
+            break
+    return fresh, seen_count
+
+
+def _feedparser_entries(
+    content: bytes, max_entries: int, content_type: str, content_location: str
+) -> list[Any]:
+    response_headers = {}
+    if content_type:
+        response_headers["content-type"] = content_type
+    if content_location:
+        response_headers["content-location"] = content_location
+    parsed = feedparser.parse(content, response_headers=response_headers)
     if parsed.bozo:
         raise ValueError(parsed.bozo_exception)
+    return parsed.entries[:max_entries]
 
-    items: list[dict[str, str | None]] = []
-    for entry in parsed.entries[:max_entries]:
-        link = _select_canonical_link(entry) or ""
-        if not link:
-            continue
-        item = {
-            "id": sha256_hex(link),
-            "published_raw": entry.get("published") or entry.get("updated"),
-            "category": category,
-            "source": feed_name,
-            "title": entry.get("title") or "(untitled)",
-            "link": link,
-            "summary_raw": entry.get("summary") or entry.get("description"),
-        }
-        items.append(item)
-    return items
+
+def parse_feed_bytes(
+    content: bytes,
+    feed_name: str,
+    category: str,
+    max_entries: int,
+    content_type: str = "",
+    content_location: str = "",
+    seen_lookup: SeenLookup | None = None,
+    seen_run_limit: int = 0,
+    fast: bool = True,
+    excerpt_length: int = EXCERPT_LENGTH,
+    summary_html: bool = True,
+) -> tuple[list[Item], int]:
+    """Parse feed bytes into items; returns them with the number of seen entries."""
+    entries = None
+    if fast:
+        try:
+            entries = parse_entries(content, max_entries, content_type, content_location)
+        except UnsupportedFeed:
+            entries = None
+    if entries is None:
+        entries = _feedparser_entries(content, max_entries, content_type, content_location)
+
+    candidates = _linked_entries(entries)
+    seen_count = 0
+    if seen_lookup is not None:
+        candidates, seen_count = _new_entries(candidates, seen_lookup, seen_run_limit)
+
+    items: list[Item] = []
+    for entry, link, item_id in candidates:
+        title = entry.get("title") or "(untitled)"
+        summary = entry.get("summary") or entry.get("description")
+        items.append(
+            Item(
+                id=item_id,
+                category=category,
+                source=feed_name,
+                title=title,
+                link=link,
+                published_raw=entry.get("published") or entry.get("updated"),
+                summary_raw=summary if summary_html else None,
+                excerpt=html_excerpt(summary, excerpt_length),
+                title_simhash=simhash64(title),
+            )
+        )
+    return items, seen_count
+
+
+def download_feed(
+    url: str, state: FeedState | None = None, timeout: float | None = None
+) -> FetchResult | FeedDownload:
+    """Download a feed with conditional GET; unchanged bodies come back without items."""
+    response = requests.get(url, headers=_conditional_headers(state), timeout=timeout)
+    if response.status_code == 304 and state is not None:
+        return FetchResult(
+            items=[],
+            state=FeedState(
+                etag=response.headers.get("ETag") or state.etag,
+                last_modified=response.headers.get("Last-Modified") or state.last_modified,
+                content_hash=state.content_hash,
+                content_length=state.content_length,
+                parse_seconds=state.parse_seconds,
+            ),
+            not_modified=True,
+            bytes_saved=state.content_length,
+            parse_seconds_saved=state.parse_seconds,
+        )
+    response.raise_for_status()
+
+    content = response.content
+    content_hash = sha256_bytes_hex(content)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if state is not None and state.content_hash == content_hash:
+        return FetchResult(
+            items=[],
+            state=FeedState(
+                etag=etag,
+                last_modified=last_modified,
+                content_hash=content_hash,
+                content_length=len(content),
+                parse_seconds=state.parse_seconds,
+            ),
+            not_modified=True,
+            bytes_downloaded=len(content),
+            parse_seconds_saved=state.parse_seconds,
+        )
+    return FeedDownload(
+        content=content,
+        content_type=response.headers.get("Content-Type", ""),
+        url=response.url,
+        etag=etag,
+        last_modified=last_modified,
+        content_hash=content_hash,
+    )
+
+
+def parse_download(
+    download: FeedDownload,
+    feed_name: str,
+    category: str,
+    max_entries: int,
+    seen_lookup: SeenLookup | None = None,
+    seen_run_limit: int = 0,
+    excerpt_length: int = EXCERPT_LENGTH,
+    summary_html: bool = True,
+) -> FetchResult:
+    """Parse a downloaded body into items and the feed's new validators."""
+    started = time.perf_counter()
+    items, seen_count = parse_feed_bytes(
+        download.content,
+        feed_name,
+        category,
+        max_entries,
+        content_type=download.content_type,
+        content_location=download.url,
+        seen_lookup=seen_lookup,
+        seen_run_limit=seen_run_limit,
+        excerpt_length=excerpt_length,
+        summary_html=summary_html,
+    )
+    parse_seconds = time.perf_counter() - started
+    return FetchResult(
+        items=items,
+        state=FeedState(
+            etag=download.etag,
+            last_modified=download.last_modified,
+            content_hash=download.content_hash,
+            content_length=len(download.content),
+            parse_seconds=parse_seconds,
+        ),
+        bytes_downloaded=len(download.content),
+        seen_count=seen_count,
+        entries_parsed=len(items) + seen_count,
+    )
+
+
+def fetch_feed_conditional(
+    feed_name: str,
+    url: str,
+    category: str,
+    max_entries: int,
+    state: FeedState | None = None,
+    timeout: float | None = None,
+    seen_lookup: SeenLookup | None = None,
+    seen_run_limit: int = 0,
+    excerpt_length: int = EXCERPT_LENGTH,
+    summary_html: bool = True,
+) -> FetchResult:
+    """Fetch a feed with conditional GET, skipping the parse when nothing changed."""
+    download = download_feed(url, state, timeout)
+    if isinstance(download, FetchResult):
+        return download
+    return parse_download(
+        download,
+        feed_name,
+        category,
+        max_entries,
+        seen_lookup=seen_lookup,
+        seen_run_limit=seen_run_limit,
+        excerpt_length=excerpt_length,
+        summary_html=summary_html,
+    )
+
+
+def fetch_feed(
+    feed_name: str,
+    url: str,
+    category: str,
+    max_entries: int,
+    timeout: float | None = None,
+) -> list[Item]:
+    return fetch_feed_conditional(feed_name, url, category, max_entries, timeout=timeout).items
@@ -0,0 +1,128 @@
+"""Per-feed health and a circuit breaker that stops fetching feeds which keep failing."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Iterable, Sequence
+
+from daily_brief_agent.config import FeedConfig
+from daily_brief_agent.metrics import FeedMetrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+@dataclass(frozen=True)
+class FeedHealth:
+    """Stored health of one feed URL; averages are exponentially weighted."""
+
+    url: str
+    feed: str
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    last_success_at_utc: str | None = None
+    last_failure_at_utc: str | None = None
+    last_error: str | None = None
+    avg_seconds: float | None = None
+    avg_bytes: float | None = None
+    open_until_utc: str | None = None
+
+
+class CircuitBreaker:
+    """Decide which feeds to fetch and fold fetch outcomes into their health."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown: float = 6 * 3600.0,
+        max_cooldown: float = 7 * 86400.0,
+        smoothing: float = 0.3,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.smoothing = smoothing
+
+    def state(self, health: FeedHealth | None, now_utc: datetime) -> str:
+        if health is None or health.open_until_utc is None:
+            return CLOSED
+        if datetime.fromisoformat(health.open_until_utc) > now_utc:
+            return OPEN
+        return HALF_OPEN
+
+    def split(
+        self, feeds: Sequence[FeedConfig], health: dict[str, FeedHealth], now_utc: datetime
+    ) -> tuple[list[FeedConfig], list[FeedConfig]]:
+        """Return the feeds to fetch (closed or half-open) and the open-circuited ones."""
+        allowed: list[FeedConfig] = []
+        skipped: list[FeedConfig] = []
+        for feed in feeds:
+            state = self.state(health.get(feed.url), now_utc)
+            (skipped if state == OPEN else allowed).append(feed)
+        return allowed, skipped
+
+    def cooldown_for(self, consecutive_failures: int) -> float:
+        doublings = consecutive_failures - self.failure_threshold
+        return min(self.max_cooldown, self.cooldown * 2**doublings)
+
+    def _average(self, previous: float | None, sample: float) -> float:
+        if previous is None:
+            return sample
+        return self.smoothing * sample + (1 - self.smoothing) * previous
+
+    def record(
+        self, health: FeedHealth | None, outcome: FeedMetrics, now_utc: datetime
+    ) -> FeedHealth:
+        """Return ``health`` updated with one fetch ``outcome``."""
+        health = health or FeedHealth(url=outcome.url, feed=outcome.feed)
+        now = now_utc.isoformat()
+        if outcome.error is None:
+            return replace(
+                health,
+                feed=outcome.feed,
+                consecutive_failures=0,
+                successes=health.successes + 1,
+                last_success_at_utc=now,
+                avg_seconds=self._average(health.avg_seconds, outcome.seconds),
+                # A 304 carries no payload; it says nothing about the feed's size.
+                avg_bytes=(
+                    health.avg_bytes
+                    if outcome.not_modified
+                    else self._average(health.avg_bytes, outcome.bytes_downloaded)
+                ),
+                open_until_utc=None,
+            )
+        failures = health.consecutive_failures + 1
+        open_until = None
+        if self.failure_threshold and failures >= self.failure_threshold:
+            open_until = (now_utc + timedelta(seconds=self.cooldown_for(failures))).isoformat()
+        return replace(
+            health,
+            feed=outcome.feed,
+            consecutive_failures=failures,
+            failures=health.failures + 1,
+            last_failure_at_utc=now,
+            last_error=outcome.error,
+            open_until_utc=open_until,
+        )
+
+    def update(
+        self,
+        health: dict[str, FeedHealth],
+        feeds: Iterable[FeedConfig],
+        outcomes: Iterable[FeedMetrics],
+        now_utc: datetime,
+    ) -> dict[str, FeedHealth]:
+        """Fold the outcomes of one run into ``health``; returns the changed entries."""
+        by_url = {outcome.url: outcome for outcome in outcomes}
+        changed: dict[str, FeedHealth] = {}
+        for feed in feeds:
+            outcome = by_url.get(feed.url) or FeedMetrics(
+                feed.name, feed.url, 0.0, error="run timeout exceeded"
+            )
+            outcome = replace(outcome, feed=feed.name)
+            changed[feed.url] = self.record(health.get(feed.url), outcome, now_utc)
+        return changed
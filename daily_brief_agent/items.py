@@ -0,0 +1,101 @@
+"""Compact item records, passed from parsing through storage to reports."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, fields
+from typing import Any
+
+from daily_brief_agent.utils.text import html_excerpt
+
+
+class _NotLoaded:
+    """Type of ``NOT_LOADED``; falsy, like the ``None`` a missing key reads as."""
+
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "NOT_LOADED"
+
+
+# Value of a field a query did not select; the item then has no such key.
+NOT_LOADED: Any = _NotLoaded()
+
+
+@dataclass(slots=True)
+class Item(Mapping[str, Any]):
+    """One feed entry, slotted, and readable as a ``Mapping`` like the dicts it replaced."""
+
+    id: str
+    category: str
+    source: str
+    title: str
+    link: str
+    published_raw: str | None = None
+    summary_raw: str | bytes | None = None
+    excerpt: str | None = None
+    title_simhash: int | None = None
+    fetched_at_utc: str | None = None
+    duplicate_of: str | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is NOT_LOADED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET and getattr(self, str(key)) is not NOT_LOADED
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in ITEM_FIELDS if getattr(self, name) is not NOT_LOADED)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key) if key in _FIELD_SET else NOT_LOADED
+        return default if value is NOT_LOADED else value
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, Any] | sqlite3.Row) -> Item:
+        """Build an item from a dict or ``sqlite3.Row`` holding some of the item keys."""
+        present = set(mapping.keys())
+        values = {name: mapping[name] for name in ITEM_FIELDS if name in present}
+        if "excerpt" not in present:
+            values["excerpt"] = html_excerpt(values.get("summary_raw"))
+        return cls(**values)
+
+
+ITEM_FIELDS = tuple(field.name for field in fields(Item))
+_FIELD_SET = frozenset(ITEM_FIELDS)
+# Columns of ``items`` in ``Item`` field order, for ``item_factory``.
+ITEM_COLUMNS = ", ".join(ITEM_FIELDS)
+
+
+def as_item(value: Item | Mapping[str, Any]) -> Item:
+    """Return ``value`` as an ``Item``; item dicts from older callers are converted."""
+    return value if isinstance(value, Item) else Item.from_mapping(value)
+
+
+def item_factory(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> Item:
+    """``row_factory`` for queries selecting ``ITEM_COLUMNS``, building items directly."""
+    return Item(*row)
+
+
+def item_factory_without_summary(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> Item:
+    """``item_factory`` for queries selecting ``NULL`` for ``summary_raw``: not loaded."""
+    item = Item(*row)
+    item.summary_raw = NOT_LOADED
+    return item
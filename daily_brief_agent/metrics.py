@@ -0,0 +1,160 @@
+"""Run instrumentation: per-stage timings and per-feed fetch metrics."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Iterator
+
+from daily_brief_agent.utils.time import utc_now
+
+
+@dataclass
+class FeedMetrics:
+    feed: str
+    url: str
+    seconds: float
+    bytes_downloaded: int = 0
+    entries_parsed: int = 0
+    new_items: int = 0
+    not_modified: bool = False
+    error: str | None = None
+
+
+@dataclass
+class RunMetrics:
+    """Collects stage timings and per-feed metrics for one run."""
+
+    started_at_utc: str = field(default_factory=lambda: utc_now().isoformat())
+    stages: dict[str, float] = field(default_factory=dict)
+    feeds: list[FeedMetrics] = field(default_factory=list)
+    counters: dict[str, int] = field(default_factory=dict)
+    report: dict[str, Any] | None = None
+    pipeline: dict[str, dict[str, Any]] | None = None
+    enabled: bool = True
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def record_feed(self, metrics: FeedMetrics) -> None:
+        with self._lock:
+            self.feeds.append(metrics)
+
+    def count(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_report(self, report: dict[str, Any]) -> None:
+        """Keep a ``ReportUpdate.summary()`` and count its changed sections."""
+        self.report = report
+        self.count("report_sections_changed", len(report["changed_sections"]))
+        self.count("report_rewritten", int(report["rewritten"]))
+
+    def record_pipeline(self, stages: dict[str, dict[str, Any]]) -> None:
+        """Keep the per-stage summaries of a staged ingest (see ``pipeline.StageStats``)."""
+        self.pipeline = stages
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "started_at_utc": self.started_at_utc,
+            "stages": dict(self.stages),
+            "total_seconds": sum(self.stages.values()),
+            "counters": dict(self.counters),
+            "feeds": [asdict(feed) for feed in self.feeds],
+            "report": self.report,
+            "pipeline": self.pipeline,
+        }
+
+
+class NullMetrics:
+    """Drop-in for ``RunMetrics`` that records nothing."""
+
+    enabled = False
+    _context: ContextManager[None] = nullcontext()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return self._context
+
+    def record_feed(self, metrics: FeedMetrics) -> None:
+        return
+
+    def count(self, name: str, value: int) -> None:
+        return
+
+    def record_report(self, report: dict[str, Any]) -> None:
+        return
+
+    def record_pipeline(self, stages: dict[str, dict[str, Any]]) -> None:
+        return
+
+
+NULL_METRICS = NullMetrics()
+
+
+def _atomic_write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content, encoding="utf-8", newline="\n")
+    os.replace(tmp_path, path)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(metrics: RunMetrics) -> str:
+    """Render metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP daily_brief_stage_seconds Wall time spent in each run stage.",
+        "# TYPE daily_brief_stage_seconds gauge",
+    ]
+    for stage, seconds in metrics.stages.items():
+        lines.append(f'daily_brief_stage_seconds{{stage="{_label(stage)}"}} {seconds:.6f}')
+    for name, value in metrics.counters.items():
+        lines.append(f"# TYPE daily_brief_{name} gauge")
+        lines.append(f"daily_brief_{name} {value}")
+
+    feed_series = (
+        ("feed_seconds", "Wall time spent fetching a feed.", lambda feed: f"{feed.seconds:.6f}"),
+        ("feed_bytes", "Bytes downloaded for a feed.", lambda feed: feed.bytes_downloaded),
+        ("feed_entries_parsed", "Entries parsed from a feed.", lambda feed: feed.entries_parsed),
+        ("feed_new_items", "New items found in a feed.", lambda feed: feed.new_items),
+        ("feed_errors", "Whether fetching a feed failed.", lambda feed: int(bool(feed.error))),
+    )
+    for name, help_text, value in feed_series:
+        lines.append(f"# HELP daily_brief_{name} {help_text}")
+        lines.append(f"# TYPE daily_brief_{name} gauge")
+        for feed in metrics.feeds:
+            labels = f'feed="{_label(feed.feed)}",url="{_label(feed.url)}"'
+            lines.append(f"daily_brief_{name}{{{labels}}} {value(feed)}")
+    pipeline_series = (
+        ("pipeline_processed", "Feeds or items a pipeline stage handled.", "processed"),
+        ("pipeline_busy_seconds", "Time a pipeline stage spent working.", "busy_seconds"),
+        ("pipeline_wait_seconds", "Time a pipeline stage was blocked on a queue.", "wait_seconds"),
+    )
+    if metrics.pipeline:
+        for name, help_text, key in pipeline_series:
+            lines.append(f"# HELP daily_brief_{name} {help_text}")
+            lines.append(f"# TYPE daily_brief_{name} gauge")
+            for stage, stats in metrics.pipeline.items():
+                lines.append(f'daily_brief_{name}{{stage="{_label(stage)}"}} {stats[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(metrics: RunMetrics, path: Path) -> None:
+    """Write metrics atomically for the node_exporter textfile collector."""
+    _atomic_write(path, to_prometheus(metrics))
+
+
+def write_json_summary(metrics: RunMetrics, path: Path) -> None:
+    _atomic_write(path, json.dumps(metrics.summary(), indent=2) + "\n")
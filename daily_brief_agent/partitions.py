@@ -0,0 +1,263 @@
+"""Monthly partitioned item storage."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from daily_brief_agent.db import (
+    PARTITION_SCHEMA_PREFIX,
+    existing_ids,
+    init_partition,
+    insert_items,
+    without_legacy_ids,
+)
+from daily_brief_agent.dedup import NearDuplicateIndex
+from daily_brief_agent.items import Item, as_item
+from daily_brief_agent.utils.time import parse_timestamp, to_epoch
+
+# SQLite's default SQLITE_MAX_ATTACHED.
+MAX_ATTACHED = 10
+
+_COPY_COLUMNS = (
+    "id, fetched_at_utc, published_raw, category, source, title, link, summary_raw, "
+    "title_simhash, duplicate_of, excerpt, fetched_at_epoch, published_at_epoch"
+)
+
+
+class TooManyPartitions(ValueError):
+    """A read needs more monthly partitions than SQLite can attach at once."""
+
+
+def partition_month(fetched_at_utc: str) -> str:
+    """Return the ``YYYY-MM`` partition of an ISO-8601 UTC timestamp."""
+    return fetched_at_utc[:7]
+
+
+def partition_path(partitions_dir: Path, month: str) -> Path:
+    return partitions_dir / f"items-{month}.sqlite"
+
+
+def _schema(month: str) -> str:
+    return PARTITION_SCHEMA_PREFIX + month.replace("-", "_")
+
+
+def _next_month(month: str) -> str:
+    year, number = int(month[:4]), int(month[5:7])
+    return f"{year + 1:04d}-01" if number == 12 else f"{year:04d}-{number + 1:02d}"
+
+
+def months_between(start_utc: datetime, end_utc: datetime) -> list[str]:
+    """Return every ``YYYY-MM`` from ``start_utc``'s month to ``end_utc``'s, inclusive."""
+    month = start_utc.astimezone(timezone.utc).strftime("%Y-%m")
+    last = end_utc.astimezone(timezone.utc).strftime("%Y-%m")
+    months = []
+    while month <= last:
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+def stored_months(partitions_dir: Path) -> list[str]:
+    """Return the months that have a partition file, oldest first."""
+    return sorted(
+        path.name[len("items-") : len("items-YYYY-MM")]
+        for path in partitions_dir.glob("items-????-??.sqlite")
+    )
+
+
+def open_partition(partitions_dir: Path, month: str) -> sqlite3.Connection:
+    """Open one month's partition as its own database, creating it if needed."""
+    partitions_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(partition_path(partitions_dir, month))
+    init_partition(conn)
+    return conn
+
+
+def attach_partitions(
+    conn: sqlite3.Connection, partitions_dir: Path, months: Iterable[str]
+) -> list[str]:
+    """Make the partitions for ``months`` that exist the only ones attached to ``conn``."""
+    wanted = sorted(
+        month for month in set(months) if partition_path(partitions_dir, month).exists()
+    )
+    if len(wanted) > MAX_ATTACHED:
+        raise TooManyPartitions(
+            f"{len(wanted)} monthly partitions needed but SQLite attaches at most "
+            f"{MAX_ATTACHED}; use a shorter date range."
+        )
+    conn.commit()
+    attached = {
+        row[1]
+        for row in conn.execute("PRAGMA database_list")
+        if row[1].startswith(PARTITION_SCHEMA_PREFIX)
+    }
+    schemas = {_schema(month): month for month in wanted}
+    for schema in sorted(attached - schemas.keys()):
+        conn.execute("DETACH DATABASE ?", (schema,))
+    for schema, month in schemas.items():
+        if schema not in attached:
+            conn.execute(
+                "ATTACH DATABASE ? AS ?", (str(partition_path(partitions_dir, month)), schema)
+            )
+    return wanted
+
+
+def detach_partitions(conn: sqlite3.Connection) -> None:
+    conn.commit()
+    for row in conn.execute("PRAGMA database_list").fetchall():
+        if row[1].startswith(PARTITION_SCHEMA_PREFIX):
+            conn.execute("DETACH DATABASE ?", (row[1],))
+
+
+def _record_published_range(
+    conn: sqlite3.Connection, month: str, epochs: Iterable[int | None] = ()
+) -> None:
+    """Widen ``month``'s publish-time range in ``partition_published`` to ``epochs``."""
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO main.partition_published
+            (month, min_published_epoch, max_published_epoch)
+        SELECT ?, MIN(published_at_epoch), MAX(published_at_epoch) FROM {_schema(month)}.items
+        """,
+        (month,),
+    )
+    known = [epoch for epoch in epochs if epoch is not None]
+    if known:
+        conn.execute(
+            """
+            UPDATE main.partition_published SET
+                min_published_epoch = MIN(COALESCE(min_published_epoch, ?), ?),
+                max_published_epoch = MAX(COALESCE(max_published_epoch, ?), ?)
+            WHERE month = ?
+            """,
+            (min(known), min(known), max(known), max(known), month),
+        )
+
+
+def _has_published(path: Path, start_epoch: int, end_epoch: int) -> bool:
+    conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    try:
+        row = conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM items WHERE published_at_epoch BETWEEN ? AND ?)",
+            (start_epoch, end_epoch),
+        ).fetchone()
+    finally:
+        conn.close()
+    return bool(row[0])
+
+
+def published_months(
+    conn: sqlite3.Connection, partitions_dir: Path, start_utc: datetime, end_utc: datetime
+) -> list[str]:
+    """Return the stored months holding items published in ``[start_utc, end_utc]``."""
+    recorded = {row[0] for row in conn.execute("SELECT month FROM main.partition_published")}
+    missing = [month for month in stored_months(partitions_dir) if month not in recorded]
+    for month in missing:
+        attach_partitions(conn, partitions_dir, [month])
+        with conn:
+            _record_published_range(conn, month)
+    if missing:
+        detach_partitions(conn)
+    start_epoch, end_epoch = to_epoch(start_utc), to_epoch(end_utc)
+    rows = conn.execute(
+        """
+        SELECT month FROM main.partition_published
+        WHERE min_published_epoch <= ? AND max_published_epoch >= ?
+        ORDER BY month
+        """,
+        (end_epoch, start_epoch),
+    )
+    return [
+        month
+        for (month,) in rows.fetchall()
+        if partition_path(partitions_dir, month).exists()
+        and _has_published(partition_path(partitions_dir, month), start_epoch, end_epoch)
+    ]
+
+
+def insert_partitioned_items(
+    conn: sqlite3.Connection,
+    partitions_dir: Path,
+    items: Iterable[Item | dict[str, Any]],
+    near_duplicates: NearDuplicateIndex | None = None,
+) -> int:
+    """Insert items into their month's partition, skipping IDs stored in any month."""
+    pending = without_legacy_ids(conn, [as_item(item) for item in items])
+    known = existing_ids(conn, [item.id for item in pending])
+    by_month: dict[str, list[Item]] = defaultdict(list)
+    for item in pending:
+        if item.id not in known:
+            known.add(item.id)
+            by_month[partition_month(item.fetched_at_utc)].append(item)
+
+    inserted = 0
+    for month, group in sorted(by_month.items()):
+        open_partition(partitions_dir, month).close()
+        months = [month]
+        if near_duplicates is not None:
+            earliest = datetime.fromisoformat(min(item.fetched_at_utc for item in group))
+            months = months_between(earliest - near_duplicates.window, earliest)
+        attach_partitions(conn, partitions_dir, months)
+        conn.executemany(
+            "INSERT OR IGNORE INTO main.item_ids (id, month) VALUES (?, ?)",
+            [(item.id, month) for item in group],
+        )
+        _record_published_range(
+            conn, month, (parse_timestamp(item.published_raw) for item in group)
+        )
+        inserted += insert_items(conn, group, near_duplicates, schema=_schema(month))
+    return inserted
+
+
+def migrate_to_partitions(conn: sqlite3.Connection, partitions_dir: Path) -> dict[str, int]:
+    """Move rows of ``main.items`` into monthly partitions; returns rows moved per month."""
+    months = [
+        row[0]
+        for row in conn.execute(
+            "SELECT DISTINCT substr(fetched_at_utc, 1, 7) FROM main.items ORDER BY 1"
+        )
+    ]
+    moved: dict[str, int] = {}
+    for month in months:
+        open_partition(partitions_dir, month).close()
+        attach_partitions(conn, partitions_dir, [month])
+        schema = _schema(month)
+        bounds = (month, _next_month(month))
+        in_month = "fetched_at_utc >= ? AND fetched_at_utc < ?"
+        with conn:
+            moved[month] = conn.execute(
+                f"""
+                INSERT OR IGNORE INTO {schema}.items ({_COPY_COLUMNS})
+                SELECT {_COPY_COLUMNS} FROM main.items WHERE {in_month}
+                ORDER BY fetched_at_utc
+                """,
+                bounds,
+            ).rowcount
+            month_ids = f"SELECT id FROM main.items WHERE {in_month}"
+            conn.execute(
+                f"""
+                INSERT OR IGNORE INTO {schema}.title_simhash_bands (band, value, item_id)
+                SELECT band, value, item_id FROM main.title_simhash_bands
+                WHERE item_id IN ({month_ids})
+                """,
+                bounds,
+            )
+            conn.execute(
+                f"""
+                INSERT OR IGNORE INTO main.item_ids (id, month)
+                SELECT id, ? FROM main.items WHERE {in_month}
+                """,
+                (month, *bounds),
+            )
+            conn.execute("DELETE FROM main.partition_published WHERE month = ?", (month,))
+            _record_published_range(conn, month)
+            conn.execute(
+                f"DELETE FROM main.title_simhash_bands WHERE item_id IN ({month_ids})", bounds
+            )
+            conn.execute(f"DELETE FROM main.items WHERE {in_month}", bounds)
+    detach_partitions(conn)
+    return moved
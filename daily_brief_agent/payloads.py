@@ -0,0 +1,218 @@
+"""Content-addressed archive of raw feed responses, so past fetches can be parsed again."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import sqlite3
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from daily_brief_agent.config import FeedConfig
+from daily_brief_agent.fetchers.rss import FeedDownload
+from daily_brief_agent.utils.time import to_epoch
+
+INDEX_NAME = "index.sqlite"
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS payloads (
+        content_hash TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        last_used_epoch INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS payloads_last_used ON payloads (last_used_epoch);
+    CREATE TABLE IF NOT EXISTS fetches (
+        feed_url TEXT NOT NULL,
+        feed_name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        fetched_at_utc TEXT NOT NULL,
+        fetched_at_epoch INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        content_type TEXT NOT NULL,
+        url TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS fetches_feed_time ON fetches (feed_url, fetched_at_epoch);
+    CREATE INDEX IF NOT EXISTS fetches_time ON fetches (fetched_at_epoch);
+    CREATE INDEX IF NOT EXISTS fetches_hash ON fetches (content_hash);
+"""
+
+
+@dataclass(frozen=True)
+class ArchivedFetch:
+    """One timeline entry: a feed's body as fetched at ``fetched_at_utc``."""
+
+    feed_url: str
+    feed_name: str
+    category: str
+    fetched_at_utc: str
+    content_hash: str
+    content_type: str
+    # The final URL after redirects, which relative links resolve against.
+    url: str
+
+
+def object_path(root: Path, content_hash: str) -> Path:
+    return root / "objects" / content_hash[:2] / f"{content_hash}.gz"
+
+
+def read_payload(root: Path, content_hash: str) -> bytes:
+    """Return an archived body; only needs the archive directory, for parse processes."""
+    return gzip.decompress(object_path(root, content_hash).read_bytes())
+
+
+class PayloadArchive:
+    """Store fetched bodies and their timeline; safe to share between fetch threads."""
+
+    def __init__(self, root: Path, max_bytes: int, compresslevel: int = 6) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.compresslevel = compresslevel
+        # Bodies written and bodies found already stored since opening.
+        self.stored = 0
+        self.reused = 0
+        self.evicted = 0
+        root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(root / INDEX_NAME, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM payloads")
+            return row.fetchone()[0]
+
+    def _write_object(self, content_hash: str, content: bytes) -> int:
+        """Write a compressed body under its final name only once complete; returns its size."""
+        path = object_path(self.root, content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(content, compresslevel=self.compresslevel, mtime=0)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return len(data)
+
+    def _touch(self, content_hash: str, used_epoch: int) -> bool:
+        cursor = self._conn.execute(
+            "UPDATE payloads SET last_used_epoch = MAX(last_used_epoch, ?) "
+            "WHERE content_hash = ?",
+            (used_epoch, content_hash),
+        )
+        return cursor.rowcount > 0
+
+    def add(self, feed: FeedConfig, download: FeedDownload, fetched_at_utc: str) -> bool:
+        """Record that ``feed`` served ``download``; returns whether the body was new."""
+        content_hash = download.content_hash
+        used_epoch = to_epoch(datetime.fromisoformat(fetched_at_utc))
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT 1 FROM payloads WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        stored_size = None if known else self._write_object(content_hash, download.content)
+        with self._lock, self._conn:
+            new = not self._touch(content_hash, used_epoch)
+            if new:
+                # Evicted since the check above: write it back.
+                if stored_size is None:
+                    stored_size = self._write_object(content_hash, download.content)
+                self._conn.execute(
+                    "INSERT INTO payloads (content_hash, size, stored_size, last_used_epoch) "
+                    "VALUES (?, ?, ?, ?)",
+                    (content_hash, len(download.content), stored_size, used_epoch),
+                )
+            self._conn.execute(
+                """
+                INSERT INTO fetches (
+                    feed_url, feed_name, category, fetched_at_utc, fetched_at_epoch,
+                    content_hash, content_type, url
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    feed.url,
+                    feed.name,
+                    feed.category,
+                    fetched_at_utc,
+                    used_epoch,
+                    content_hash,
+                    download.content_type,
+                    download.url,
+                ),
+            )
+            self._evict()
+        if new:
+            self.stored += 1
+        else:
+            self.reused += 1
+        return new
+
+    def _evict(self) -> None:
+        """Delete least recently used bodies until the archive fits ``max_bytes``."""
+        total = self._conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM payloads")
+        excess = total.fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for content_hash, stored_size in self._conn.execute(
+            "SELECT content_hash, stored_size FROM payloads ORDER BY last_used_epoch, rowid"
+        ):
+            victims.append(content_hash)
+            excess -= stored_size
+            if excess <= 0:
+                break
+        for content_hash in victims:
+            self._conn.execute("DELETE FROM fetches WHERE content_hash = ?", (content_hash,))
+            self._conn.execute("DELETE FROM payloads WHERE content_hash = ?", (content_hash,))
+            object_path(self.root, content_hash).unlink(missing_ok=True)
+        self.evicted += len(victims)
+
+    def touch(self, content_hashes: Iterable[str], used_at: datetime) -> None:
+        """Mark bodies as used at ``used_at``, such as after replaying them."""
+        used_epoch = to_epoch(used_at)
+        with self._lock, self._conn:
+            for content_hash in set(content_hashes):
+                self._touch(content_hash, used_epoch)
+
+    def fetches(
+        self,
+        since_utc: datetime | None = None,
+        until_utc: datetime | None = None,
+        feed_urls: Iterable[str] | None = None,
+    ) -> list[ArchivedFetch]:
+        """Return the fetches in ``[since_utc, until_utc)`` of ``feed_urls``, in fetch order."""
+        clauses = []
+        params: list[object] = []
+        if since_utc is not None:
+            clauses.append("fetched_at_epoch >= ?")
+            params.append(to_epoch(since_utc))
+        if until_utc is not None:
+            clauses.append("fetched_at_epoch < ?")
+            params.append(to_epoch(until_utc))
+        if feed_urls is not None:
+            urls = list(feed_urls)
+            clauses.append(f"feed_url IN ({', '.join('?' for _ in urls)})")
+            params.extend(urls)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT feed_url, feed_name, category, fetched_at_utc, content_hash,
+                       content_type, url
+                FROM fetches {where}
+                ORDER BY fetched_at_epoch, rowid
+                """,
+                params,
+            ).fetchall()
+        return [ArchivedFetch(*row) for row in rows]
@@ -0,0 +1,428 @@
+"""Staged ingest: download, parse and store feeds with the stages overlapping."""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from daily_brief_agent.config import FeedConfig, FetchConfig
+from daily_brief_agent.db import existing_ids
+from daily_brief_agent.fetchers.concurrent import HostLimiter
+from daily_brief_agent.fetchers.rss import (
+    FeedDownload,
+    FeedState,
+    FetchResult,
+    download_feed,
+    parse_download,
+)
+from daily_brief_agent.items import Item
+from daily_brief_agent.metrics import NULL_METRICS, FeedMetrics, NullMetrics, RunMetrics
+from daily_brief_agent.payloads import ArchivedFetch, PayloadArchive, read_payload
+from daily_brief_agent.utils.text import EXCERPT_LENGTH
+from daily_brief_agent.utils.time import utc_now
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class ParseOptions:
+    """Per-run parse settings, shipped to the parse processes with each feed."""
+
+    max_entries: int
+    seen_run_limit: int = 0
+    excerpt_length: int = EXCERPT_LENGTH
+    summary_html: bool = True
+    seen_dbs: tuple[str, ...] = ()
+
+
+@dataclass
+class StageStats:
+    """Work done by one stage, summed over its threads."""
+
+    workers: int
+    unit: str
+    processed: int = 0
+    busy_seconds: float = 0.0
+    wait_seconds: float = 0.0
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "unit": self.unit,
+            "per_second": self.processed / seconds if seconds else 0.0,
+            "busy_seconds": self.busy_seconds,
+            "wait_seconds": self.wait_seconds,
+        }
+
+
+@dataclass
+class IngestResult:
+    inserted: int = 0
+    items: int = 0
+    states: dict[str, FeedState] = field(default_factory=dict)
+    unchanged: int = 0
+    bytes_saved: int = 0
+    parse_seconds_saved: float = 0.0
+    seconds: float = 0.0
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    # One entry per feed that finished, failed ones included.
+    feeds: list[FeedMetrics] = field(default_factory=list)
+
+
+@dataclass
+class _Outcome:
+    feed: FeedConfig
+    seconds: float
+    result: FetchResult | None = None
+    error: BaseException | None = None
+
+
+def _parse(
+    download: FeedDownload, feed_name: str, category: str, options: ParseOptions
+) -> FetchResult:
+    """Parse one feed; runs in a parse process, so it only takes picklable arguments."""
+    conns = [
+        sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+        for path in options.seen_dbs
+    ]
+
+    def _seen(ids: list[str]) -> set[str]:
+        seen = set(ids)
+        for conn in conns:
+            if seen:
+                seen &= existing_ids(conn, ids)
+        return seen
+
+    try:
+        return parse_download(
+            download,
+            feed_name,
+            category,
+            options.max_entries,
+            seen_lookup=_seen if conns else None,
+            seen_run_limit=options.seen_run_limit,
+            excerpt_length=options.excerpt_length,
+            summary_html=options.summary_html,
+        )
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def _parse_workers(fetch: FetchConfig) -> int:
+    return (os.cpu_count() or 1) if fetch.parse_workers is None else fetch.parse_workers
+
+
+class _Stage:
+    """Shared counters of one stage; its threads add to them under a lock."""
+
+    def __init__(self, stats: StageStats) -> None:
+        self.stats = stats
+        self._lock = threading.Lock()
+
+    def get(self, source: queue.Queue[Any]) -> Any:
+        started = time.perf_counter()
+        value = source.get()
+        self._add(wait=time.perf_counter() - started)
+        return value
+
+    def put(
+        self, target: queue.Queue[Any], value: Any, abandon: threading.Event | None = None
+    ) -> None:
+        """Put ``value`` once there is room, or drop it once ``abandon`` is set."""
+        started = time.perf_counter()
+        try:
+            while abandon is None or not abandon.is_set():
+                try:
+                    target.put(value, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        finally:
+            self._add(wait=time.perf_counter() - started)
+
+    def _add(self, busy: float = 0.0, wait: float = 0.0, processed: int = 0) -> None:
+        with self._lock:
+            self.stats.busy_seconds += busy
+            self.stats.wait_seconds += wait
+            self.stats.processed += processed
+
+    def done(self, busy: float, processed: int = 1) -> None:
+        self._add(busy=busy, processed=processed)
+
+
+def ingest_feeds(
+    feeds: Sequence[FeedConfig],
+    feed_states: dict[str, FeedState],
+    store: Callable[[list[Item]], int],
+    fetch: FetchConfig,
+    options: ParseOptions,
+    fetched_at: str,
+    logger: logging.Logger,
+    metrics: RunMetrics | NullMetrics = NULL_METRICS,
+    payloads: PayloadArchive | None = None,
+) -> IngestResult:
+    """Download, parse and store ``feeds`` and return what happened at each stage."""
+    started = time.perf_counter()
+    parse_workers = _parse_workers(fetch)
+    download_workers = max(1, min(fetch.concurrency, len(feeds)))
+    parse_threads = max(1, min(parse_workers, len(feeds)))
+    downloading = _Stage(StageStats(download_workers, "feeds"))
+    parsing = _Stage(StageStats(parse_threads, "feeds"))
+    writing = _Stage(StageStats(1, "items"))
+    parse_queue: queue.Queue[Any] = queue.Queue(maxsize=fetch.queue_size)
+    write_queue: queue.Queue[Any] = queue.Queue(maxsize=fetch.queue_size)
+    # Set at the run timeout; downloads finishing later are dropped.
+    abandon = threading.Event()
+    result = IngestResult()
+    write_errors: list[BaseException] = []
+
+    executor = None
+    if parse_workers and feeds:
+        executor = ProcessPoolExecutor(max_workers=parse_threads)
+        # With the fork start method every worker starts on the first submit; doing
+        # that before any other thread exists keeps their held locks out of the children.
+        executor.submit(int).result()
+
+    def _download(feed: FeedConfig) -> None:
+        feed_started = time.perf_counter()
+        try:
+            with limiter.for_url(feed.url):
+                download = download_feed(feed.url, feed_states.get(feed.url), fetch.feed_timeout)
+        except Exception as exc:
+            download = exc
+        if isinstance(download, FeedDownload) and payloads is not None:
+            try:
+                payloads.add(feed, download, fetched_at)
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("Could not archive the body of feed %s: %s", feed.name, exc)
+        seconds = time.perf_counter() - feed_started
+        downloading.done(seconds)
+        if isinstance(download, FeedDownload):
+            downloading.put(parse_queue, (feed, download, seconds), abandon)
+        elif isinstance(download, FetchResult):
+            downloading.put(write_queue, _Outcome(feed, seconds, result=download), abandon)
+        else:
+            downloading.put(write_queue, _Outcome(feed, seconds, error=download), abandon)
+
+    def _parse_loop() -> None:
+        while (task := parsing.get(parse_queue)) is not _DONE:
+            feed, download, seconds = task
+            parse_started = time.perf_counter()
+            outcome = _Outcome(feed, seconds)
+            try:
+                if executor is None:
+                    outcome.result = _parse(download, feed.name, feed.category, options)
+                else:
+                    outcome.result = executor.submit(
+                        _parse, download, feed.name, feed.category, options
+                    ).result()
+            except Exception as exc:
+                outcome.error = exc
+            parse_seconds = time.perf_counter() - parse_started
+            outcome.seconds += parse_seconds
+            parsing.done(parse_seconds)
+            parsing.put(write_queue, outcome)
+
+    def _write_loop() -> None:
+        batch: list[Item] = []
+        while (outcome := writing.get(write_queue)) is not _DONE:
+            if write_errors:
+                continue
+            write_started = time.perf_counter()
+            try:
+                batch.extend(_record(outcome))
+                if len(batch) >= fetch.write_batch_size:
+                    result.inserted += store(batch)
+                    writing.done(time.perf_counter() - write_started, len(batch))
+                    batch = []
+                else:
+                    writing.done(time.perf_counter() - write_started, 0)
+            except Exception as exc:
+                # Keep draining so the other stages never block on a full queue.
+                write_errors.append(exc)
+        if batch and not write_errors:
+            write_started = time.perf_counter()
+            try:
+                result.inserted += store(batch)
+            except Exception as exc:
+                write_errors.append(exc)
+            writing.done(time.perf_counter() - write_started, len(batch))
+
+    def _feed_done(feed_metrics: FeedMetrics) -> None:
+        result.feeds.append(feed_metrics)
+        if metrics.enabled:
+            metrics.record_feed(feed_metrics)
+
+    def _record(outcome: _Outcome) -> list[Item]:
+        feed = outcome.feed
+        fetched = outcome.result
+        if fetched is None:
+            logger.error("Failed to fetch feed %s: %s", feed.name, outcome.error)
+            _feed_done(FeedMetrics(feed.name, feed.url, outcome.seconds, error=str(outcome.error)))
+            return []
+        result.states[feed.url] = fetched.state
+        if fetched.not_modified:
+            result.unchanged += 1
+            result.bytes_saved += fetched.bytes_saved
+            result.parse_seconds_saved += fetched.parse_seconds_saved
+            logger.debug("Feed %s unchanged; skipped parsing.", feed.name)
+        elif options.seen_dbs:
+            logger.info(
+                "Feed %s: %s new, %s already seen.",
+                feed.name,
+                len(fetched.items),
+                fetched.seen_count,
+            )
+        _feed_done(
+            FeedMetrics(
+                feed.name,
+                feed.url,
+                outcome.seconds,
+                bytes_downloaded=fetched.bytes_downloaded,
+                entries_parsed=fetched.entries_parsed,
+                new_items=len(fetched.items),
+                not_modified=fetched.not_modified,
+            )
+        )
+        for item in fetched.items:
+            item.fetched_at_utc = fetched_at
+        result.items += len(fetched.items)
+        return fetched.items
+
+    limiter = HostLimiter(fetch.per_host_limit)
+    threads = [
+        threading.Thread(target=_parse_loop, name=f"parse-{index}")
+        for index in range(parse_threads)
+    ]
+    threads.append(threading.Thread(target=_write_loop, name="write"))
+    for thread in threads:
+        thread.start()
+    downloads = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="fetch")
+    try:
+        futures = [downloads.submit(_download, feed) for feed in feeds]
+        _, not_done = wait(futures, timeout=fetch.run_timeout)
+        abandon.set()
+        for feed, future in zip(feeds, futures, strict=True):
+            if future in not_done:
+                future.cancel()
+                logger.error("Failed to fetch feed %s: run timeout exceeded", feed.name)
+    finally:
+        abandon.set()
+        downloads.shutdown(wait=False, cancel_futures=True)
+        for _ in range(parse_threads):
+            parse_queue.put(_DONE)
+        for thread in threads[:-1]:
+            thread.join()
+        write_queue.put(_DONE)
+        threads[-1].join()
+        if executor is not None:
+            executor.shutdown()
+
+    if write_errors:
+        raise write_errors[0]
+    result.seconds = time.perf_counter() - started
+    result.stages = {
+        "download": downloading.stats,
+        "parse": parsing.stats,
+        "write": writing.stats,
+    }
+    return result
+
+
+@dataclass
+class ReplayResult:
+    fetches: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    items: int = 0
+    inserted: int = 0
+    seconds: float = 0.0
+
+
+def _parse_archived(
+    root: Path, options: ParseOptions, fetch: ArchivedFetch
+) -> list[Item] | str:
+    """Parse one archived body in a parse process; returns its items or the error."""
+    try:
+        download = FeedDownload(
+            content=read_payload(root, fetch.content_hash),
+            content_type=fetch.content_type,
+            url=fetch.url,
+            etag=None,
+            last_modified=None,
+            content_hash=fetch.content_hash,
+        )
+        items = _parse(download, fetch.feed_name, fetch.category, options).items
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+    for item in items:
+        item.fetched_at_utc = fetch.fetched_at_utc
+    return items
+
+
+def replay_payloads(
+    archive: PayloadArchive,
+    fetches: Sequence[ArchivedFetch],
+    store: Callable[[list[Item]], int],
+    fetch: FetchConfig,
+    options: ParseOptions,
+    logger: logging.Logger,
+) -> ReplayResult:
+    """Parse archived ``fetches`` again and store their items, without the network."""
+    started = time.perf_counter()
+    result = ReplayResult()
+    workers = _parse_workers(fetch)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+    parse = partial(_parse_archived, archive.root, options)
+    batch: list[Item] = []
+    previous: dict[str, str] = {}
+    changed = []
+    for archived in fetches:
+        if previous.get(archived.feed_url) == archived.content_hash:
+            result.unchanged += 1
+        else:
+            changed.append(archived)
+        previous[archived.feed_url] = archived.content_hash
+    try:
+        remaining = iter(changed)
+        while window := list(islice(remaining, max(1, workers) * fetch.queue_size)):
+            if executor is None:
+                parsed = list(map(parse, window))
+            else:
+                parsed = list(executor.map(parse, window))
+            for archived, items in zip(window, parsed, strict=True):
+                result.fetches += 1
+                if isinstance(items, str):
+                    result.failed += 1
+                    logger.error(
+                        "Could not replay feed %s fetched at %s: %s",
+                        archived.feed_name,
+                        archived.fetched_at_utc,
+                        items,
+                    )
+                    continue
+                result.items += len(items)
+                batch.extend(items)
+                if len(batch) >= fetch.write_batch_size:
+                    result.inserted += store(batch)
+                    batch = []
+        if batch:
+            result.inserted += store(batch)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    archive.touch((archived.content_hash for archived in fetches), utc_now())
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,87 @@
+"""Incremental report regeneration."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable
+
+from daily_brief_agent.reporting.markdown import (
+    iter_sections,
+    render_header,
+    render_section,
+    section_digest,
+)
+from daily_brief_agent.utils.hashing import sha256_bytes_hex
+
+
+@dataclass(frozen=True)
+class ReportUpdate:
+    path: Path
+    digest: str
+    rewritten: bool
+    changed_sections: list[str] = field(default_factory=list)
+    removed_sections: list[str] = field(default_factory=list)
+    sections: dict[str, tuple[str, str]] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "digest": self.digest,
+            "rewritten": self.rewritten,
+            "changed_sections": self.changed_sections,
+            "removed_sections": self.removed_sections,
+        }
+
+
+def _file_digest(path: Path) -> str | None:
+    try:
+        return sha256_bytes_hex(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def _atomic_write_bytes(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+def update_report(
+    items: Iterable[Any],
+    report_date: date,
+    per_category_limit: int,
+    report_path: Path,
+    cached_sections: dict[str, tuple[str, str]],
+) -> ReportUpdate:
+    """Render ``items`` into ``report_path``, reusing unchanged ``cached_sections``."""
+    parts = [render_header(report_date)]
+    sections: dict[str, tuple[str, str]] = {}
+    changed: list[str] = []
+    for category, section in iter_sections(items, per_category_limit):
+        digest = section_digest(category, section)
+        cached = cached_sections.get(category)
+        if cached is not None and cached[0] == digest:
+            body = cached[1]
+        else:
+            body = render_section(category, section)
+            changed.append(category)
+        sections[category] = (digest, body)
+        parts.append(body)
+
+    content = "".join(parts).encode("utf-8")
+    digest = sha256_bytes_hex(content)
+    rewritten = _file_digest(report_path) != digest
+    if rewritten:
+        _atomic_write_bytes(report_path, content)
+    return ReportUpdate(
+        path=report_path,
+        digest=digest,
+        rewritten=rewritten,
+        changed_sections=changed,
+        removed_sections=sorted(set(cached_sections) - set(sections)),
+        sections=sections,
+    )
@@ -2,40 +2,83 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+import io
+import json
 from datetime import date
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, TextIO
+
+from daily_brief_agent.utils.hashing import sha256_hex
+
+
+def report_sort_key(item: Any) -> tuple[str, str, str]:
+    """Return the (category, source, title) key reports are rendered in."""
+    return (item["category"], item["source"], item["title"] or "")
+
+
+def _optional(item: Any, key: str) -> Any:
+    try:
+        return item[key]
+    except (KeyError, IndexError):
+        return None
+
+
+def _source_label(item: Any) -> str:
+    other_sources = _optional(item, "other_sources")
+    if not other_sources:
+        return item["source"]
+    return ", ".join([item["source"], *other_sources.split("\x1f")])
+
+
+def iter_sections(
+    items: Iterable[Any], per_category_limit: int
+) -> Iterator[tuple[str, list[Any]]]:
+    """Group render-ordered ``items`` into ``(category, items)`` sections."""
+    for category, group in groupby(items, key=itemgetter("category")):
+        yield category, list(islice(group, per_category_limit))
+
+
+def render_header(report_date: date) -> str:
+    return f"# Daily Brief — {report_date:%Y-%m-%d}\n"
+
+
+def render_section(category: str, items: Iterable[Any]) -> str:
+    lines = [f"\n## {category}\n"]
+    for item in items:
+        published = _optional(item, "published_raw")
+        published_suffix = f" — {published}" if published else ""
+        lines.append(f"- **{item['title']}** ({_source_label(item)}{published_suffix})\n")
+        lines.append(f"  - {item['link']}\n")
+    return "".join(lines)
+
+
+def section_digest(category: str, items: Iterable[Any]) -> str:
+    """Hash everything ``render_section`` reads, so equal digests render equal text."""
+    fields = [
+        (item["title"], _source_label(item), _optional(item, "published_raw"), item["link"])
+        for item in items
+    ]
+    return sha256_hex(json.dumps([category, fields], ensure_ascii=False))
+
+
+def write_report(
+    items: Iterable[Any],
+    report_date: date,
+    per_category_limit: int,
+    out: TextIO,
+) -> None:
+    """Stream a report to ``out`` one section at a time."""
+    out.write(render_header(report_date))
+    for category, section in iter_sections(items, per_category_limit):
+        out.write(render_section(category, section))
 
 
 def generate_report(
-    items: list[dict[str, str | None]],
+    items: Iterable[Any],
     report_date: date,
     per_category_limit: int,
 ) -> str:
-    grouped: dict[str, dict[str, list[dict[str, str | None]]]] = defaultdict(
-        lambda: defaultdict(list)
-    )
-    for item in items:
-        grouped[item["category"]][item["source"]].append(item)
-
-    lines: list[str] = [f"# Daily Brief — {report_date:%Y-%m-%d}", ""]
-
-    for category in sorted(grouped):
-        lines.append(f"## {category}")
-        sources = grouped[category]
-        category_items: list[tuple[str, dict[str, str | None]]] = []
-        for source, source_items in sources.items():
-            sorted_items = sorted(source_items, key=lambda x: (x["title"] or ""))
-            category_items.extend((source, item) for item in sorted_items)
-
-        category_items = sorted(
-            category_items, key=lambda x: (x[0], x[1]["title"] or "")
-        )[:per_category_limit]
-
-        for source, item in category_items:
-            published = item.get("published_raw")
-            published_suffix = f" — {published}" if published else ""
-            lines.append(f"- **{item['title']}** ({source}{published_suffix})")
-            lines.append(f"  - {item['link']}")
-        lines.append("")
-
-    return "\n".join(lines).rstrip() + "\n"
+    buffer = io.StringIO()
+    write_report(sorted(items, key=report_sort_key), report_date, per_category_limit, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,233 @@
+"""Retention for the ``items`` table: compress old summaries, archive old items."""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable
+
+from daily_brief_agent.archive import ArchiveWriter
+from daily_brief_agent.config import RetentionConfig, RetentionPolicy
+from daily_brief_agent.db import (
+    decode_summary,
+    rebuild_search_index,
+    search_available,
+    upgrade_search_index,
+)
+
+# Deflate saves nothing on summaries shorter than this.
+MIN_COMPRESS_LENGTH = 128
+
+_ARCHIVE_COLUMNS = (
+    "id",
+    "fetched_at_utc",
+    "published_raw",
+    "category",
+    "source",
+    "title",
+    "link",
+    "summary_raw",
+    "title_simhash",
+    "duplicate_of",
+    "excerpt",
+)
+
+_GROUP_FILTER = "category = ? AND source = ? AND fetched_at_utc < ?"
+
+
+@dataclass
+class RetentionResult:
+    compressed: int = 0
+    archived: int = 0
+    archive_files: list[Path] = field(default_factory=list)
+    pages_freed: int = 0
+    size_before: int = 0
+    size_after: int = 0
+
+
+def policy_for(
+    policies: Iterable[RetentionPolicy], category: str, source: str
+) -> RetentionPolicy | None:
+    """Return the most specific policy for one category/source pair."""
+    best: RetentionPolicy | None = None
+    best_rank = -1
+    for policy in policies:
+        if policy.category is not None and policy.category != category:
+            continue
+        if policy.source is not None and policy.source != source:
+            continue
+        rank = 2 * (policy.source is not None) + (policy.category is not None)
+        if rank > best_rank:
+            best, best_rank = policy, rank
+    return best
+
+
+def database_size(conn: sqlite3.Connection) -> int:
+    """Return the database file size in bytes, as SQLite accounts for it."""
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    return pages * conn.execute("PRAGMA page_size").fetchone()[0]
+
+
+def _cutoff(now: datetime, days: float | None) -> str | None:
+    return None if days is None else (now - timedelta(days=days)).isoformat()
+
+
+def _plan(
+    conn: sqlite3.Connection, config: RetentionConfig, now: datetime
+) -> list[tuple[str, str, str | None, str | None]]:
+    """Return ``(category, source, compress_before, archive_before)`` per stored pair."""
+    plan = []
+    pairs = conn.execute("SELECT DISTINCT category, source FROM items ORDER BY 1, 2").fetchall()
+    for category, source in pairs:
+        policy = policy_for(config.policies, category, source)
+        if policy is None:
+            continue
+        plan.append(
+            (
+                category,
+                source,
+                _cutoff(now, policy.compress_after_days),
+                _cutoff(now, policy.archive_after_days),
+            )
+        )
+    return plan
+
+
+def _archive(
+    conn: sqlite3.Connection,
+    plan: list[tuple[str, str, str | None, str | None]],
+    archive_dir: Path,
+    run_stamp: str,
+) -> tuple[int, list[Path]]:
+    writer = ArchiveWriter(archive_dir, run_stamp)
+    columns = ", ".join(_ARCHIVE_COLUMNS)
+    try:
+        for category, source, _, archive_before in plan:
+            if archive_before is None:
+                continue
+            cursor = conn.execute(
+                f"SELECT {columns} FROM items WHERE {_GROUP_FILTER} ORDER BY fetched_at_utc",
+                (category, source, archive_before),
+            )
+            while rows := cursor.fetchmany(1000):
+                for row in rows:
+                    item = dict(zip(_ARCHIVE_COLUMNS, row, strict=True))
+                    item["summary_raw"] = decode_summary(item["summary_raw"])
+                    writer.write(item)
+    except BaseException:
+        writer.discard()
+        raise
+    archived = writer.count
+    # The archive is on disk before anything is deleted; a crash in between only
+    # leaves items both archived and stored, and the next run archives them again.
+    files = writer.close()
+    if not archived:
+        return 0, files
+
+    with conn:
+        for category, source, _, archive_before in plan:
+            if archive_before is None:
+                continue
+            params = (category, source, archive_before)
+            conn.execute(
+                f"INSERT OR IGNORE INTO archived_ids SELECT id FROM items WHERE {_GROUP_FILTER}",
+                params,
+            )
+            conn.execute(
+                f"""
+                DELETE FROM title_simhash_bands
+                WHERE item_id IN (SELECT id FROM items WHERE {_GROUP_FILTER})
+                """,
+                params,
+            )
+            conn.execute(f"DELETE FROM items WHERE {_GROUP_FILTER}", params)
+        # Near-duplicates of an archived item stand on their own again.
+        conn.execute(
+            """
+            UPDATE items SET duplicate_of = NULL
+            WHERE duplicate_of IN (SELECT id FROM archived_ids)
+            """
+        )
+    if search_available(conn):
+        # Deletes only add tombstones to the index; merging drops them for good.
+        conn.execute("INSERT INTO items_fts (items_fts) VALUES ('optimize')")
+        conn.commit()
+    return archived, files
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """Switch a database to ``auto_vacuum = INCREMENTAL``; returns whether it had to."""
+    conn.commit()
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return False
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    if search_available(conn):
+        rebuild_search_index(conn)
+    return True
+
+
+def reclaim_space(conn: sqlite3.Connection) -> int:
+    """Return free pages to the filesystem; returns how many were freed incrementally."""
+    if enable_incremental_vacuum(conn):
+        return 0
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    # ``execute`` would step the pragma once, freeing a single page.
+    conn.executescript("PRAGMA incremental_vacuum;")
+    return free_pages - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def apply_retention(
+    conn: sqlite3.Connection,
+    config: RetentionConfig,
+    now: datetime,
+    dry_run: bool = False,
+) -> RetentionResult:
+    """Apply ``config`` to every stored category/source pair as of ``now``."""
+    result = RetentionResult(size_before=database_size(conn))
+    plan = _plan(conn, config, now)
+
+    if dry_run:
+        for category, source, compress_before, archive_before in plan:
+            if archive_before is not None:
+                result.archived += conn.execute(
+                    f"SELECT COUNT(*) FROM items WHERE {_GROUP_FILTER}",
+                    (category, source, archive_before),
+                ).fetchone()[0]
+            if compress_before is not None:
+                result.compressed += conn.execute(
+                    f"""
+                    SELECT COUNT(*) FROM items
+                    WHERE {_GROUP_FILTER} AND fetched_at_utc >= ?
+                        AND typeof(summary_raw) = 'text' AND length(summary_raw) >= ?
+                    """,
+                    (category, source, compress_before, archive_before or "", MIN_COMPRESS_LENGTH),
+                ).fetchone()[0]
+        result.size_after = result.size_before
+        return result
+
+    run_stamp = now.strftime("%Y%m%dT%H%M%SZ")
+    result.archived, result.archive_files = _archive(conn, plan, config.archive_dir, run_stamp)
+
+    if any(compress_before is not None for _, _, compress_before, _ in plan):
+        # An index still reading ``items`` directly would see compressed bytes.
+        upgrade_search_index(conn)
+        with conn:
+            for category, source, compress_before, _ in plan:
+                if compress_before is None:
+                    continue
+                result.compressed += conn.execute(
+                    f"""
+                    UPDATE items SET summary_raw = compress_summary(summary_raw, 9)
+                    WHERE {_GROUP_FILTER}
+                        AND typeof(summary_raw) = 'text' AND length(summary_raw) >= ?
+                    """,
+                    (category, source, compress_before, MIN_COMPRESS_LENGTH),
+                ).rowcount
+
+    if config.vacuum:
+        result.pages_freed = reclaim_space(conn)
+    result.size_after = database_size(conn)
+    return result
@@ -0,0 +1,98 @@
+"""Adaptive per-feed polling schedule for the long-running ``serve`` mode."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Protocol, Sequence
+
+from daily_brief_agent.config import FeedConfig
+
+
+class Clock(Protocol):
+    def monotonic(self) -> float: ...
+
+    def sleep(self, seconds: float) -> None: ...
+
+
+class SystemClock:
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+@dataclass
+class FeedSchedule:
+    feed: FeedConfig
+    interval: float
+    next_due: float
+    last_polled: float | None = None
+    items_per_second: float | None = None
+    failures: int = 0
+
+
+class AdaptiveScheduler:
+    """Schedule each feed on its own interval, adapted from its observed item rate."""
+
+    def __init__(
+        self,
+        feeds: Sequence[FeedConfig],
+        clock: Clock,
+        min_interval: float = 300.0,
+        max_interval: float = 6 * 3600.0,
+        initial_interval: float | None = None,
+        smoothing: float = 0.3,
+    ) -> None:
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Intervals must satisfy 0 < min_interval <= max_interval.")
+        self._clock = clock
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        interval = self._clamp(initial_interval or min_interval)
+        now = clock.monotonic()
+        self._schedules = {
+            feed: FeedSchedule(feed=feed, interval=interval, next_due=now) for feed in feeds
+        }
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def schedule_for(self, feed: FeedConfig) -> FeedSchedule:
+        return self._schedules[feed]
+
+    def due(self) -> list[FeedConfig]:
+        now = self._clock.monotonic()
+        return [feed for feed, schedule in self._schedules.items() if schedule.next_due <= now]
+
+    def seconds_until_next(self) -> float:
+        now = self._clock.monotonic()
+        return max(0.0, min(schedule.next_due for schedule in self._schedules.values()) - now)
+
+    def record_success(self, feed: FeedConfig, new_items: int) -> None:
+        schedule = self._schedules[feed]
+        now = self._clock.monotonic()
+        elapsed = now - schedule.last_polled if schedule.last_polled is not None else None
+        sample = new_items / (elapsed or schedule.interval)
+        if schedule.items_per_second is None:
+            schedule.items_per_second = sample
+        else:
+            schedule.items_per_second = (
+                self.smoothing * sample + (1 - self.smoothing) * schedule.items_per_second
+            )
+        if schedule.items_per_second > 0:
+            schedule.interval = self._clamp(1 / schedule.items_per_second)
+        else:
+            schedule.interval = self._clamp(schedule.interval * 2)
+        schedule.failures = 0
+        schedule.last_polled = now
+        schedule.next_due = now + schedule.interval
+
+    def record_failure(self, feed: FeedConfig) -> None:
+        schedule = self._schedules[feed]
+        now = self._clock.monotonic()
+        schedule.failures += 1
+        delay = min(self.max_interval, schedule.interval * 2**schedule.failures)
+        schedule.next_due = now + delay
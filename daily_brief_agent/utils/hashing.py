@@ -10,3 +10,10 @@ def sha256_hex(value: str) -> str:
     if not isinstance(value, str):
         raise TypeError("value must be a string")
     return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def sha256_bytes_hex(value: bytes) -> str:
+    """Return a SHA-256 hex digest for the given bytes."""
+    if not isinstance(value, bytes):
+        raise TypeError("value must be bytes")
+    return hashlib.sha256(value).hexdigest()
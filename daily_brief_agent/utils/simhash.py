@@ -0,0 +1,50 @@
+"""SimHash fingerprints for near-duplicate titles."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from itertools import pairwise
+
+FINGERPRINT_BITS = 64
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _features(text: str) -> list[str]:
+    tokens = _TOKEN_RE.findall(text.casefold())
+    return tokens + [f"{first} {second}" for first, second in pairwise(tokens)]
+
+
+def _to_signed(value: int) -> int:
+    return value - (1 << FINGERPRINT_BITS) if value >= 1 << (FINGERPRINT_BITS - 1) else value
+
+
+def simhash64(text: str) -> int:
+    """Return a 64-bit SimHash of ``text`` as a signed integer (fits SQLite INTEGER)."""
+    weights = [0] * FINGERPRINT_BITS
+    for feature in _features(text):
+        digest = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return _to_signed(value)
+
+
+def hamming_distance(first: int, second: int) -> int:
+    mask = (1 << FINGERPRINT_BITS) - 1
+    return ((first ^ second) & mask).bit_count()
+
+
+def band_values(fingerprint: int) -> list[int]:
+    """Split a fingerprint into ``BANDS`` LSH bucket keys."""
+    unsigned = fingerprint & ((1 << FINGERPRINT_BITS) - 1)
+    mask = (1 << BAND_BITS) - 1
+    return [unsigned >> (band * BAND_BITS) & mask for band in range(BANDS)]
@@ -0,0 +1,46 @@
+"""Text utilities."""
+
+from __future__ import annotations
+
+import html
+import re
+
+EXCERPT_LENGTH = 300
+
+# Scripts, styles and comments are skipped whole and any other tag separates words.
+# Text comes in bounded runs so that a long one is never scanned past the excerpt.
+_TOKENS = re.compile(
+    r"<(script|style)\b.*?(?:</\1\s*>|\Z)|<!--.*?(?:-->|\Z)|<[^>]*>?|[^<]{1,1024}",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def shorten(text: str, max_length: int) -> str:
+    """Cut ``text`` to at most ``max_length`` characters at a word boundary, adding "…"."""
+    if len(text) <= max_length:
+        return text
+    cut = text[: max_length - 1]
+    space = cut.rfind(" ")
+    if space > 0:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def html_excerpt(value: str | None, max_length: int = EXCERPT_LENGTH) -> str | None:
+    """Return the first ``max_length`` characters of the visible text in an HTML fragment."""
+    if not value:
+        return None
+    parts: list[str] = []
+    visible = 0
+    for match in _TOKENS.finditer(value):
+        chunk = match.group()
+        if chunk.startswith("<"):
+            parts.append(" ")
+            continue
+        parts.append(chunk)
+        visible += sum(map(len, chunk.split()))
+        if visible > max_length:
+            break
+    # Joined before decoding, so an entity split across runs still decodes.
+    text = " ".join(html.unescape("".join(parts)).split())
+    return shorten(text, max_length) or None
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import calendar
+import re
 from dataclasses import dataclass
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from email.utils import parsedate_tz
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 
@@ -27,6 +31,22 @@ class UtcDateRange:
     end: datetime
 
 
+_MONTHS = {
+    name: index
+    for index, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+# RFC 822 zone names; any other name counts as UTC, as RFC 2822 asks for "-0000".
+_ZONES = {"EST": -5, "EDT": -4, "CST": -6, "CDT": -5, "MST": -7, "MDT": -6, "PST": -8, "PDT": -7}
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_RFC822 = re.compile(
+    r"(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})[a-z]*\s+(\d{2,4})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([+-]\d{4}|[A-Za-z]+)?\s*"
+)
+
+
 def utc_now() -> datetime:
     """Return current UTC datetime with tzinfo."""
     return datetime.now(timezone.utc)
@@ -40,6 +60,54 @@ def parse_date(value: str) -> date:
         raise ValueError("Date must be in YYYY-MM-DD format.") from exc
 
 
+def to_epoch(value: datetime) -> int:
+    """Return whole UTC seconds since 1970; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() // 1)
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value: str | None) -> int | None:
+    """Parse an RFC 822 or ISO 8601 date string into epoch seconds, or ``None``."""
+    if not value:
+        return None
+    text = value.strip()
+    if text[:4].isdigit():
+        try:
+            return to_epoch(datetime.fromisoformat(text.replace("Z", "+00:00")))
+        except ValueError:
+            pass
+    match = _RFC822.fullmatch(text)
+    if match is not None:
+        day, month, year, hour, minute, second, zone = match.groups()
+        month_number = _MONTHS.get(month.lower())
+        if month_number is None:
+            return None
+        year_number = int(year)
+        if year_number < 100:
+            year_number += 2000 if year_number < 50 else 1900
+        if zone is None:
+            offset = 0
+        elif zone[0] in "+-":
+            offset = int(zone[1:3]) * 3600 + int(zone[3:]) * 60
+            offset = -offset if zone[0] == "-" else offset
+        else:
+            offset = _ZONES.get(zone.upper(), 0) * 3600
+        try:
+            days = date(year_number, month_number, int(day)).toordinal() - _EPOCH_ORDINAL
+        except ValueError:
+            return None
+        return days * 86400 + int(hour) * 3600 + int(minute) * 60 + int(second or 0) - offset
+    parsed = parsedate_tz(text)
+    if parsed is None:
+        return None
+    try:
+        return calendar.timegm(parsed[:9]) - (parsed[9] or 0)
+    except (ValueError, OverflowError):
+        return None
+
+
 def date_range_utc(target: date, tz: ZoneInfo) -> UtcDateRange:
     """Return UTC range for a target date in given timezone."""
     start_local = datetime.combine(target, time.min).replace(tzinfo=tz)
@@ -47,3 +115,12 @@ def date_range_utc(target: date, tz: ZoneInfo) -> UtcDateRange:
     start_utc = start_local.astimezone(timezone.utc)
     end_utc = end_local.astimezone(timezone.utc)
     return UtcDateRange(start=start_utc, end=end_utc)
+
+
+def days_range_utc(
+    first: date | None, last: date | None, tz: ZoneInfo
+) -> tuple[datetime | None, datetime | None]:
+    """Return the half-open UTC range ``[since, until)`` of local days ``first`` to ``last``."""
+    since = date_range_utc(first, tz).start if first is not None else None
+    until = date_range_utc(last + timedelta(days=1), tz).start if last is not None else None
+    return since, until
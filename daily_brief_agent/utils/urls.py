@@ -0,0 +1,74 @@
+"""URL utilities."""
+
+from __future__ import annotations
+
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+TRACKING_PARAMS = frozenset(
+    {
+        "ref",
+        "ref_src",
+        "ref_url",
+        "referrer",
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "cmpid",
+        "ncid",
+    }
+)
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(key: str) -> bool:
+    lowered = key.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def _split_netloc(netloc: str) -> tuple[str, str, str] | None:
+    """Split ``netloc`` into credentials, host and port text, or ``None`` for a bad port."""
+    credentials, _, hostport = netloc.rpartition("@")
+    if hostport.startswith("["):
+        host, _, rest = hostport.partition("]")
+        host += "]"
+        port = rest[1:] if rest.startswith(":") else rest
+    else:
+        host, _, port = hostport.partition(":")
+    if port and not (port.isdigit() and int(port) <= 65535):
+        return None
+    return credentials, host, port
+
+
+def canonicalize_url(url: str) -> str:
+    """Return a canonical form of ``url`` for deduplication."""
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+    split = _split_netloc(parts.netloc)
+    if split is None:
+        return url
+
+    scheme = parts.scheme.lower()
+    credentials, host, port = split
+    netloc = host.lower().rstrip(".")
+    if credentials:
+        netloc = f"{credentials}@{netloc}"
+    if port and int(port) != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{int(port)}"
+
+    query = sorted(
+        pair
+        for pair in parts.query.split("&")
+        if pair and not _is_tracking_param(unquote_plus(pair.partition("=")[0]))
+    )
+    fragment = parts.fragment if parts.fragment.startswith("!") else ""
+    return urlunsplit((scheme, netloc, parts.path or "/", "&".join(query), fragment))
@@ -0,0 +1,36 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture()
+def base_url(http_handler):
+    """Serve ``http_handler`` on a free local port and yield its base URL.
+
+    Test modules that fetch over HTTP define an ``http_handler`` fixture returning
+    their ``BaseHTTPRequestHandler`` class, resetting any state it records.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), http_handler)
+    # A short poll interval keeps shutdown, and with it each test, quick.
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class FakeClock:
+    """A ``scheduler.Clock`` whose ``sleep`` advances ``now`` instantly."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
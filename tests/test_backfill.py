@@ -0,0 +1,135 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+import yaml
+
+from daily_brief_agent.cli import main
+from daily_brief_agent.commands.common import write_daily_report
+from daily_brief_agent.config import load_config
+from daily_brief_agent.db import init_db, insert_items, query_report_rows, query_report_rows_by_day
+from daily_brief_agent.utils.time import date_range_utc, get_timezone
+
+TZ = "America/New_York"
+FIRST = date(2024, 3, 8)
+DAYS = [FIRST + timedelta(days=offset) for offset in range(6)]
+
+
+def _populate(conn: sqlite3.Connection) -> None:
+    items = []
+    for index in range(240):
+        # Every 30 minutes across the DST change on 2024-03-10, with a gap on the 11th.
+        fetched_at = f"2024-03-{8 + index // 48:02d}T{(index % 48) // 2:02d}:{index % 2 * 30:02d}"
+        if fetched_at.startswith("2024-03-11"):
+            continue
+        items.append(
+            {
+                "id": f"id-{index}",
+                "fetched_at_utc": f"{fetched_at}:00+00:00",
+                "published_raw": None,
+                "category": ["Tech", "Business", "Science"][index % 3],
+                "source": ["Alpha", "Beta"][index % 2],
+                "title": f"Title {index * 37 % 101:03d}",
+                "link": f"https://example.com/{index}",
+                "summary_raw": None,
+            }
+        )
+    insert_items(conn, items)
+
+
+def test_rows_by_day_match_single_day_queries():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    _populate(conn)
+    ranges = []
+    for day in DAYS:
+        date_range = date_range_utc(day, get_timezone(TZ))
+        ranges.append((day.isoformat(), date_range.start, date_range.end))
+
+    rows = [dict(row) for row in query_report_rows_by_day(conn, ranges, 4)]
+
+    for day, start_utc, end_utc in ranges:
+        expected = [dict(row) for row in query_report_rows(conn, start_utc, end_utc, False, 4)]
+        assert [
+            {key: value for key, value in row.items() if key != "day"}
+            for row in rows
+            if row["day"] == day
+        ] == expected
+    assert [row["day"] for row in rows] == sorted(row["day"] for row in rows)
+    conn.close()
+
+
+def test_rows_by_day_bind_a_fixed_number_of_variables():
+    conn = sqlite3.connect(":memory:")
+    # The default before SQLite 3.32.
+    conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    init_db(conn)
+    _populate(conn)
+    tz = get_timezone(TZ)
+    ranges = []
+    for offset in range(400):
+        day = FIRST - timedelta(days=200) + timedelta(days=offset)
+        date_range = date_range_utc(day, tz)
+        ranges.append((day.isoformat(), date_range.start, date_range.end))
+
+    rows = [dict(row) for row in query_report_rows_by_day(conn, ranges, 4)]
+
+    # All items fall within the 20 days around FIRST.
+    around = query_report_rows_by_day(conn, ranges[190:210], 4)
+    assert rows and rows == [dict(row) for row in around]
+    conn.close()
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_backfill_writes_one_report_per_day(tmp_path, monkeypatch, jobs):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "storage": {
+                    "db_path": str(tmp_path / "brief.sqlite"),
+                    "reports_dir": str(tmp_path / "reports"),
+                },
+                "feeds": [{"name": "Feed", "url": "https://example.com/rss", "category": "T"}],
+                "delivery": {"telegram": {"enabled": False}},
+                "timezone": TZ,
+            }
+        ),
+        encoding="utf-8",
+    )
+    config = load_config(config_path)
+    conn = sqlite3.connect(config.storage.db_path)
+    init_db(conn)
+    _populate(conn)
+    conn.commit()
+
+    main(
+        [
+            "--config",
+            str(config_path),
+            "--from",
+            "2024-03-08",
+            "--to",
+            "2024-03-13",
+            "--per-category-limit",
+            "4",
+            "--jobs",
+            jobs,
+        ]
+    )
+
+    reports = {path.name: path.read_text(encoding="utf-8") for path in tmp_path.glob("reports/*")}
+    assert sorted(reports) == [f"{day}.md" for day in DAYS]
+    for day in DAYS:
+        expected = write_daily_report(conn, config, day, False, 4).path.read_text(encoding="utf-8")
+        assert reports[f"{day}.md"] == expected
+    assert "##" not in reports["2024-03-13.md"]
+    conn.close()
+
+
+def test_backfill_needs_both_ends(capsys):
+    with pytest.raises(SystemExit):
+        main(["--from", "2024-03-08"])
+
+    assert "--from and --to must be used together" in capsys.readouterr().err
@@ -0,0 +1,168 @@
+import gzip
+import io
+import json
+import sqlite3
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+import yaml
+
+from daily_brief_agent.archive import ArchiveWriter, iter_archive
+from daily_brief_agent.bulk import iter_items, read_items, write_items
+from daily_brief_agent.cli import main
+from daily_brief_agent.db import compress_summary, init_db, insert_items, register_functions
+from daily_brief_agent.dedup import NearDuplicateIndex
+from daily_brief_agent.utils.hashing import sha256_hex
+from daily_brief_agent.utils.simhash import simhash64
+from daily_brief_agent.utils.time import days_range_utc
+
+
+def _items() -> list[dict]:
+    return [
+        {
+            "id": f"id-{index}",
+            "fetched_at_utc": f"2024-0{1 + index % 3}-15T08:00:00+00:00",
+            "published_raw": None if index % 2 else "Mon, 15 Jan 2024 08:00:00 GMT",
+            "category": ["Tech", "Business"][index % 2],
+            "source": ["Alpha", "Beta", "Gamma"][index % 3],
+            "title": f"Story, number {index}",
+            "link": f"https://example.com/{index}",
+            "summary_raw": f'<p>Summary "{index}"\nwith a second line</p>',
+            "title_simhash": simhash64(f"Story, number {index}"),
+        }
+        for index in range(12)
+    ]
+
+
+def _stored(conn: sqlite3.Connection) -> list[dict]:
+    return list(iter_items(conn))
+
+
+def _db() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    insert_items(conn, _items(), NearDuplicateIndex())
+    return conn
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_import_round_trip(fmt):
+    source = _db()
+    source.execute(
+        "UPDATE items SET summary_raw = ? WHERE id = 'id-4'",
+        (compress_summary(_items()[4]["summary_raw"]),),
+    )
+    buffer = io.StringIO()
+
+    assert write_items(buffer, iter_items(source, batch_size=5), fmt) == 12
+
+    target = sqlite3.connect(":memory:")
+    init_db(target)
+    buffer.seek(0)
+    assert insert_items(target, read_items(buffer, fmt), NearDuplicateIndex()) == 12
+    assert _stored(target) == _stored(source)
+    summaries = {item["id"]: item["summary_raw"] for item in _stored(target)}
+    assert summaries["id-4"] == _items()[4]["summary_raw"]
+    buffer.seek(0)
+    assert insert_items(target, read_items(buffer, fmt), NearDuplicateIndex()) == 0
+
+
+def test_export_filters():
+    conn = _db()
+    since = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    until = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+    february = list(iter_items(conn, since, until, category="Tech"))
+
+    assert [item["id"] for item in february] == ["id-4", "id-10"]
+    assert [item["id"] for item in iter_items(conn, source="Gamma", category="Business")] == [
+        "id-5",
+        "id-11",
+    ]
+
+
+def test_export_and_archive_read_the_same_half_open_day_range(tmp_path):
+    since, until = days_range_utc(date(2024, 1, 15), date(2024, 2, 14), ZoneInfo("Asia/Tokyo"))
+    assert (since, until) == (
+        datetime(2024, 1, 14, 15, tzinfo=timezone.utc),
+        datetime(2024, 2, 14, 15, tzinfo=timezone.utc),
+    )
+    edges = [
+        {**_items()[index], "id": item_id, "fetched_at_utc": fetched_at}
+        for index, (item_id, fetched_at) in enumerate(
+            [
+                ("before", "2024-01-14T14:59:59+00:00"),
+                ("first", "2024-01-14T15:00:00+00:00"),
+                ("last", "2024-02-14T14:59:59+00:00"),
+                ("after", "2024-02-14T15:00:00+00:00"),
+            ]
+        )
+    ]
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    insert_items(conn, edges)
+    writer = ArchiveWriter(tmp_path, "run")
+    for item in edges:
+        writer.write(item)
+    writer.close()
+
+    assert [item["id"] for item in iter_items(conn, since, until)] == ["first", "last"]
+    assert [item["id"] for item in iter_archive(tmp_path, since, until)] == ["first", "last"]
+    assert days_range_utc(None, None, ZoneInfo("UTC")) == (None, None)
+
+
+def test_import_fills_in_ids_and_fingerprints_like_fetched_items():
+    handle = io.StringIO(
+        "title,link,category,source,fetched_at_utc\n"
+        "Chip export rules,https://example.com/chips?utm_source=x,Tech,Wire,2024-01-02T10:00:00Z\n"
+    )
+
+    [item] = read_items(handle, "csv")
+
+    assert item["id"] == sha256_hex("https://example.com/chips")
+    assert item["link"] == "https://example.com/chips?utm_source=x"
+    assert item["title_simhash"] == simhash64("Chip export rules")
+    assert item["fetched_at_utc"] == "2024-01-02T10:00:00+00:00"
+    assert item["summary_raw"] is None
+
+    records = io.StringIO(json.dumps(item) + "\n\n" + '{"title": "No link"}\n')
+    with pytest.raises(ValueError, match="Record 2: missing fetched_at_utc"):
+        list(read_items(records, "ndjson"))
+
+
+def test_cli_exports_partitions_and_imports_gzip(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+
+    def config(name, **storage):
+        path = tmp_path / f"{name}.yaml"
+        settings = {
+            "storage": {
+                "db_path": str(tmp_path / f"{name}.sqlite"),
+                "reports_dir": str(tmp_path / "reports"),
+                **storage,
+            },
+            "feeds": [{"name": "Feed", "url": "https://example.com/rss", "category": "T"}],
+            "delivery": {"telegram": {"enabled": False}},
+        }
+        path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+        return str(path)
+
+    partitioned = config("partitioned", partitions_dir=str(tmp_path / "partitions"))
+    imported = config("imported")
+    export = tmp_path / "items.ndjson.gz"
+    source = tmp_path / "source.ndjson"
+    with open(source, "w", encoding="utf-8") as handle:
+        write_items(handle, _items(), "ndjson")
+
+    main(["import", str(source), "--config", partitioned, "--batch-size", "5"])
+    main(["export", "--config", partitioned, "-o", str(export), "--since", "2024-02-01"])
+    main(["import", str(export), "--config", imported])
+
+    with gzip.open(export, "rt", encoding="utf-8") as handle:
+        exported = [json.loads(line) for line in handle]
+    assert [item["fetched_at_utc"][:7] for item in exported] == ["2024-02"] * 4 + ["2024-03"] * 4
+    conn = sqlite3.connect(tmp_path / "imported.sqlite")
+    register_functions(conn)
+    assert _stored(conn) == exported
+    conn.close()
@@ -0,0 +1,87 @@
+import sqlite3
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from daily_brief_agent.db import get_feed_states, init_db, upsert_feed_states
+from daily_brief_agent.fetchers.rss import FeedState, fetch_feed_conditional
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Example</title>
+<item><title>First</title><link>https://example.com/first</link></item>
+</channel></rss>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802 - http.server API
+        honours_etag = self.path == "/etag"
+        if honours_etag and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        if honours_etag:
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, format, *args):
+        return
+
+
+@pytest.fixture()
+def http_handler():
+    return _Handler
+
+
+def test_not_modified_response_skips_parsing(base_url):
+    url = f"{base_url}/etag"
+    first = fetch_feed_conditional("Example", url, "Tech", 10)
+    assert [item["title"] for item in first.items] == ["First"]
+    assert first.state.etag == '"v1"'
+
+    second = fetch_feed_conditional("Example", url, "Tech", 10, state=first.state)
+    assert second.not_modified
+    assert second.items == []
+    assert second.bytes_saved == len(FEED)
+    assert second.state.content_hash == first.state.content_hash
+
+
+def test_unchanged_body_hash_skips_parsing(base_url):
+    url = f"{base_url}/plain"
+    first = fetch_feed_conditional("Example", url, "Tech", 10)
+    second = fetch_feed_conditional("Example", url, "Tech", 10, state=first.state)
+    assert second.not_modified
+    assert second.items == []
+    assert second.bytes_downloaded == len(FEED)
+
+    changed = fetch_feed_conditional(
+        "Example", url, "Tech", 10, state=FeedState(content_hash="stale")
+    )
+    assert not changed.not_modified
+    assert len(changed.items) == 1
+
+
+def test_feed_state_round_trip():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    state = {
+        "url": "https://example.com/rss",
+        "etag": '"abc"',
+        "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+        "content_hash": "deadbeef",
+        "content_length": 42,
+        "parse_seconds": 0.5,
+        "updated_at_utc": "2024-01-01T00:00:00+00:00",
+    }
+    upsert_feed_states(conn, [state])
+    upsert_feed_states(conn, [{**state, "etag": '"def"'}])
+
+    states = get_feed_states(conn)
+    conn.close()
+
+    assert states["https://example.com/rss"]["etag"] == '"def"'
+    assert states["https://example.com/rss"]["content_length"] == 42
@@ -1,8 +1,13 @@
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 import yaml
 
+from daily_brief_agent import config as config_module
+from daily_brief_agent.cli import main
 from daily_brief_agent.config import ConfigError, load_config
 
 
@@ -57,3 +62,151 @@ def test_load_config_invalid_timezone(tmp_path: Path):
     )
     with pytest.raises(ConfigError):
         load_config(config_path)
+
+
+def _valid_config() -> dict:
+    return {
+        "storage": {"db_path": "brief.sqlite", "reports_dir": "reports"},
+        "feeds": [{"name": "Feed", "url": "https://example.com/rss", "category": "Tech"}],
+        "delivery": {
+            "telegram": {
+                "enabled": True,
+                "digests": True,
+                "chats": [{"chat_id": -100123, "categories": ["Tech"]}, {"chat_id": "@news"}],
+            }
+        },
+        "timezone": "UTC",
+        "fetch": {"concurrency": 3, "run_timeout": 30},
+        "metrics": {"json_summary": "reports/last_run.json"},
+        "retention": {
+            "policies": [{"archive_after_days": 365}, {"source": "Feed", "compress_after_days": 7}]
+        },
+    }
+
+
+def test_telegram_chats_are_validated(tmp_path: Path):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, _valid_config())
+
+    telegram = load_config(config_path).delivery.telegram
+    assert [(chat.chat_id, chat.categories) for chat in telegram.chats] == [
+        ("-100123", ["Tech"]),
+        ("@news", []),
+    ]
+    assert telegram.digests and telegram.max_attempts == 5
+
+    invalid = _valid_config()
+    invalid["delivery"]["telegram"]["chats"] = [{"categories": ["Tech"]}]
+    _write_config(config_path, invalid)
+    with pytest.raises(ConfigError, match="chats\\[1\\].chat_id"):
+        load_config(config_path)
+
+
+def test_retention_policies_need_a_limit(tmp_path: Path):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, _valid_config())
+
+    retention = load_config(config_path).retention
+    assert [policy.source for policy in retention.policies] == [None, "Feed"]
+    assert retention.archive_dir == Path("archive") and retention.vacuum
+
+    invalid = _valid_config()
+    invalid["retention"]["policies"].append({"category": "Tech"})
+    _write_config(config_path, invalid)
+    with pytest.raises(ConfigError, match="policies\\[3\\] needs"):
+        load_config(config_path)
+
+
+def test_config_cache_skips_yaml_until_the_file_changes(tmp_path: Path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, _valid_config())
+    cache_dir = tmp_path / "cache"
+    uncached = load_config(config_path)
+
+    assert load_config(config_path, cache_dir=cache_dir) == uncached
+    assert len(list(cache_dir.glob("config-*.json"))) == 1
+
+    read_yaml = config_module._read_yaml
+    monkeypatch.setattr(config_module, "_read_yaml", lambda path: pytest.fail("YAML parsed"))
+    assert load_config(config_path, cache_dir=cache_dir) == uncached
+
+    changed = _valid_config()
+    changed["feeds"][0]["name"] = "Renamed feed"
+    _write_config(config_path, changed)
+    monkeypatch.setattr(config_module, "_read_yaml", read_yaml)
+    assert load_config(config_path, cache_dir=cache_dir).feeds[0].name == "Renamed feed"
+
+
+def test_dotenv_is_loaded_before_the_config_cache_is_located(tmp_path: Path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, _valid_config())
+    cache_dir = tmp_path / "from-dotenv"
+    monkeypatch.delenv("DAILY_BRIEF_AGENT_CACHE_DIR", raising=False)
+    monkeypatch.setattr(
+        "dotenv.load_dotenv",
+        lambda: monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(cache_dir)),
+    )
+
+    main(["--config", str(config_path), "--print-config"])
+
+    assert len(list(cache_dir.glob("config-*.json"))) == 1
+
+
+def test_cli_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, daily_brief_agent.cli; "
+        "print(','.join(m for m in ('feedparser', 'requests', 'yaml', 'dotenv') "
+        "if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])},
+    )
+
+    assert completed.stdout.strip() == ""
+
+
+@pytest.mark.parametrize(
+    ("section", "defaults", "invalid", "error"),
+    [
+        (
+            "storage",
+            {"summary_html": True, "excerpt_length": 300},
+            {"excerpt_length": 0},
+            "storage.excerpt_length",
+        ),
+        (
+            "storage",
+            {"payloads_dir": None, "payloads_max_mb": 1024.0},
+            {"payloads_dir": "payloads", "payloads_max_mb": 0},
+            "storage.payloads_max_mb",
+        ),
+        (
+            "fetch",
+            {"parse_workers": None, "queue_size": 16},
+            {"parse_workers": -1},
+            "fetch.parse_workers",
+        ),
+        (
+            "fetch",
+            {"breaker_failures": 3, "breaker_cooldown": 6 * 3600.0},
+            {"breaker_cooldown": 600, "breaker_max_cooldown": 60},
+            "breaker_max_cooldown",
+        ),
+        ("report", {"date_field": "fetched"}, {"date_field": "updated"}, "report.date_field"),
+    ],
+)
+def test_section_defaults_and_validation(tmp_path: Path, section, defaults, invalid, error):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, _valid_config())
+    loaded = getattr(load_config(config_path), section)
+    assert {name: getattr(loaded, name) for name in defaults} == defaults
+
+    settings = _valid_config()
+    settings.setdefault(section, {}).update(invalid)
+    _write_config(config_path, settings)
+    with pytest.raises(ConfigError, match=error):
+        load_config(config_path)
@@ -0,0 +1,136 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from daily_brief_agent.db import (
+    init_db,
+    insert_items,
+    query_items_for_date,
+    query_report_rows,
+    query_report_rows_by_day,
+)
+from daily_brief_agent.utils.time import parse_timestamp
+
+START = datetime(2024, 1, 2, tzinfo=timezone.utc)
+END = datetime(2024, 1, 2, 23, 59, 59, 999999, tzinfo=timezone.utc)
+
+
+def _epoch(*args: int) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("Tue, 02 Jan 2024 08:30:00 +0000", _epoch(2024, 1, 2, 8, 30)),
+        ("2 Jan 2024 08:30 GMT", _epoch(2024, 1, 2, 8, 30)),
+        ("Tue, 02 Jan 2024 03:30:00 EST", _epoch(2024, 1, 2, 8, 30)),
+        ("Tue, 02 Jan 24 10:30:00 +0200", _epoch(2024, 1, 2, 8, 30)),
+        ("Tue, 02 January 2024 08:30:00 -0130", _epoch(2024, 1, 2, 10, 0)),
+        ("2024-01-02T08:30:00+00:00", _epoch(2024, 1, 2, 8, 30)),
+        ("2024-01-02T09:30:00.250+01:00", _epoch(2024, 1, 2, 8, 30)),
+        ("2024-01-02T08:30:00Z", _epoch(2024, 1, 2, 8, 30)),
+        ("2024-01-02", _epoch(2024, 1, 2)),
+        ("Tue,  2 Jan 2024 08:30:00 +0000 (UTC)", _epoch(2024, 1, 2, 8, 30)),
+        ("Tue, 31 Feb 2024 08:30:00 +0000", None),
+        ("yesterday", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_timestamp(value, expected):
+    assert parse_timestamp(value) == expected
+
+
+def _item(index: int, fetched: str, published: str | None) -> dict:
+    return {
+        "id": f"id-{index}",
+        "fetched_at_utc": fetched,
+        "published_raw": published,
+        "category": "Tech",
+        "source": "Wire",
+        "title": f"Story {index}",
+        "link": f"https://example.com/{index}",
+        "summary_raw": None,
+    }
+
+
+def _populate(conn: sqlite3.Connection) -> None:
+    insert_items(
+        conn,
+        [
+            # Published the day before it was fetched.
+            _item(0, "2024-01-03T01:00:00+00:00", "Tue, 02 Jan 2024 23:00:00 +0000"),
+            _item(1, "2024-01-02T12:00:00+00:00", "Tue, 02 Jan 2024 11:00:00 +0000"),
+            # No usable publish date: placed by its fetch time.
+            _item(2, "2024-01-02T13:00:00+00:00", "sometime"),
+            _item(3, "2024-01-02T23:59:59.500000+00:00", "Mon, 01 Jan 2024 09:00:00 +0000"),
+        ],
+    )
+
+
+def test_reports_by_fetch_or_publish_time():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    _populate(conn)
+
+    def ids(rows):
+        return sorted(row["link"].rsplit("/", 1)[1] for row in rows)
+
+    assert ids(query_items_for_date(conn, START, END, False)) == ["1", "2", "3"]
+    by_published = query_items_for_date(conn, START, END, False, by_published=True)
+    assert ids(by_published) == ["0", "1", "2"]
+    assert ids(query_report_rows(conn, START, END, False, 10, by_published=True)) == ids(
+        by_published
+    )
+    days = [
+        ("2024-01-01", START.replace(day=1), END.replace(day=1)),
+        ("2024-01-02", START, END),
+    ]
+    rows = list(query_report_rows_by_day(conn, days, 10, by_published=True))
+    assert [(row["day"], row["link"][-1]) for row in rows] == [
+        ("2024-01-01", "3"),
+        ("2024-01-02", "0"),
+        ("2024-01-02", "1"),
+        ("2024-01-02", "2"),
+    ]
+
+
+def test_epoch_columns_are_added_and_backfilled():
+    conn = sqlite3.connect(":memory:")
+    # The items table as stored before the epoch columns existed.
+    conn.execute(
+        """
+        CREATE TABLE items (
+            id TEXT PRIMARY KEY,
+            fetched_at_utc TEXT NOT NULL,
+            published_raw TEXT NULL,
+            category TEXT NOT NULL,
+            source TEXT NOT NULL,
+            title TEXT NOT NULL,
+            link TEXT NOT NULL,
+            summary_raw TEXT NULL
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO items VALUES ('old', '2024-01-02T12:00:00+00:00', "
+        "'Tue, 02 Jan 2024 11:00:00 +0000', 'Tech', 'Wire', 'Old', 'https://example.com/old', "
+        "NULL)"
+    )
+
+    init_db(conn)
+
+    assert conn.execute(
+        "SELECT fetched_at_epoch, published_at_epoch FROM items"
+    ).fetchone() == (_epoch(2024, 1, 2, 12), _epoch(2024, 1, 2, 11))
+    plan = " ".join(
+        row[-1]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM items WHERE fetched_at_epoch BETWEEN 0 AND 1"
+        )
+    )
+    assert "idx_items_fetched_at_epoch" in plan
+    [row] = query_items_for_date(conn, START, END, False)
+    assert row["title"] == "Old"
@@ -0,0 +1,124 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import yaml
+
+from daily_brief_agent.commands.run import _profile_items, _shared_storage
+from daily_brief_agent.config import load_config
+from daily_brief_agent.db import (
+    fill_excerpts,
+    init_db,
+    insert_items,
+    query_items_for_date,
+    search_items,
+)
+from daily_brief_agent.fetchers.rss import parse_feed_bytes
+from daily_brief_agent.utils.text import html_excerpt
+
+START = datetime(2024, 1, 2, tzinfo=timezone.utc)
+END = datetime(2024, 1, 3, tzinfo=timezone.utc)
+SUMMARY = (
+    "<style>p { color: red }</style><p>Chip makers &amp; regulators <b>agree</b> on new</p>"
+    "<!-- tracking --><script>var x = '<p>hidden</p>';</script><p>export rules.</p>"
+    '<img src="data:image/png;base64,' + "A" * 50_000 + '">' + "<p>padding words</p>" * 500
+)
+
+
+def _feed(summary: str) -> bytes:
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Wire</title>'
+        "<item><title>Chip deal</title><link>https://example.com/chips</link>"
+        f"<description><![CDATA[{summary}]]></description></item></channel></rss>"
+    ).encode("utf-8")
+
+
+def test_html_excerpt_keeps_visible_text_only():
+    excerpt = html_excerpt(SUMMARY, 60)
+
+    assert excerpt == "Chip makers & regulators agree on new export rules.…"
+    assert len(html_excerpt(SUMMARY)) <= 300
+    assert html_excerpt("Plain  text\nsummary") == "Plain text summary"
+    assert html_excerpt("<p> </p><img src='x.png'>") is None
+    assert html_excerpt(None) is None
+    assert html_excerpt("a" * 500 + " tail", 10) == "aaaaaaaaa…"
+
+
+def test_items_without_summary_html_are_reported_and_searched_by_excerpt():
+    items, _ = parse_feed_bytes(_feed(SUMMARY), "Wire", "Tech", 10, summary_html=False)
+    [item] = items
+    assert item["summary_raw"] is None
+    assert item["excerpt"].startswith("Chip makers & regulators agree")
+
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    item["fetched_at_utc"] = "2024-01-02T08:00:00+00:00"
+    insert_items(conn, [item])
+
+    [row] = query_items_for_date(conn, START, END, include_history=False)
+    assert row["excerpt"] == item["excerpt"]
+    assert "summary_raw" not in row.keys()
+    [hit] = search_items(conn, "regulators")
+    assert "[regulators]" in hit["snippet"]
+
+
+def test_search_triggers_from_before_excerpts_are_upgraded_and_excerpts_filled():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    # Recreate the layout of a database written before excerpts existed.
+    conn.execute("DROP VIEW items_search")
+    conn.execute(
+        """
+        CREATE VIEW items_search AS
+        SELECT rowid AS item_rowid, title, summary_text(summary_raw) AS summary_raw FROM items
+        """
+    )
+    row = {
+        "id": "old",
+        "fetched_at_utc": "2024-01-02T08:00:00+00:00",
+        "category": "Tech",
+        "source": "Wire",
+        "title": "Old story",
+        "link": "https://example.com/old",
+        "summary_raw": "<p>Legacy <i>summary</i> text</p>",
+        "excerpt": None,
+    }
+    insert_items(conn, [row])
+
+    init_db(conn)
+    view = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'items_search'").fetchone()
+    assert "excerpt" in view[0]
+    assert fill_excerpts(conn) == 1
+    assert fill_excerpts(conn) == 0
+    [stored] = query_items_for_date(conn, START, END, include_history=False, summary=True)
+    assert stored["excerpt"] == "Legacy summary text"
+    assert stored["summary_raw"] == row["summary_raw"]
+
+    insert_items(conn, [{**row, "id": "new", "summary_raw": None, "excerpt": "Fresh excerpt"}])
+    assert [hit["id"] for hit in search_items(conn, "fresh")] == ["new"]
+    assert [hit["id"] for hit in search_items(conn, "legacy")] == ["old"]
+
+
+def test_profiles_cut_their_own_excerpts_from_a_shared_fetch(tmp_path):
+    configs = []
+    for name, storage in (("a", {"summary_html": False}), ("b", {"excerpt_length": 20})):
+        path = tmp_path / f"{name}.yaml"
+        settings = {
+            "storage": {"db_path": f"{name}.sqlite", "reports_dir": "reports", **storage},
+            "feeds": [{"name": name, "url": "https://example.com/rss", "category": "Tech"}],
+            "delivery": {"telegram": {"enabled": False}},
+        }
+        path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+        configs.append(load_config(path))
+
+    shared = _shared_storage(configs)
+    assert shared.summary_html and shared.excerpt_length == 300
+    assert not _shared_storage([configs[0], configs[0]]).summary_html
+    items, _ = parse_feed_bytes(_feed(SUMMARY), "Wire", "Tech", 10)
+    urls = {"Wire": "https://example.com/rss"}
+
+    [item_a] = _profile_items(configs[0], items, urls, shared.excerpt_length)
+    [item_b] = _profile_items(configs[1], items, urls, shared.excerpt_length)
+    assert item_a["summary_raw"] is None
+    assert item_a["excerpt"] == items[0]["excerpt"]
+    assert item_b["summary_raw"] == items[0]["summary_raw"]
+    assert item_b["excerpt"] == "Chip makers &…"
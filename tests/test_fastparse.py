@@ -0,0 +1,202 @@
+import pytest
+
+from daily_brief_agent.fetchers.fastparse import UnsupportedFeed, parse_entries
+from daily_brief_agent.fetchers.rss import parse_feed_bytes
+
+RSS = (
+    '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"'
+    ' xmlns:dc="http://purl.org/dc/elements/1.1/"'
+    ' xmlns:content="http://purl.org/rss/1.0/modules/content/"'
+    ' xmlns:media="http://search.yahoo.com/mrss/"'
+    ' xmlns:atom="http://www.w3.org/2005/Atom">'
+    "<channel><title>Feed</title><link>https://example.com/</link>{}</channel></rss>"
+)
+ATOM = (
+    '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+    "<title>Feed</title><id>urn:feed</id><updated>2024-01-01T00:00:00Z</updated>{}</feed>"
+)
+
+SUPPORTED = {
+    "rss_basic": RSS.format(
+        "<item><title>Hello</title><link>https://example.com/a</link>"
+        "<pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>"
+        "<description>Plain text</description></item>"
+    ),
+    "rss_escaped_html": RSS.format(
+        "<item><title>Tom &amp; Jerry &lt;3</title>"
+        "<link>https://example.com/a?x=1&amp;y=2</link>"
+        "<description>&lt;p&gt;Hi &amp;amp; &lt;script&gt;alert(1)&lt;/script&gt;"
+        '&lt;a href="/rel" onclick="x"&gt;l&lt;/a&gt;&lt;/p&gt;</description></item>'
+    ),
+    "rss_cdata": RSS.format(
+        "<item><title><![CDATA[Title <b>bold</b> done]]></title>"
+        "<link>https://example.com/b</link><description><![CDATA["
+        '<p style="color:red">Styled <img src="img.png"> &nbsp; text</p>]]></description></item>'
+    ),
+    "rss_whitespace": RSS.format(
+        "<item>\n <title>\n  Spaced   title \n</title>\n"
+        " <link>\n https://example.com/d \n</link>\n <description>  x  </description></item>"
+    ),
+    "rss_guid": RSS.format(
+        "<item><title>Only guid</title><guid>https://example.com/guid</guid></item>"
+        '<item><title>Opaque guid</title><guid isPermaLink="false">abc</guid>'
+        "<link>https://example.com/e</link></item>"
+        "<item><guid>https://example.com/guid2</guid><title>Guid first</title>"
+        "<link>https://example.com/f</link></item>"
+    ),
+    "rss_content": RSS.format(
+        "<item><title>C</title><link>https://example.com/g</link>"
+        "<content:encoded><![CDATA[<p>Body <em>text</em></p>]]></content:encoded></item>"
+        "<item><title>D</title><link>https://example.com/h</link>"
+        "<content:encoded><![CDATA[<p>Body</p>]]></content:encoded>"
+        "<description>Short</description></item>"
+    ),
+    "rss_extensions": RSS.format(
+        "<item><title>E</title><link>https://example.com/j</link><dc:creator>Ann</dc:creator>"
+        '<category>x</category><enclosure url="https://example.com/a.mp3" type="audio/mpeg"/>'
+        '<media:thumbnail url="https://example.com/t.jpg"/>'
+        '<atom:link rel="alternate" href="https://example.com/alt"/>'
+        '<x:thing xmlns:x="urn:x">t</x:thing></item>'
+    ),
+    "rss_encoding_quirks": RSS.format(
+        "<item><title>CafÃ© şehir — “quoted”</title><link>https://example.com/m</link>"
+        "<description>\u0093smart\u0094 &#8364;</description></item>"
+        "<item><title></title><link></link></item><item/>"
+    ),
+    "atom_basic": ATOM.format(
+        '<entry><title>Hello</title><link href="https://example.com/a"/><id>urn:1</id>'
+        "<updated>2024-01-02T00:00:00Z</updated><published>2024-01-01T00:00:00Z</published>"
+        "<summary>Text &lt;b&gt;not html&lt;/b&gt;</summary></entry>"
+    ),
+    "atom_html": ATOM.format(
+        '<entry><title type="html">Tom &amp;amp; &lt;i&gt;Jerry&lt;/i&gt;</title>'
+        '<link rel="self" href="https://example.com/self"/>'
+        '<link rel="alternate" type="text/html" href="https://example.com/alt"/>'
+        "<id>urn:2</id><updated>2024-01-02T00:00:00Z</updated>"
+        '<summary type="html">&lt;p onclick="x"&gt;Hi&lt;/p&gt;</summary></entry>'
+    ),
+    "atom_content": ATOM.format(
+        "<entry><title>C</title><id>https://example.com/id</id>"
+        '<updated>2024-01-02T00:00:00Z</updated><content type="html">&lt;p&gt;c&lt;/p&gt;'
+        "</content></entry><entry><title>C2</title><link href='/relative'/><id>urn:c2</id>"
+        "<updated>2024-01-02T00:00:00Z</updated><content>plain</content><summary>sum</summary>"
+        "</entry>"
+    ),
+}
+
+FALLBACK = {
+    "rdf": (
+        '<?xml version="1.0"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"'
+        ' xmlns="http://purl.org/rss/1.0/"><channel rdf:about="https://example.com/">'
+        "<title>F</title><link>https://example.com/</link></channel>"
+        '<item rdf:about="https://example.com/1"><title>One</title>'
+        "<link>https://example.com/1</link></item></rdf:RDF>"
+    ),
+    "dc_date": RSS.format(
+        "<item><title>D</title><link>https://example.com/a</link>"
+        "<dc:date>2024-01-01</dc:date></item>"
+    ),
+    "media_title": RSS.format(
+        "<item><link>https://example.com/a</link>"
+        "<media:group><media:title>M</media:title></media:group></item>"
+    ),
+    "xhtml": ATOM.format(
+        '<entry><title>X</title><link href="https://example.com/x"/><id>urn:x</id>'
+        '<updated>2024-01-02T00:00:00Z</updated><summary type="xhtml">'
+        '<div xmlns="http://www.w3.org/1999/xhtml"><p>x</p></div></summary></entry>'
+    ),
+    "xml_base": ATOM.format(
+        '<entry xml:base="https://other.example/"><title>B</title><link href="rel"/>'
+        "<id>urn:b</id><updated>2024-01-02T00:00:00Z</updated></entry>"
+    ),
+    "doctype": (
+        '<?xml version="1.0"?><!DOCTYPE rss PUBLIC "-//Netscape Communications//DTD RSS 0.91//EN"'
+        ' "http://my.netscape.com/publish/formats/rss-0.91.dtd"><rss version="0.91"><channel>'
+        "<title>F</title><item><title>T</title><link>https://example.com/a</link></item>"
+        "</channel></rss>"
+    ),
+    "source": RSS.format(
+        "<item><title>S</title><link>https://example.com/a</link>"
+        '<source url="https://other.example/rss">Other</source></item>'
+    ),
+    "undefined_entity": RSS.format(
+        "<item><title>T &nbsp; x</title><link>https://example.com/a</link></item>"
+    ),
+}
+
+HEADERS = [
+    {},
+    {
+        "content_type": "application/rss+xml; charset=utf-8",
+        "content_location": "https://example.com/feed/",
+    },
+    {"content_type": "text/xml", "content_location": "https://example.com/feed/"},
+    {"content_location": "https://example.com/feed/"},
+]
+
+
+def _generated(fmt: str, entries: int) -> str:
+    words = "market policy launch update report growth security cloud model".split()
+    body = []
+    for index in range(entries):
+        title = " ".join(words[(index + offset) % len(words)] for offset in range(6))
+        summary = f"&lt;p&gt;{title} &amp;amp; more&lt;/p&gt;"
+        link = f"https://example.com/articles/{index}?utm_source=rss"
+        if fmt == "atom":
+            body.append(
+                f'<entry><title>{title}</title><link rel="alternate" href="{link}"/>'
+                f"<id>urn:{index}</id><updated>2024-01-01T00:{index % 60:02d}:00Z</updated>"
+                f'<summary type="html">{summary}</summary></entry>'
+            )
+        else:
+            body.append(
+                f"<item><title>{title}</title><link>{link}</link>"
+                f"<pubDate>Mon, 01 Jan 2024 00:{index % 60:02d}:00 GMT</pubDate>"
+                f"<description>{summary}</description></item>"
+            )
+    return (ATOM if fmt == "atom" else RSS).format("".join(body))
+
+
+def _parse(content: bytes, fast: bool, **headers):
+    try:
+        return parse_feed_bytes(content, "Feed", "Tech", 50, fast=fast, **headers)
+    except ValueError as exc:
+        return type(exc)
+
+
+CORPUS = {**SUPPORTED, **FALLBACK, "rss_generated": _generated("rss", 80)}
+CORPUS["atom_generated"] = _generated("atom", 80)
+
+
+@pytest.mark.parametrize("headers", HEADERS)
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_fast_parser_matches_feedparser(name, headers):
+    content = CORPUS[name].encode("utf-8")
+
+    assert _parse(content, True, **headers) == _parse(content, False, **headers)
+
+
+@pytest.mark.parametrize("name", sorted(SUPPORTED) + ["rss_generated", "atom_generated"])
+def test_fast_parser_handles_common_feeds(name):
+    assert parse_entries(CORPUS[name].encode("utf-8"), 50)
+
+
+@pytest.mark.parametrize("name", sorted(FALLBACK))
+def test_unusual_feeds_fall_back_to_feedparser(name):
+    with pytest.raises(UnsupportedFeed):
+        parse_entries(FALLBACK[name].encode("utf-8"), 50)
+
+
+def test_fast_parser_stops_after_max_entries():
+    # The tail is truncated; only the first entries are ever read.
+    content = _generated("rss", 10).encode("utf-8")
+    truncated = content[: content.index(b"<item>", content.index(b"</item>") + 1) + 40]
+
+    entries = parse_entries(truncated, 1)
+
+    assert [entry["link"] for entry in entries] == ["https://example.com/articles/0?utm_source=rss"]
+    # A broken tail is tolerated, where feedparser rejects the whole document.
+    with pytest.raises(UnsupportedFeed):
+        parse_entries(truncated, 2)
+    with pytest.raises(ValueError):
+        parse_feed_bytes(truncated, "Feed", "Tech", 1, fast=False)
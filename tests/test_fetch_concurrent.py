@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+
+from daily_brief_agent.config import FeedConfig
+from daily_brief_agent.fetchers.concurrent import fetch_feeds_concurrently
+
+logger = logging.getLogger("test")
+
+
+def _feed(name: str, host: str = "example.com") -> FeedConfig:
+    return FeedConfig(name=name, url=f"https://{host}/{name}", category="Tech")
+
+
+def test_results_keep_feed_order_and_skip_failures(caplog):
+    feeds = [_feed("slow"), _feed("broken"), _feed("fast")]
+
+    def fetch(feed: FeedConfig):
+        if feed.name == "broken":
+            raise ValueError("boom")
+        if feed.name == "slow":
+            time.sleep(0.05)
+        return [{"title": feed.name}]
+
+    with caplog.at_level(logging.ERROR):
+        results = fetch_feeds_concurrently(feeds, fetch, logger, concurrency=3)
+
+    assert [feed.name for feed, _ in results] == ["slow", "fast"]
+    assert "Failed to fetch feed broken: boom" in caplog.text
+
+
+def test_run_timeout_skips_unfinished_feeds(caplog):
+    feeds = [_feed("hung", host="a.example"), _feed("quick", host="b.example")]
+    release = threading.Event()
+
+    def fetch(feed: FeedConfig):
+        if feed.name == "hung":
+            release.wait(5)
+        return []
+
+    with caplog.at_level(logging.ERROR):
+        started = time.monotonic()
+        results = fetch_feeds_concurrently(feeds, fetch, logger, concurrency=2, run_timeout=0.1)
+        elapsed = time.monotonic() - started
+    release.set()
+
+    assert [feed.name for feed, _ in results] == ["quick"]
+    assert elapsed < 2
+    assert "hung: run timeout exceeded" in caplog.text
+
+
+def test_per_host_limit_caps_in_flight_requests():
+    feeds = [_feed(f"feed-{index}") for index in range(6)]
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def fetch(feed: FeedConfig):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return []
+
+    fetch_feeds_concurrently(feeds, fetch, logger, concurrency=6, per_host_limit=2)
+
+    assert peak == 2
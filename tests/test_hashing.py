@@ -1,6 +1,6 @@
 import pytest
 
-from daily_brief_agent.utils.hashing import sha256_hex
+from daily_brief_agent.utils.hashing import sha256_bytes_hex, sha256_hex
 
 
 def test_sha256_hex_consistency():
@@ -12,3 +12,7 @@ def test_sha256_hex_consistency():
 def test_sha256_hex_type_error():
     with pytest.raises(TypeError):
         sha256_hex(123)  # type: ignore[arg-type]
+
+
+def test_sha256_bytes_hex_matches_text_digest():
+    assert sha256_bytes_hex(b"hello") == sha256_hex("hello")
@@ -0,0 +1,156 @@
+import logging
+import sqlite3
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import yaml
+
+from daily_brief_agent.cli import main
+from daily_brief_agent.commands.common import open_db
+from daily_brief_agent.commands.serve import poll_due_feeds
+from daily_brief_agent.config import FeedConfig, load_config
+from daily_brief_agent.health import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from daily_brief_agent.metrics import FeedMetrics
+from daily_brief_agent.scheduler import AdaptiveScheduler, SystemClock
+
+NOW = datetime(2024, 1, 2, 8, 0, tzinfo=timezone.utc)
+URL = "https://example.com/rss"
+
+
+def _outcome(error=None, seconds=1.0, size=1000, not_modified=False):
+    return FeedMetrics(
+        "Wire", URL, seconds, bytes_downloaded=size, not_modified=not_modified, error=error
+    )
+
+
+def test_circuit_opens_backs_off_and_closes_after_a_probe():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60, max_cooldown=200)
+    feed = FeedConfig(name="Wire", url=URL, category="Tech")
+
+    health = breaker.record(None, _outcome(seconds=2.0, size=1000), NOW)
+    health = breaker.record(health, _outcome(seconds=4.0, size=2000), NOW)
+    assert (health.avg_seconds, health.avg_bytes) == pytest.approx((2.6, 1300))
+    health = breaker.record(health, _outcome(not_modified=True, size=0), NOW)
+    assert health.avg_bytes == pytest.approx(1300)
+
+    health = breaker.record(health, _outcome("timed out"), NOW)
+    assert breaker.state(health, NOW) == CLOSED
+    health = breaker.record(health, _outcome("timed out"), NOW)
+    assert breaker.state(health, NOW + timedelta(seconds=59)) == OPEN
+    assert breaker.split([feed], {URL: health}, NOW) == ([], [feed])
+
+    later = NOW + timedelta(seconds=60)
+    assert breaker.state(health, later) == HALF_OPEN
+    assert breaker.split([feed], {URL: health}, later) == ([feed], [])
+    # A failed probe opens the circuit for twice as long, up to max_cooldown.
+    health = breaker.record(health, _outcome("HTTP 503"), later)
+    assert health.open_until_utc == (later + timedelta(seconds=120)).isoformat()
+    health = breaker.record(health, _outcome("HTTP 503"), later)
+    assert health.open_until_utc == (later + timedelta(seconds=200)).isoformat()
+    assert (health.consecutive_failures, health.failures, health.last_error) == (
+        4,
+        4,
+        "HTTP 503",
+    )
+
+    health = breaker.record(health, _outcome(), later + timedelta(seconds=200))
+    assert breaker.state(health, later) == CLOSED
+    assert (health.consecutive_failures, health.successes) == (0, 4)
+
+
+def test_breaker_can_be_disabled_and_missing_outcomes_count_as_failures():
+    breaker = CircuitBreaker(failure_threshold=0)
+    feed = FeedConfig(name="Renamed", url=URL, category="Tech")
+    health = {}
+    for _ in range(5):
+        health = breaker.update(health, [feed], [], NOW)
+    assert health[URL].consecutive_failures == 5
+    assert health[URL].last_error == "run timeout exceeded"
+    assert breaker.state(health[URL], NOW) == CLOSED
+
+    health = breaker.update(health, [feed], [_outcome()], NOW)
+    assert health[URL].feed == "Renamed"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests: Counter = Counter()
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        self.requests[self.path] += 1
+        if self.path == "/dead":
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = (
+            '<?xml version="1.0"?><rss version="2.0"><channel>'
+            "<item><title>Story</title><link>https://example.com/story</link></item>"
+            "</channel></rss>"
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        return
+
+
+@pytest.fixture()
+def http_handler():
+    _Handler.requests = Counter()
+    return _Handler
+
+
+def test_runs_skip_open_circuits_and_status_shows_them(
+    tmp_path, base_url, monkeypatch, caplog, capsys
+):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    db_path = tmp_path / "brief.sqlite"
+    config_path = tmp_path / "config.yaml"
+    settings = {
+        "storage": {"db_path": str(db_path), "reports_dir": str(tmp_path / "reports")},
+        "feeds": [
+            {"name": "Alive", "url": f"{base_url}/alive", "category": "Tech"},
+            {"name": "Dead", "url": f"{base_url}/dead", "category": "Tech"},
+        ],
+        "delivery": {"telegram": {"enabled": False}},
+        "fetch": {"parse_workers": 0, "breaker_failures": 2},
+    }
+    config_path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+    run = ["--config", str(config_path)]
+
+    for _ in range(3):
+        with caplog.at_level(logging.INFO):
+            main(run)
+    assert _Handler.requests == {"/alive": 3, "/dead": 2}
+    assert "Skipping feed Dead after 2 consecutive failures" in caplog.text
+    # Dry runs and serve polls skip it too.
+    main([*run, "--dry-run"])
+    assert "Story" in capsys.readouterr().out
+    config = load_config(config_path)
+    conn = open_db(config)
+    scheduler = AdaptiveScheduler(config.feeds, SystemClock())
+    assert poll_due_feeds(conn, config, scheduler, {}, 50, logging.getLogger("test")) == 0
+    conn.close()
+    assert _Handler.requests == {"/alive": 5, "/dead": 2}
+    assert scheduler.schedule_for(config.feeds[1]).failures == 1
+
+    main([*run, "feeds", "status"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split()[:3] == ["Feed", "State", "Fails"]
+    assert lines[1].split()[:3] == ["Alive", "closed", "0"]
+    assert lines[2].split()[:3] == ["Dead", "open", "2"]
+    assert "503" in lines[3]
+
+    # Once the cool-down has passed, the next run probes the feed again.
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE feed_health SET open_until_utc = ?", (NOW.isoformat(),))
+    conn.close()
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        main(run)
+    assert _Handler.requests["/dead"] == 3
+    assert "Probing feed Dead after 2 consecutive failures." in caplog.text
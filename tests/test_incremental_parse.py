@@ -0,0 +1,73 @@
+import sqlite3
+
+from daily_brief_agent.db import existing_ids, init_db, insert_items
+from daily_brief_agent.fetchers.rss import parse_feed_bytes
+from daily_brief_agent.utils.hashing import sha256_hex
+
+
+def _feed(*slugs: str) -> bytes:
+    entries = "".join(
+        f"<item><title>{slug}</title><link>https://example.com/{slug}</link></item>"
+        for slug in slugs
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Example</title>{entries}</channel></rss>"
+    ).encode("utf-8")
+
+
+def _seen(*slugs: str):
+    known = {sha256_hex(f"https://example.com/{slug}") for slug in slugs}
+    calls = []
+
+    def lookup(ids):
+        calls.append(list(ids))
+        return known & set(ids)
+
+    return lookup, calls
+
+
+def test_incremental_parse_stops_after_run_of_seen_entries():
+    lookup, calls = _seen("b", "c", "d")
+    content = _feed("a", "b", "c", "d", "e")
+
+    items, seen_count = parse_feed_bytes(
+        content, "Example", "Tech", 50, seen_lookup=lookup, seen_run_limit=3
+    )
+
+    assert [item["title"] for item in items] == ["a"]
+    assert seen_count == 3
+    assert len(calls) == 1
+
+
+def test_incremental_parse_without_limit_keeps_all_new_entries():
+    lookup, _ = _seen("b")
+    items, seen_count = parse_feed_bytes(
+        _feed("a", "b", "c"), "Example", "Tech", 50, seen_lookup=lookup
+    )
+
+    assert [item["title"] for item in items] == ["a", "c"]
+    assert seen_count == 1
+
+
+def test_existing_ids_batches_lookup():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    stored = [
+        {
+            "id": sha256_hex(f"https://example.com/{index}"),
+            "fetched_at_utc": "2024-01-01T00:00:00+00:00",
+            "category": "Tech",
+            "source": "Example",
+            "title": str(index),
+            "link": f"https://example.com/{index}",
+        }
+        for index in range(5)
+    ]
+    insert_items(conn, stored)
+
+    wanted = [item["id"] for item in stored[:3]] + ["missing"]
+    found = existing_ids(conn, wanted, batch_size=2)
+    conn.close()
+
+    assert found == {item["id"] for item in stored[:3]}
@@ -0,0 +1,91 @@
+import sqlite3
+from datetime import date
+
+from daily_brief_agent.db import get_report_sections, init_db, save_report_sections
+from daily_brief_agent.reporting import incremental
+from daily_brief_agent.reporting.incremental import update_report
+from daily_brief_agent.reporting.markdown import generate_report, report_sort_key
+
+DAY = date(2024, 1, 2)
+
+
+def _items(extra: int = 0) -> list[dict]:
+    items = [
+        {
+            "category": category,
+            "source": source,
+            "title": f"{category}-{source}-{index}",
+            "link": f"https://example.com/{category}/{source}/{index}",
+            "published_raw": None,
+        }
+        for category in ("Tech", "Business", "Science")
+        for source in ("Alpha", "Beta")
+        for index in range(2)
+    ]
+    items += [
+        {"category": "Tech", "source": "Gamma", "title": f"Extra {index}", "link": f"x{index}"}
+        for index in range(extra)
+    ]
+    return sorted(items, key=report_sort_key)
+
+
+def test_first_run_renders_every_section(tmp_path):
+    path = tmp_path / "reports" / "2024-01-02.md"
+
+    update = update_report(_items(), DAY, 3, path, {})
+
+    assert update.rewritten
+    assert update.changed_sections == ["Business", "Science", "Tech"]
+    assert path.read_text(encoding="utf-8") == generate_report(_items(), DAY, 3)
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_only_changed_sections_are_rendered(tmp_path, monkeypatch):
+    path = tmp_path / "2024-01-02.md"
+    first = update_report(_items(), DAY, 5, path, {})
+    mtime = path.stat().st_mtime_ns
+
+    unchanged = update_report(_items(), DAY, 5, path, first.sections)
+    assert not unchanged.rewritten
+    assert unchanged.changed_sections == []
+    assert unchanged.digest == first.digest
+    assert path.stat().st_mtime_ns == mtime
+
+    rendered = []
+    render_section = incremental.render_section
+    monkeypatch.setattr(
+        incremental,
+        "render_section",
+        lambda category, items: rendered.append(category) or render_section(category, items),
+    )
+    without_science = [item for item in _items(extra=1) if item["category"] != "Science"]
+    changed = update_report(without_science, DAY, 5, path, unchanged.sections)
+
+    assert rendered == changed.changed_sections == ["Tech"]
+    assert changed.removed_sections == ["Science"]
+    assert changed.rewritten
+    assert path.read_text(encoding="utf-8") == generate_report(without_science, DAY, 5)
+
+
+def test_missing_report_file_is_rewritten_from_cached_sections(tmp_path):
+    path = tmp_path / "2024-01-02.md"
+    first = update_report(_items(), DAY, 3, path, {})
+    path.unlink()
+
+    again = update_report(_items(), DAY, 3, path, first.sections)
+
+    assert again.rewritten and again.changed_sections == []
+    assert path.read_text(encoding="utf-8") == generate_report(_items(), DAY, 3)
+
+
+def test_report_sections_round_trip():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    sections = {"Tech": ("d1", "body"), "Science": ("d2", "other")}
+
+    save_report_sections(conn, "reports/2024-01-02.md", sections)
+    save_report_sections(conn, "reports/2024-01-03.md", {"Tech": ("d3", "x")})
+    save_report_sections(conn, "reports/2024-01-02.md", {"Tech": ("d4", "new")})
+
+    assert get_report_sections(conn, "reports/2024-01-02.md") == {"Tech": ("d4", "new")}
+    assert get_report_sections(conn, "reports/2024-01-03.md") == {"Tech": ("d3", "x")}
@@ -0,0 +1,65 @@
+import sqlite3
+from datetime import date, datetime, timezone
+
+import pytest
+
+from daily_brief_agent.db import init_db, insert_items, query_items_for_date
+from daily_brief_agent.items import ITEM_FIELDS, Item, as_item
+from daily_brief_agent.reporting.markdown import generate_report
+
+START = datetime(2024, 1, 2, tzinfo=timezone.utc)
+END = datetime(2024, 1, 2, 23, 59, 59, tzinfo=timezone.utc)
+
+
+def _record(index: int) -> dict:
+    return {
+        "id": f"id-{index}",
+        "fetched_at_utc": "2024-01-02T08:00:00+00:00",
+        "published_raw": None,
+        "category": "Tech",
+        "source": "Wire",
+        "title": f"Story {index}",
+        "link": f"https://example.com/{index}",
+        "summary_raw": "<p>Chips &amp; <b>rules</b></p>",
+    }
+
+
+def test_items_are_slotted_and_read_like_item_dicts():
+    item = as_item(_record(1))
+
+    assert not hasattr(item, "__dict__")
+    assert item["title"] == item.title == "Story 1"
+    assert item.get("excerpt") == "Chips & rules"
+    assert item.get("other_sources", "-") == "-"
+    assert "summary_raw" in item and "other_sources" not in item
+    assert dict(item)["link"] == "https://example.com/1"
+    assert list(item) == list(item.keys()) == list(ITEM_FIELDS)
+    assert len(item) == len(ITEM_FIELDS)
+    assert dict(item.items()) == dict(zip(ITEM_FIELDS, item.values(), strict=True))
+    item["fetched_at_utc"] = "2024-01-03T08:00:00+00:00"
+    assert item.fetched_at_utc == "2024-01-03T08:00:00+00:00"
+    with pytest.raises(KeyError):
+        item["other_sources"]
+    with pytest.raises(KeyError):
+        item["other_sources"] = "Feed"
+    assert as_item(item) is item
+
+
+def test_items_and_item_dicts_are_stored_alike_and_read_back_as_items():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    assert insert_items(conn, [_record(1), as_item(_record(2))]) == 2
+
+    rows = query_items_for_date(conn, START, END, include_history=False)
+
+    assert all(isinstance(row, Item) for row in rows)
+    assert [row.excerpt for row in rows] == ["Chips & rules", "Chips & rules"]
+    assert "summary_raw" not in rows[0] and rows[0].get("summary_raw") is None
+    assert len(rows[0]) == len(ITEM_FIELDS) - 1
+    with pytest.raises(KeyError):
+        rows[0]["summary_raw"]
+    [full, _] = query_items_for_date(conn, START, END, include_history=False, summary=True)
+    assert full["summary_raw"] == "<p>Chips &amp; <b>rules</b></p>"
+    assert conn.row_factory is None
+    report = generate_report(rows, date(2024, 1, 2), 10)
+    assert report == generate_report([_record(2), _record(1)], date(2024, 1, 2), 10)
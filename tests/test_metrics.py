@@ -0,0 +1,96 @@
+import json
+import sqlite3
+
+from daily_brief_agent.db import init_db, record_run
+from daily_brief_agent.metrics import (
+    NULL_METRICS,
+    FeedMetrics,
+    RunMetrics,
+    to_prometheus,
+    write_json_summary,
+)
+
+
+def _metrics() -> RunMetrics:
+    metrics = RunMetrics(started_at_utc="2024-01-01T00:00:00+00:00")
+    with metrics.stage("fetch"):
+        pass
+    metrics.record_feed(
+        FeedMetrics("Feed", "https://example.com/rss", 0.25, bytes_downloaded=1024, new_items=3)
+    )
+    metrics.record_feed(FeedMetrics('Bad "feed"', "https://bad.example", 1.5, error="timeout"))
+    metrics.count("items_inserted", 3)
+    return metrics
+
+
+def test_stage_timings_accumulate():
+    metrics = RunMetrics()
+    with metrics.stage("insert"):
+        pass
+    with metrics.stage("insert"):
+        pass
+    assert set(metrics.stages) == {"insert"}
+    assert metrics.stages["insert"] >= 0
+
+
+def test_null_metrics_records_nothing():
+    with NULL_METRICS.stage("fetch"):
+        NULL_METRICS.record_feed(FeedMetrics("Feed", "https://example.com", 1.0))
+        NULL_METRICS.count("items_inserted", 1)
+        NULL_METRICS.record_report({"rewritten": True, "changed_sections": ["Tech"]})
+    assert not NULL_METRICS.enabled
+
+
+def test_report_update_is_summarized():
+    metrics = RunMetrics()
+    report = {"path": "r.md", "rewritten": True, "changed_sections": ["Tech", "Science"]}
+
+    metrics.record_report(report)
+
+    assert metrics.summary()["report"] == report
+    assert metrics.counters == {"report_sections_changed": 2, "report_rewritten": 1}
+
+
+def test_prometheus_export_escapes_labels():
+    text = to_prometheus(_metrics())
+    assert 'daily_brief_stage_seconds{stage="fetch"}' in text
+    assert 'daily_brief_feed_bytes{feed="Feed",url="https://example.com/rss"} 1024' in text
+    assert 'daily_brief_feed_errors{feed="Bad \\"feed\\"",url="https://bad.example"} 1' in text
+    assert "daily_brief_items_inserted 3" in text
+
+
+def test_pipeline_stages_are_summarized_and_exported():
+    metrics = _metrics()
+    stages = {
+        "download": {"processed": 4, "busy_seconds": 1.5, "wait_seconds": 0.25},
+        "write": {"processed": 120, "busy_seconds": 0.5, "wait_seconds": 1.0},
+    }
+
+    metrics.record_pipeline(stages)
+    NULL_METRICS.record_pipeline(stages)
+
+    assert metrics.summary()["pipeline"] == stages
+    text = to_prometheus(metrics)
+    assert 'daily_brief_pipeline_processed{stage="write"} 120' in text
+    assert 'daily_brief_pipeline_wait_seconds{stage="download"} 0.25' in text
+    assert "pipeline" not in to_prometheus(_metrics())
+
+
+def test_run_summary_is_stored_and_exported(tmp_path):
+    metrics = _metrics()
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+
+    run_id = record_run(conn, metrics.summary(), "2024-01-01T00:01:00+00:00")
+    feeds = conn.execute(
+        "SELECT feed, new_items, error FROM feed_runs WHERE run_id = ? ORDER BY feed", (run_id,)
+    ).fetchall()
+    conn.close()
+
+    assert feeds == [('Bad "feed"', 0, "timeout"), ("Feed", 3, None)]
+
+    path = tmp_path / "run.json"
+    write_json_summary(metrics, path)
+    summary = json.loads(path.read_text(encoding="utf-8"))
+    assert summary["counters"] == {"items_inserted": 3}
+    assert len(summary["feeds"]) == 2
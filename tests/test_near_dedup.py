@@ -0,0 +1,124 @@
+import io
+import sqlite3
+from datetime import date, datetime, timezone
+from functools import partial
+
+from daily_brief_agent.db import existing_ids, init_db, insert_items, query_report_rows
+from daily_brief_agent.dedup import NearDuplicateIndex
+from daily_brief_agent.fetchers.rss import parse_feed_bytes
+from daily_brief_agent.reporting.markdown import write_report
+from daily_brief_agent.utils.hashing import sha256_hex
+from daily_brief_agent.utils.simhash import band_values, hamming_distance, simhash64
+from daily_brief_agent.utils.urls import canonicalize_url
+
+
+def test_canonicalize_url_strips_tracking_and_sorts_query():
+    url = "HTTPS://Example.COM:443/story?utm_source=rss&b=2&ref=hn&a=1#comments"
+    assert canonicalize_url(url) == "https://example.com/story?a=1&b=2"
+    assert canonicalize_url("http://example.com") == "http://example.com/"
+    assert canonicalize_url("http://example.com:8080/x?fbclid=abc") == "http://example.com:8080/x"
+
+
+def test_canonicalize_url_keeps_what_identifies_the_page():
+    assert canonicalize_url("https://[2001:DB8::1]:8443/a") == "https://[2001:db8::1]:8443/a"
+    assert canonicalize_url("https://ex.com/#!/post/7") == "https://ex.com/#!/post/7"
+    assert canonicalize_url("https://ex.com/s?q=a%20b&ref=main") == "https://ex.com/s?q=a%20b"
+    # Not a valid port: left alone rather than guessed at.
+    assert canonicalize_url(" http://ex.com:99999/x ") == "http://ex.com:99999/x"
+
+
+def test_items_stored_under_raw_link_ids_are_not_stored_again():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    link = "https://alpha.example/1?utm_source=rss"
+    insert_items(conn, [_item(link, "Alpha", "Old row keyed by the raw link")])
+
+    feed = (
+        '<?xml version="1.0"?><rss version="2.0"><channel><item><title>Story</title>'
+        f"<link>{link.replace('&', '&amp;')}</link></item></channel></rss>"
+    ).encode()
+    [item], _ = parse_feed_bytes(feed, "Alpha", "Tech", 10)
+    assert item.id != sha256_hex(link) and item.link == link
+    assert insert_items(conn, [item]) == 0
+    seen = parse_feed_bytes(feed, "Alpha", "Tech", 10, seen_lookup=partial(existing_ids, conn))
+    assert seen == ([], 1)
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+
+def test_simhash_is_stable_for_reworded_titles():
+    original = simhash64("Apple unveils new iPhone with AI features")
+    assert hamming_distance(original, simhash64("Apple Unveils New iPhone With AI Features!")) == 0
+    assert hamming_distance(original, simhash64("Stock markets fall on inflation fears")) > 3
+
+
+def test_band_values_cover_close_fingerprints():
+    fingerprint = simhash64("Central bank holds interest rates steady")
+    flipped = fingerprint ^ 0b1011
+    shared = set(enumerate(band_values(fingerprint))) & set(enumerate(band_values(flipped)))
+    assert shared
+
+
+def _item(link: str, source: str, title: str, fetched_at: str = "2024-01-01T10:00:00+00:00"):
+    return {
+        "id": sha256_hex(link),
+        "fetched_at_utc": fetched_at,
+        "published_raw": None,
+        "category": "Tech",
+        "source": source,
+        "title": title,
+        "link": link,
+        "summary_raw": None,
+        "title_simhash": simhash64(title),
+    }
+
+
+def test_near_duplicates_collapse_into_one_report_entry():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    index = NearDuplicateIndex(max_distance=3)
+    items = [
+        _item("https://alpha.example/1", "Alpha", "Apple unveils new iPhone with AI features"),
+        _item("https://gamma.example/9", "Gamma", "Apple Unveils New iPhone With AI Features"),
+        _item("https://beta.example/5", "Beta", "Apple unveils new iPhone with AI features!"),
+        _item("https://beta.example/6", "Beta", "Stock markets fall on inflation fears"),
+    ]
+
+    inserted = insert_items(conn, items, index)
+    duplicates = conn.execute(
+        "SELECT COUNT(*) FROM items WHERE duplicate_of = ?", (items[0]["id"],)
+    ).fetchone()[0]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 1, 23, 59, 59, tzinfo=timezone.utc)
+    rows = list(query_report_rows(conn, start, end, False, 30))
+    conn.close()
+
+    assert inserted == 4
+    assert duplicates == 2
+    assert [row["title"] for row in rows] == [
+        "Apple unveils new iPhone with AI features",
+        "Stock markets fall on inflation fears",
+    ]
+
+    out = io.StringIO()
+    write_report(rows, date(2024, 1, 1), 30, out)
+    assert "(Alpha, Beta, Gamma)" in out.getvalue()
+
+
+def test_near_duplicates_outside_window_are_kept():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    index = NearDuplicateIndex(max_distance=3)
+    insert_items(
+        conn,
+        [_item("https://a.example/1", "A", "Weekly roundup", "2024-01-01T00:00:00+00:00")],
+        index,
+    )
+    insert_items(
+        conn,
+        [_item("https://a.example/2", "A", "Weekly roundup", "2024-01-08T00:00:00+00:00")],
+        index,
+    )
+
+    linked = conn.execute("SELECT COUNT(*) FROM items WHERE duplicate_of IS NOT NULL").fetchone()
+    conn.close()
+    assert linked[0] == 0
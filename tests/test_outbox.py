@@ -0,0 +1,201 @@
+import json
+import logging
+import sqlite3
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from daily_brief_agent.commands.run import _telegram_messages
+from daily_brief_agent.config import (
+    AppConfig,
+    DeliveryConfig,
+    StorageConfig,
+    TelegramChat,
+    TelegramConfig,
+)
+from daily_brief_agent.db import enqueue_outbox, init_db, outbox_counts
+from daily_brief_agent.delivery.outbox import OutboxWorker, TokenBucket
+from daily_brief_agent.delivery.telegram import (
+    TelegramClient,
+    pack_messages,
+    send_telegram_message,
+    split_message,
+)
+from daily_brief_agent.reporting.incremental import update_report
+
+LOGGER = logging.getLogger("test_outbox")
+
+
+class _BotApi(BaseHTTPRequestHandler):
+    """Stub ``sendMessage``: replies from ``script`` in order, then 200."""
+
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    requests: list = []
+    script: list = []
+    url = ""
+
+    def do_POST(self):  # noqa: N802 - http.server API
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            self.requests.append((self.path, self.client_address[1], body))
+            status, payload = self.script.pop(0) if self.script else (200, {"ok": True})
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        return
+
+
+@pytest.fixture()
+def http_handler():
+    _BotApi.requests = []
+    _BotApi.script = []
+    return _BotApi
+
+
+@pytest.fixture()
+def bot_api(base_url):
+    _BotApi.url = base_url
+    return _BotApi
+
+
+def _worker(conn, bot_api, clock, **kwargs):
+    client = TelegramClient("TOKEN", api_url=bot_api.url, timeout=5)
+    return OutboxWorker(conn, client, clock, LOGGER, **kwargs)
+
+
+def _db() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    return conn
+
+
+def _statuses(conn):
+    return [tuple(row) for row in conn.execute("SELECT status, attempts FROM outbox ORDER BY id")]
+
+
+def test_long_text_is_split_at_line_breaks_and_short_parts_batched():
+    text = "\n".join(f"line {index:03d} " + "x" * 20 for index in range(100))
+
+    chunks = split_message(text, limit=300)
+
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert "\n".join(chunks) == text
+    assert split_message("y" * 650, limit=300) == ["y" * 300, "y" * 300, "y" * 50]
+    assert pack_messages(["a", "b", "c" * 10], limit=8) == ["a\n\nb", "cccccccc", "cc"]
+
+
+def test_token_bucket_limits_rate_after_burst(clock):
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    for _ in range(7):
+        bucket.acquire()
+
+    assert clock.now == pytest.approx(2.0)
+    bucket.pause(10)
+    bucket.acquire()
+    assert clock.now == pytest.approx(12.5)
+
+
+def test_worker_delivers_in_order_over_one_connection_within_rate_limits(bot_api, clock):
+    conn = _db()
+    messages = [("chat-a", f"a{index}") for index in range(3)] + [("chat-b", "b0")]
+    enqueue_outbox(conn, messages, "2000-01-01T00:00:00+00:00")
+
+    stats = _worker(conn, bot_api, clock, chat_messages_per_second=0.5).drain(timeout=60)
+
+    assert stats.sent == 4
+    assert [body["text"] for _, _, body in bot_api.requests] == ["a0", "a1", "a2", "b0"]
+    assert {path for path, _, _ in bot_api.requests} == {"/botTOKEN/sendMessage"}
+    assert len({port for _, port, _ in bot_api.requests}) == 1
+    assert clock.now == pytest.approx(4.0)
+    assert outbox_counts(conn) == {"sent": 4}
+
+
+def test_429_waits_retry_after_without_counting_an_attempt(bot_api, clock):
+    conn = _db()
+    enqueue_outbox(conn, [("chat", "hello")], "2000-01-01T00:00:00+00:00")
+    bot_api.script = [
+        (429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 7}}),
+    ]
+
+    stats = _worker(conn, bot_api, clock).drain(timeout=60)
+
+    assert (stats.sent, stats.retried) == (1, 1)
+    assert clock.now >= 7
+    assert _statuses(conn) == [("sent", 1)]
+
+
+def test_transient_errors_back_off_and_permanent_errors_fail(bot_api, clock):
+    conn = _db()
+    enqueue_outbox(conn, [("chat", "retry me"), ("gone", "fails")], "2000-01-01T00:00:00+00:00")
+    bot_api.script = [
+        (502, {}),
+        (403, {"ok": False, "description": "Forbidden: bot was blocked by the user"}),
+        (500, {"ok": False, "description": "Internal Server Error"}),
+    ]
+
+    stats = _worker(conn, bot_api, clock, backoff_base=2).drain(timeout=60)
+
+    assert (stats.sent, stats.failed) == (1, 1)
+    assert clock.now >= 2 + 4
+    assert _statuses(conn) == [("sent", 3), ("failed", 1)]
+    assert "blocked" in conn.execute("SELECT last_error FROM outbox WHERE id = 2").fetchone()[0]
+
+
+def test_undelivered_messages_stay_queued_for_the_next_run(bot_api, clock):
+    conn = _db()
+    enqueue_outbox(conn, [("chat", "later")], "2000-01-01T00:00:00+00:00")
+    bot_api.script = [(503, {}), (503, {})]
+
+    stats = _worker(conn, bot_api, clock, max_attempts=5).drain(timeout=1)
+    assert (stats.sent, stats.retried) == (0, 1)
+    assert outbox_counts(conn) == {"pending": 1}
+
+    clock.sleep(3600)
+    stats = _worker(conn, bot_api, clock, max_attempts=3).drain(timeout=60)
+    assert stats.sent == 1
+    assert _statuses(conn) == [("sent", 3)]
+
+
+def test_send_telegram_message_splits_long_text_and_reports_failures(bot_api, monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "TOKEN")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "chat-a")
+    text = "\n".join("x" * 1000 for _ in range(6))
+
+    assert send_telegram_message(text, LOGGER, api_url=bot_api.url)
+    assert [len(body["text"]) for _, _, body in bot_api.requests] == [4003, 2001]
+    bot_api.script = [(400, {"ok": False, "description": "Bad Request: chat not found"})]
+    assert not send_telegram_message("hello", LOGGER, api_url=bot_api.url)
+
+    monkeypatch.delenv("TELEGRAM_CHAT_ID")
+    assert not send_telegram_message("hello", LOGGER, api_url=bot_api.url)
+    assert len(bot_api.requests) == 3
+
+
+def test_digests_send_changed_sections_to_subscribed_chats(tmp_path):
+    config = AppConfig(
+        storage=StorageConfig(db_path=tmp_path / "db.sqlite", reports_dir=tmp_path),
+        feeds=[],
+        delivery=DeliveryConfig(telegram=TelegramConfig(enabled=True, digests=True)),
+    )
+    items = [
+        {"category": category, "source": "S", "title": f"{category} story", "link": "https://x"}
+        for category in ("Business", "Science", "Tech")
+    ]
+    report = update_report(items, date(2024, 1, 2), 10, tmp_path / "2024-01-02.md", {})
+    chats = [TelegramChat("all"), TelegramChat("tech", ["Tech"]), TelegramChat("sport", ["Sport"])]
+
+    messages = _telegram_messages(config, chats, report, date(2024, 1, 2), 3)
+
+    assert [chat_id for chat_id, _ in messages] == ["all", "tech"]
+    assert messages[0][1].startswith("Daily Brief — 2024-01-02\n\n## Business\n")
+    assert "Science story" in messages[0][1] and "Tech story" in messages[0][1]
+    assert "Tech story" in messages[1][1] and "Business" not in messages[1][1]
@@ -0,0 +1,360 @@
+import argparse
+import logging
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+import yaml
+
+from daily_brief_agent.cli import main
+from daily_brief_agent.commands import serve
+from daily_brief_agent.config import load_config
+from daily_brief_agent.db import (
+    compress_summary,
+    init_db,
+    insert_items,
+    query_items_for_date,
+    query_report_rows,
+    search_items,
+)
+from daily_brief_agent.dedup import NearDuplicateIndex
+from daily_brief_agent.partitions import (
+    MAX_ATTACHED,
+    attach_partitions,
+    detach_partitions,
+    insert_partitioned_items,
+    migrate_to_partitions,
+    months_between,
+    open_partition,
+    published_months,
+    stored_months,
+)
+
+START = datetime(2024, 1, 31, 12, tzinfo=timezone.utc)
+END = datetime(2024, 2, 1, 12, tzinfo=timezone.utc)
+
+
+def _items() -> list[dict]:
+    items = []
+    for index in range(48):
+        # Hourly from 2024-01-31 00:00 UTC into February.
+        day, hour = 31 + index // 24, index % 24
+        fetched_at = f"2024-01-31T{hour:02d}" if day == 31 else f"2024-02-01T{hour:02d}"
+        items.append(
+            {
+                "id": f"id-{index}",
+                "fetched_at_utc": f"{fetched_at}:00:00+00:00",
+                "published_raw": None,
+                "category": ["Tech", "Business"][index % 2],
+                "source": ["Alpha", "Beta", "Gamma"][index % 3],
+                "title": f"Story number {index}",
+                "link": f"https://example.com/{index}",
+                "summary_raw": f"<p>Summary of story {index} about chips</p>",
+                "title_simhash": index * 0x9E3779B97F4A7C15 % 2**63,
+            }
+        )
+    # A near-duplicate of id-20 fetched after midnight, in the next month's file.
+    items.append(
+        {
+            **items[20],
+            "id": "dup-20",
+            "fetched_at_utc": "2024-02-01T01:30:00+00:00",
+            "source": "Delta",
+            "link": "https://example.com/dup-20",
+        }
+    )
+    return items
+
+
+def _rows(conn: sqlite3.Connection) -> list[dict]:
+    return [dict(row) for row in query_report_rows(conn, START, END, False, 30)]
+
+
+def test_items_are_split_by_month_and_deduplicated_globally(tmp_path):
+    conn = sqlite3.connect(tmp_path / "main.sqlite")
+    init_db(conn)
+    partitions_dir = tmp_path / "partitions"
+    near = NearDuplicateIndex()
+
+    assert insert_partitioned_items(conn, partitions_dir, _items(), near) == 49
+
+    assert stored_months(partitions_dir) == ["2024-01", "2024-02"]
+    assert conn.execute("SELECT COUNT(*) FROM main.items").fetchone()[0] == 0
+    months = dict(conn.execute("SELECT month, COUNT(*) FROM item_ids GROUP BY month"))
+    assert months == {"2024-01": 24, "2024-02": 25}
+    february = open_partition(partitions_dir, "2024-02")
+    duplicate = february.execute("SELECT duplicate_of FROM items WHERE id = 'dup-20'").fetchone()
+    assert duplicate == ("id-20",)
+    february.close()
+
+    # Seen IDs are rejected from the global index alone, without opening partitions.
+    detach_partitions(conn)
+    assert insert_partitioned_items(conn, partitions_dir, _items(), near) == 0
+
+
+def test_partitioned_reads_match_a_single_database(tmp_path):
+    single = sqlite3.connect(":memory:")
+    init_db(single)
+    insert_items(single, _items(), NearDuplicateIndex())
+    partitioned = sqlite3.connect(tmp_path / "main.sqlite")
+    init_db(partitioned)
+    partitions_dir = tmp_path / "partitions"
+    insert_partitioned_items(partitioned, partitions_dir, _items(), NearDuplicateIndex())
+
+    assert attach_partitions(partitioned, partitions_dir, months_between(START, END)) == [
+        "2024-01",
+        "2024-02",
+    ]
+
+    rows = _rows(partitioned)
+    assert rows == _rows(single)
+    assert any(row["other_sources"] == "Delta" for row in rows)
+    assert [dict(row) for row in query_items_for_date(partitioned, START, END, False)] == [
+        dict(row) for row in query_items_for_date(single, START, END, False)
+    ]
+
+
+def test_migration_moves_items_into_partitions(tmp_path):
+    conn = sqlite3.connect(tmp_path / "main.sqlite")
+    init_db(conn)
+    insert_items(conn, _items(), NearDuplicateIndex())
+    conn.execute(
+        "UPDATE items SET summary_raw = ? WHERE id = 'id-3'",
+        (compress_summary("<p>Summary of story 3 about chips</p>"),),
+    )
+    conn.commit()
+    before = _rows(conn)
+
+    moved = migrate_to_partitions(conn, tmp_path / "partitions")
+
+    assert moved == {"2024-01": 24, "2024-02": 25}
+    assert conn.execute("SELECT COUNT(*) FROM main.items").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM title_simhash_bands").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM item_ids").fetchone()[0] == 49
+    assert migrate_to_partitions(conn, tmp_path / "partitions") == {}
+
+    attach_partitions(conn, tmp_path / "partitions", ["2024-01", "2024-02"])
+    assert _rows(conn) == before
+    january = open_partition(tmp_path / "partitions", "2024-01")
+    assert [row["id"] for row in search_items(january, "story 3 chips")] == ["id-3"]
+    bands = january.execute("SELECT COUNT(DISTINCT item_id) FROM title_simhash_bands")
+    assert bands.fetchone()[0] == 24
+    january.close()
+
+
+def test_cli_partitions_and_backfills_from_partitions(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    settings = {
+        "storage": {
+            "db_path": str(tmp_path / "brief.sqlite"),
+            "reports_dir": str(tmp_path / "single"),
+        },
+        "feeds": [{"name": "Feed", "url": "https://example.com/rss", "category": "T"}],
+        "delivery": {"telegram": {"enabled": False}},
+        "timezone": "America/New_York",
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+    conn = sqlite3.connect(tmp_path / "brief.sqlite")
+    init_db(conn)
+    insert_items(conn, _items(), NearDuplicateIndex())
+    conn.close()
+    backfill = ["--config", str(config_path), "--from", "2024-01-30", "--to", "2024-02-02"]
+    main(backfill)
+
+    settings["storage"]["partitions_dir"] = str(tmp_path / "partitions")
+    settings["storage"]["reports_dir"] = str(tmp_path / "partitioned")
+    config_path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+    main(["partition", "--config", str(config_path)])
+    main([*backfill, "--jobs", "1"])
+
+    for day in ("2024-01-30", "2024-01-31", "2024-02-01", "2024-02-02"):
+        single = (tmp_path / "single" / f"{day}.md").read_text(encoding="utf-8")
+        assert (tmp_path / "partitioned" / f"{day}.md").read_text(encoding="utf-8") == single
+    report = (tmp_path / "partitioned" / "2024-01-31.md").read_text(encoding="utf-8")
+    assert "Story number 10" in report and "Delta" in report
+    assert stored_months(tmp_path / "partitions") == ["2024-01", "2024-02"]
+
+
+def test_reports_by_publish_date_find_items_fetched_months_later(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    partitions_dir = tmp_path / "partitions"
+    settings = {
+        "storage": {
+            "db_path": str(tmp_path / "brief.sqlite"),
+            "reports_dir": str(tmp_path / "reports"),
+            "partitions_dir": str(partitions_dir),
+        },
+        "feeds": [{"name": "Feed", "url": "https://example.com/rss", "category": "T"}],
+        "delivery": {"telegram": {"enabled": False}},
+        "report": {"date_field": "published"},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+    conn = sqlite3.connect(tmp_path / "brief.sqlite")
+    init_db(conn)
+    late = {
+        **_items()[0],
+        "id": "late",
+        "title": "Fetched in April",
+        "fetched_at_utc": "2024-04-02T08:00:00+00:00",
+        "published_raw": "2024-01-31T13:00:00+00:00",
+    }
+    insert_partitioned_items(conn, partitions_dir, [*_items(), late])
+    april = (datetime(2024, 4, 1, tzinfo=timezone.utc), datetime(2024, 4, 30, tzinfo=timezone.utc))
+    assert published_months(conn, partitions_dir, START, END) == ["2024-04"]
+    assert published_months(conn, partitions_dir, *april) == []
+    # Months stored before their range was recorded are measured on first use.
+    conn.execute("DELETE FROM partition_published")
+    conn.commit()
+    assert published_months(conn, partitions_dir, START, END) == ["2024-04"]
+    conn.close()
+
+    main(["--config", str(config_path), "--from", "2024-01-31", "--to", "2024-01-31"])
+
+    report = (tmp_path / "reports" / "2024-01-31.md").read_text(encoding="utf-8")
+    assert "Fetched in April" in report and "Story number 10" in report
+
+
+def _monthly_items(months: int, published: str) -> list[dict]:
+    """One item published in each month it was fetched, and one published on ``published``."""
+    items = []
+    for number in range(1, months + 1):
+        month = f"{2023 + (number - 1) // 12:04d}-{(number - 1) % 12 + 1:02d}"
+        for kind, published_raw in (("new", f"{month}-10T09:00:00+00:00"), ("old", published)):
+            items.append(
+                {
+                    **_items()[0],
+                    "id": f"{kind}-{month}",
+                    "title": f"{kind.title()} story fetched in {month}",
+                    "link": f"https://example.com/{kind}-{month}",
+                    "fetched_at_utc": f"{month}-20T08:00:00+00:00",
+                    "published_raw": published_raw,
+                }
+            )
+    return items
+
+
+def _published_config(tmp_path, **sections) -> tuple[list[str], sqlite3.Connection]:
+    settings = {
+        "storage": {
+            "db_path": str(tmp_path / "brief.sqlite"),
+            "reports_dir": str(tmp_path / "reports"),
+            "partitions_dir": str(tmp_path / "partitions"),
+        },
+        # Nothing listens on the discard port: fetches fail at once.
+        "feeds": [{"name": "Feed", "url": "http://127.0.0.1:9/rss", "category": "T"}],
+        "delivery": {"telegram": {"enabled": False}},
+        "report": {"date_field": "published"},
+        **sections,
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+    conn = sqlite3.connect(tmp_path / "brief.sqlite")
+    init_db(conn)
+    return ["--config", str(config_path)], conn
+
+
+def test_publish_ranges_spanning_the_report_do_not_attach_every_month(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    config_args, conn = _published_config(tmp_path)
+    # Every month's publish range reaches back over January 2023.
+    insert_partitioned_items(
+        conn, tmp_path / "partitions", _monthly_items(MAX_ATTACHED + 2, "2022-12-15T09:00:00+00:00")
+    )
+    start = datetime(2023, 1, 10, tzinfo=timezone.utc)
+    end = datetime(2023, 1, 11, 23, 59, 59, tzinfo=timezone.utc)
+    assert published_months(conn, tmp_path / "partitions", start, end) == ["2023-01"]
+    conn.close()
+
+    main([*config_args, "--from", "2023-01-10", "--to", "2023-01-11", "--jobs", "1"])
+
+    report = (tmp_path / "reports" / "2023-01-10.md").read_text(encoding="utf-8")
+    assert "New story fetched in 2023-01" in report
+
+
+def test_backfill_by_publish_date_fails_cleanly_past_the_attach_limit(
+    tmp_path, monkeypatch, caplog
+):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    config_args, conn = _published_config(tmp_path)
+    # Every month holds a story published on the backfilled day.
+    insert_partitioned_items(
+        conn, tmp_path / "partitions", _monthly_items(MAX_ATTACHED + 2, "2023-01-10T09:00:00+00:00")
+    )
+    conn.close()
+
+    with caplog.at_level(logging.ERROR), pytest.raises(SystemExit) as exited:
+        main([*config_args, "--from", "2023-01-10", "--to", "2023-01-10", "--jobs", "1"])
+
+    assert exited.value.code == 1
+    [record] = caplog.records
+    assert "Backfill from 2023-01-10 to 2023-01-10 failed" in record.getMessage()
+    assert f"{MAX_ATTACHED + 2} monthly partitions" in record.getMessage()
+
+
+def test_run_records_its_metrics_when_the_report_outgrows_the_attach_limit(
+    tmp_path, monkeypatch, caplog
+):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    config_args, conn = _published_config(tmp_path, metrics={"enabled": True})
+    insert_partitioned_items(
+        conn, tmp_path / "partitions", _monthly_items(MAX_ATTACHED + 2, "2023-01-10T09:00:00+00:00")
+    )
+    conn.close()
+
+    with caplog.at_level(logging.ERROR), pytest.raises(SystemExit) as exited:
+        main([*config_args, "--date", "2023-01-10"])
+
+    assert exited.value.code == 1
+    [record] = [record for record in caplog.records if "not written" in record.getMessage()]
+    assert "Report for 2023-01-10 not written" in record.getMessage()
+    assert not (tmp_path / "reports").exists()
+    conn = sqlite3.connect(tmp_path / "brief.sqlite")
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone() == (1,)
+    conn.close()
+
+
+class _StopAfterFirstPoll:
+    def monotonic(self) -> float:
+        return 0.0
+
+    def sleep(self, seconds: float) -> None:
+        raise KeyboardInterrupt
+
+
+def test_serve_keeps_running_when_history_outgrows_the_attach_limit(
+    tmp_path, monkeypatch, caplog
+):
+    partitions_dir = tmp_path / "partitions"
+    settings = {
+        "storage": {
+            "db_path": str(tmp_path / "brief.sqlite"),
+            "reports_dir": str(tmp_path / "reports"),
+            "partitions_dir": str(partitions_dir),
+        },
+        "feeds": [{"name": "Feed", "url": "https://example.com/rss", "category": "T"}],
+        "delivery": {"telegram": {"enabled": False}},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+    config = load_config(config_path, cache_dir=tmp_path / "cache")
+    # A month arrived after serve checked the limit at startup.
+    for number in range(1, MAX_ATTACHED + 2):
+        open_partition(partitions_dir, f"2023-{number:02d}").close()
+    monkeypatch.setattr(serve, "poll_due_feeds", lambda *args: 1)
+    args = argparse.Namespace(
+        min_interval=60,
+        max_interval=3600,
+        max_per_feed=50,
+        include_history=True,
+        per_category_limit=30,
+    )
+
+    with caplog.at_level(logging.ERROR):
+        serve.serve(args, config, logging.getLogger("test"), _StopAfterFirstPoll())
+
+    [record] = caplog.records
+    assert "not written" in record.getMessage()
+    assert f"{MAX_ATTACHED + 1} monthly partitions" in record.getMessage()
+    assert not (tmp_path / "reports").exists()
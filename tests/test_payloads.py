@@ -0,0 +1,128 @@
+import sqlite3
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import yaml
+
+from daily_brief_agent.cli import main
+from daily_brief_agent.config import FeedConfig
+from daily_brief_agent.fetchers.rss import FeedDownload
+from daily_brief_agent.payloads import PayloadArchive, read_payload
+from daily_brief_agent.utils.hashing import sha256_bytes_hex
+
+WIRE = FeedConfig(name="Wire", url="https://a.example/rss", category="Tech")
+MIRROR = FeedConfig(name="Mirror", url="https://b.example/rss", category="World")
+
+
+def _rss(tag: str, count: int) -> bytes:
+    entries = "".join(
+        f"<item><title>{tag} story {index}</title>"
+        f"<link>https://example.com/{tag}/{index}</link></item>"
+        for index in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{entries}</channel></rss>'.encode()
+
+
+def _download(body: bytes) -> FeedDownload:
+    return FeedDownload(body, "application/rss+xml", WIRE.url, None, None, sha256_bytes_hex(body))
+
+
+def test_archive_stores_each_body_once_and_evicts_least_recently_used(tmp_path):
+    first, second, third = _rss("a", 20), _rss("b", 20), _rss("c", 2)
+    archive = PayloadArchive(tmp_path, max_bytes=1_000_000)
+    assert archive.add(WIRE, _download(first), "2024-01-01T08:00:00+00:00")
+    assert not archive.add(MIRROR, _download(first), "2024-01-01T09:00:00+00:00")
+    assert archive.add(WIRE, _download(second), "2024-01-02T08:00:00+00:00")
+    assert (archive.stored, archive.reused) == (2, 1)
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 2
+    assert read_payload(tmp_path, sha256_bytes_hex(first)) == first
+
+    timeline = archive.fetches(feed_urls=[WIRE.url])
+    assert [fetch.fetched_at_utc[:10] for fetch in timeline] == ["2024-01-01", "2024-01-02"]
+    since = datetime(2024, 1, 1, 8, 30, tzinfo=timezone.utc)
+    assert [fetch.feed_name for fetch in archive.fetches(since_utc=since)] == ["Mirror", "Wire"]
+
+    # Replaying the first body makes the second the least recently used one.
+    archive.max_bytes = archive.total_bytes
+    archive.touch([sha256_bytes_hex(first)], datetime(2024, 1, 3, tzinfo=timezone.utc))
+    archive.add(WIRE, _download(third), "2024-01-03T08:00:00+00:00")
+    assert archive.evicted == 1
+    assert archive.total_bytes <= archive.max_bytes
+    stored = {path.name[: -len(".gz")] for path in (tmp_path / "objects").rglob("*.gz")}
+    assert stored == {sha256_bytes_hex(first), sha256_bytes_hex(third)}
+    assert sha256_bytes_hex(second) not in {fetch.content_hash for fetch in archive.fetches()}
+    archive.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    body = b""
+    requests: Counter = Counter()
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        self.requests[self.path] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        return
+
+
+@pytest.fixture()
+def http_handler():
+    _Handler.requests = Counter()
+    return _Handler
+
+
+def _write_config(path, db_path, payloads_dir, base_url, parse_workers):
+    settings = {
+        "storage": {
+            "db_path": str(db_path),
+            "reports_dir": str(path.parent / "reports"),
+            "payloads_dir": str(payloads_dir),
+        },
+        "feeds": [{"name": "Wire", "url": f"{base_url}/wire", "category": "Tech"}],
+        "delivery": {"telegram": {"enabled": False}},
+        "fetch": {"parse_workers": parse_workers},
+    }
+    path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+    return ["--config", str(path)]
+
+
+def _stored(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT id, source, title, excerpt, fetched_at_utc FROM items ORDER BY id"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_replay_rebuilds_items_from_archived_bodies_without_fetching(
+    tmp_path, base_url, monkeypatch
+):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    payloads_dir = tmp_path / "payloads"
+    live = _write_config(
+        tmp_path / "live.yaml", tmp_path / "live.sqlite", payloads_dir, base_url, 0
+    )
+    for body in (_rss("a", 3), _rss("a", 5), _rss("a", 5)):
+        _Handler.body = body
+        main(live)
+    assert _Handler.requests["/wire"] == 3
+    # The unchanged third response was not archived again.
+    assert len(list((payloads_dir / "objects").rglob("*.gz"))) == 2
+
+    rebuilt = _write_config(
+        tmp_path / "rebuilt.yaml", tmp_path / "rebuilt.sqlite", payloads_dir, base_url, 2
+    )
+    main([*rebuilt, "replay"])
+    assert _Handler.requests["/wire"] == 3
+    expected = _stored(tmp_path / "live.sqlite")
+    assert len(expected) == 5
+    # Items keep the time they were first fetched.
+    assert len({row[-1] for row in expected}) == 2
+    assert _stored(tmp_path / "rebuilt.sqlite") == expected
@@ -0,0 +1,178 @@
+import logging
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import yaml
+
+from daily_brief_agent import cli
+from daily_brief_agent.commands.common import open_db
+from daily_brief_agent.commands.serve import poll_due_feeds
+from daily_brief_agent.config import FeedConfig, FetchConfig, load_config
+from daily_brief_agent.db import init_db, insert_items
+from daily_brief_agent.metrics import RunMetrics
+from daily_brief_agent.pipeline import ParseOptions, ingest_feeds
+from daily_brief_agent.scheduler import AdaptiveScheduler, SystemClock
+
+logger = logging.getLogger("test")
+RELEASE = threading.Event()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802 - http.server API
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == "/hung":
+            RELEASE.wait(5)
+        name = self.path.strip("/")
+        entries = "".join(
+            f"<item><title>{name} story {index}</title>"
+            f"<link>https://example.com/{name}/{index}</link></item>"
+            for index in range(5)
+        )
+        body = f'<?xml version="1.0"?><rss version="2.0"><channel>{entries}</channel></rss>'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", f'"{name}"')
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        return
+
+
+@pytest.fixture()
+def http_handler():
+    RELEASE.clear()
+    yield _Handler
+    RELEASE.set()
+
+
+def _feeds(base_url: str, *names: str) -> list[FeedConfig]:
+    return [FeedConfig(name=name, url=f"{base_url}/{name}", category="Tech") for name in names]
+
+
+def _store(db_path):
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    init_db(conn)
+    batches = []
+
+    def store(items):
+        batches.append(len(items))
+        return insert_items(conn, items)
+
+    return conn, store, batches
+
+
+@pytest.mark.parametrize("parse_workers", [0, 2])
+def test_pipeline_stores_every_feed_in_batches_and_skips_failures(
+    tmp_path, base_url, caplog, parse_workers
+):
+    conn, store, batches = _store(tmp_path / "brief.sqlite")
+    feeds = _feeds(base_url, *(f"feed{index}" for index in range(8)), "missing")
+    fetch = FetchConfig(
+        concurrency=4, parse_workers=parse_workers, queue_size=1, write_batch_size=12
+    )
+    metrics = RunMetrics()
+    options = ParseOptions(max_entries=50, seen_dbs=(str(tmp_path / "brief.sqlite"),))
+
+    with caplog.at_level(logging.INFO):
+        result = ingest_feeds(
+            feeds, {}, store, fetch, options, "2024-01-02T08:00:00+00:00", logger, metrics
+        )
+
+    assert result.inserted == result.items == 40
+    assert conn.execute("SELECT COUNT(DISTINCT source) FROM items").fetchone() == (8,)
+    assert sum(batches) == 40 and max(batches) < 12 + 5
+    assert sorted(result.states) == sorted(feed.url for feed in feeds[:-1])
+    assert "Failed to fetch feed missing: 404" in caplog.text
+    stages = result.stages
+    assert stages["download"].processed == 9
+    assert stages["parse"].processed == 8
+    assert stages["write"].processed == 40
+    assert {feed.feed: feed.new_items for feed in metrics.feeds}["feed3"] == 5
+
+    # Everything is stored now, so the incremental parse skips every entry.
+    with caplog.at_level(logging.INFO):
+        again = ingest_feeds(
+            feeds[:2], {}, store, fetch, options, "2024-01-02T09:00:00+00:00", logger
+        )
+    assert again.items == again.inserted == 0
+    assert "Feed feed0: 0 new, 5 already seen." in caplog.text
+
+
+def test_pipeline_run_timeout_skips_unfinished_downloads(tmp_path, base_url, caplog):
+    _, store, _ = _store(tmp_path / "brief.sqlite")
+    fetch = FetchConfig(concurrency=2, parse_workers=0, run_timeout=0.5)
+
+    with caplog.at_level(logging.ERROR):
+        result = ingest_feeds(
+            _feeds(base_url, "hung", "quick"),
+            {},
+            store,
+            fetch,
+            ParseOptions(max_entries=50),
+            "2024-01-02T08:00:00+00:00",
+            logger,
+        )
+
+    assert result.inserted == 5
+    assert list(result.states) == [f"{base_url}/quick"]
+    assert "hung: run timeout exceeded" in caplog.text
+
+
+def test_pipeline_writer_failure_is_raised_after_draining(tmp_path, base_url):
+    def store(items):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    fetch = FetchConfig(parse_workers=0, queue_size=1, write_batch_size=1)
+    with pytest.raises(sqlite3.OperationalError, match="disk I/O"):
+        ingest_feeds(
+            _feeds(base_url, *(f"feed{index}" for index in range(6))),
+            {},
+            store,
+            fetch,
+            ParseOptions(max_entries=50),
+            "2024-01-02T08:00:00+00:00",
+            logger,
+        )
+
+
+def test_serve_polls_and_dry_runs_ingest_through_the_pipeline(
+    tmp_path, base_url, monkeypatch, capsys
+):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    settings = {
+        "storage": {
+            "db_path": str(tmp_path / "brief.sqlite"),
+            "reports_dir": str(tmp_path / "reports"),
+        },
+        "feeds": [
+            {"name": feed.name, "url": feed.url, "category": feed.category}
+            for feed in _feeds(base_url, "feed0", "feed1", "missing")
+        ],
+        "delivery": {"telegram": {"enabled": False}},
+        "fetch": {"parse_workers": 0, "write_batch_size": 3},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+
+    cli.main(["--config", str(config_path), "--dry-run"])
+    assert "feed1 story 4" in capsys.readouterr().out
+    assert not (tmp_path / "brief.sqlite").exists()
+
+    config = load_config(config_path)
+    conn = open_db(config)
+    scheduler = AdaptiveScheduler(config.feeds, SystemClock())
+    feed_states: dict = {}
+    inserted = poll_due_feeds(conn, config, scheduler, feed_states, 50, logger)
+
+    assert inserted == 10
+    assert sorted(feed_states) == [f"{base_url}/feed0", f"{base_url}/feed1"]
+    feed0, _, missing = config.feeds
+    assert scheduler.schedule_for(feed0).last_polled is not None
+    assert scheduler.schedule_for(missing).failures == 1
+    conn.close()
@@ -0,0 +1,98 @@
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import yaml
+
+from daily_brief_agent.cli import main
+
+FEEDS = {
+    "/shared": [("Shared story", "https://example.com/shared")],
+    "/only-a": [("Story for A", "https://example.com/a")],
+    "/only-b": [("Story for B", "https://example.com/b")],
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests: Counter = Counter()
+    conditional: Counter = Counter()
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        self.requests[self.path] += 1
+        if self.headers.get("If-None-Match") == f'"{self.path}"':
+            self.conditional[self.path] += 1
+        entries = "".join(
+            f"<item><title>{title}</title><link>{link}</link></item>"
+            for title, link in FEEDS[self.path]
+        )
+        body = f'<?xml version="1.0"?><rss version="2.0"><channel>{entries}</channel></rss>'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", f'"{self.path}"')
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        return
+
+
+@pytest.fixture()
+def http_handler():
+    _Handler.requests = Counter()
+    _Handler.conditional = Counter()
+    return _Handler
+
+
+def _write_profile(path, root, base_url, feeds):
+    settings = {
+        "storage": {"db_path": str(root / "brief.sqlite"), "reports_dir": str(root / "reports")},
+        "feeds": [
+            {"name": name, "url": base_url + feed_path, "category": category}
+            for name, feed_path, category in feeds
+        ],
+        "delivery": {"telegram": {"enabled": False}},
+    }
+    path.write_text(yaml.safe_dump(settings), encoding="utf-8")
+
+
+def _reports(root):
+    return {path.name: path.read_text(encoding="utf-8") for path in (root / "reports").iterdir()}
+
+
+def test_profiles_share_one_fetch_and_match_separate_runs(tmp_path, base_url, monkeypatch):
+    monkeypatch.setenv("DAILY_BRIEF_AGENT_CACHE_DIR", str(tmp_path / "cache"))
+    feeds_a = [("Wire", "/shared", "World"), ("Alpha", "/only-a", "Tech")]
+    # The same URL under another name and category in the second profile.
+    feeds_b = [("Newswire", "/shared", "News"), ("Beta", "/only-b", "Tech")]
+    profiles = tmp_path / "profiles"
+    profiles.mkdir()
+    for name, feeds in (("a", feeds_a), ("b", feeds_b)):
+        _write_profile(tmp_path / f"{name}.yaml", tmp_path / "separate" / name, base_url, feeds)
+        _write_profile(profiles / f"{name}.yaml", tmp_path / "shared" / name, base_url, feeds)
+
+    main(["--config", str(tmp_path / "a.yaml")])
+    main(["--config", str(tmp_path / "b.yaml")])
+    _Handler.requests.clear()
+    _Handler.conditional.clear()
+    main(["--config", str(profiles)])
+
+    assert _Handler.requests == {"/shared": 1, "/only-a": 1, "/only-b": 1}
+    for name in ("a", "b"):
+        reports = _reports(tmp_path / "shared" / name)
+        assert reports == _reports(tmp_path / "separate" / name)
+    report_b = "".join(_reports(tmp_path / "shared" / "b").values())
+    assert "## News" in report_b and "(Newswire)" in report_b and "(Wire)" not in report_b
+
+    # Both profiles stored the shared validators, so the next run can send them.
+    main(["--config", str(profiles / "a.yaml"), "--config", str(profiles / "b.yaml")])
+    assert _Handler.requests == {"/shared": 2, "/only-a": 2, "/only-b": 2}
+    assert _Handler.conditional == {"/shared": 1, "/only-a": 1, "/only-b": 1}
+
+
+def test_several_configs_are_rejected_outside_fetch_runs(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["search", "chips", "--config", "a.yaml", "--config", "b.yaml"])
+    with pytest.raises(SystemExit):
+        main(["--config", "a.yaml", "--config", "b.yaml", "--dry-run"])
+    with pytest.raises(SystemExit):
+        main(["--config", str(tmp_path)])
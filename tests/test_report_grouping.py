@@ -1,6 +1,7 @@
+import io
 from datetime import date
 
-from daily_brief_agent.reporting.markdown import generate_report
+from daily_brief_agent.reporting.markdown import generate_report, report_sort_key, write_report
 
 
 def test_report_grouping_order():
@@ -43,3 +44,24 @@ def test_report_grouping_order():
             tech_section.append(line)
 
     assert "Alpha Tech" in tech_section[0]
+
+
+def test_streamed_report_matches_generated_report():
+    items = [
+        {
+            "category": category,
+            "source": source,
+            "title": f"{category}-{source}-{index}",
+            "link": f"https://example.com/{category}/{source}/{index}",
+            "published_raw": "2024-01-01" if index % 2 else None,
+        }
+        for category in ("Tech", "Business")
+        for source in ("Beta", "Alpha")
+        for index in range(3)
+    ]
+    expected = generate_report(items, date(2024, 1, 2), per_category_limit=4)
+
+    out = io.StringIO()
+    write_report(sorted(items, key=report_sort_key), date(2024, 1, 2), 4, out)
+
+    assert out.getvalue() == expected
@@ -0,0 +1,105 @@
+import random
+import sqlite3
+from datetime import date, datetime, timezone
+
+from daily_brief_agent.db import (
+    init_db,
+    insert_items,
+    query_items_for_date,
+    query_report_rows,
+    query_report_rows_by_day,
+)
+from daily_brief_agent.reporting.markdown import generate_report
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = datetime(2024, 1, 1, 23, 59, 59, tzinfo=timezone.utc)
+
+
+def _populate(conn: sqlite3.Connection) -> None:
+    rng = random.Random(7)
+    items = []
+    for index in range(300):
+        day = "2024-01-01" if index % 3 else "2023-12-31"
+        items.append(
+            {
+                "id": f"id-{index}",
+                "fetched_at_utc": f"{day}T12:00:00+00:00",
+                "published_raw": rng.choice([None, "Mon, 01 Jan 2024"]),
+                "category": rng.choice(["Tech", "Business", "Science"]),
+                "source": rng.choice(["Alpha", "Beta", "Gamma"]),
+                "title": f"Title {rng.randrange(1000):04d}",
+                "link": f"https://example.com/{index}",
+                "summary_raw": None,
+            }
+        )
+    insert_items(conn, items)
+
+
+def test_report_rows_match_python_grouping():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    _populate(conn)
+
+    for include_history in (False, True):
+        all_rows = query_items_for_date(conn, START, END, include_history)
+        limited = list(
+            query_report_rows(conn, START, END, include_history, per_category_limit=7)
+        )
+
+        expected = generate_report([dict(row) for row in all_rows], date(2024, 1, 1), 7)
+        actual = generate_report([dict(row) for row in limited], date(2024, 1, 1), 7)
+        assert actual == expected
+        assert len(limited) == 21
+    conn.close()
+
+
+def test_report_rows_come_back_in_render_order():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    _populate(conn)
+
+    rows = list(query_report_rows(conn, START, END, True, per_category_limit=5))
+    keys = [(row["category"], row["source"], row["title"]) for row in rows]
+    conn.close()
+
+    assert keys == sorted(keys)
+    assert set(rows[0].keys()) == {
+        "category",
+        "source",
+        "title",
+        "link",
+        "published_raw",
+        "other_sources",
+    }
+
+
+def test_duplicate_titles_keep_insertion_order():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    links = ["https://example.com/z", "https://example.com/a", "https://example.com/m"]
+    insert_items(
+        conn,
+        [
+            {
+                "id": f"dup-{index}",
+                "fetched_at_utc": f"2024-01-01T0{index}:00:00+00:00",
+                "published_raw": ["Tue, 02 Jan 2024", None, "Mon, 01 Jan 2024"][index],
+                "category": "Tech",
+                "source": "Alpha",
+                "title": "Same headline",
+                "link": link,
+                "summary_raw": None,
+            }
+            for index, link in enumerate(links)
+        ],
+    )
+
+    rows = [dict(row) for row in query_report_rows(conn, START, END, False, 2)]
+    by_day = query_report_rows_by_day(conn, [("2024-01-01", START, END)], 2)
+    assert [row["link"] for row in rows] == links[:2]
+    assert [row["link"] for row in by_day] == links[:2]
+    # The order of the baseline's stable in-memory sort.
+    everything = [dict(row) for row in query_items_for_date(conn, START, END, False)]
+    expected = generate_report(everything, date(2024, 1, 1), 2)
+    assert generate_report(rows, date(2024, 1, 1), 2) == expected
+    conn.close()
@@ -0,0 +1,211 @@
+import sqlite3
+from datetime import datetime, timezone
+
+from daily_brief_agent.archive import iter_archive
+from daily_brief_agent.cli import _build_parser
+from daily_brief_agent.config import RetentionConfig, RetentionPolicy
+from daily_brief_agent.db import (
+    init_db,
+    insert_items,
+    query_items_for_date,
+    search_items,
+    upgrade_search_index,
+)
+from daily_brief_agent.retention import apply_retention, policy_for
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+SUMMARY = "<p>Quarterly earnings beat expectations as cloud revenue grew again.</p>" * 4
+
+
+def _item(item_id: str, fetched_at: str, **overrides) -> dict:
+    item = {
+        "id": item_id,
+        "fetched_at_utc": fetched_at,
+        "published_raw": None,
+        "category": "Business",
+        "source": "Wire",
+        "title": f"Earnings report {item_id}",
+        "link": f"https://example.com/{item_id}",
+        "summary_raw": SUMMARY,
+    }
+    item.update(overrides)
+    return item
+
+
+def _db() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    insert_items(
+        conn,
+        [
+            _item("old", "2024-01-15T08:00:00+00:00"),
+            _item("aging", "2024-05-01T08:00:00+00:00"),
+            _item("fresh", "2024-05-31T08:00:00+00:00"),
+            _item("tech-old", "2024-01-20T08:00:00+00:00", category="Tech", source="Blog"),
+        ],
+    )
+    return conn
+
+
+def _config(tmp_path, **overrides) -> RetentionConfig:
+    values = {
+        "policies": [
+            RetentionPolicy(compress_after_days=7, archive_after_days=90),
+            RetentionPolicy(category="Tech", compress_after_days=7),
+        ],
+        "archive_dir": tmp_path / "archive",
+    }
+    values.update(overrides)
+    return RetentionConfig(**values)
+
+
+def test_policy_precedence():
+    default = RetentionPolicy(archive_after_days=365)
+    tech = RetentionPolicy(category="Tech", archive_after_days=90)
+    blog = RetentionPolicy(source="Blog", archive_after_days=30)
+    tech_blog = RetentionPolicy(category="Tech", source="Blog", compress_after_days=1)
+    policies = [tech_blog, blog, tech, default]
+
+    assert policy_for(policies, "Tech", "Blog") is tech_blog
+    assert policy_for(policies, "Business", "Blog") is blog
+    assert policy_for(policies, "Tech", "Wire") is tech
+    assert policy_for(policies, "Business", "Wire") is default
+    assert policy_for([tech], "Business", "Wire") is None
+
+
+def test_compressed_summaries_read_back_transparently(tmp_path):
+    conn = _db()
+    config = _config(tmp_path, policies=[RetentionPolicy(compress_after_days=7)])
+
+    result = apply_retention(conn, config, NOW)
+
+    assert result.compressed == 3
+    types = dict(conn.execute("SELECT id, typeof(summary_raw) FROM items"))
+    assert types == {"old": "blob", "aging": "blob", "fresh": "text", "tech-old": "blob"}
+    rows = query_items_for_date(
+        conn,
+        datetime(2024, 1, 15, tzinfo=timezone.utc),
+        datetime(2024, 1, 16, tzinfo=timezone.utc),
+        include_history=False,
+        summary=True,
+    )
+    assert [row["summary_raw"] for row in rows] == [SUMMARY]
+    hits = search_items(conn, "revenue")
+    assert len(hits) == 4
+    assert all("[revenue]" in hit["snippet"] for hit in hits)
+    assert apply_retention(conn, config, NOW).compressed == 0
+
+
+def test_archived_items_leave_the_database_and_stay_queryable(tmp_path):
+    conn = _db()
+    config = _config(tmp_path)
+
+    preview = apply_retention(conn, config, NOW, dry_run=True)
+    assert (preview.archived, preview.compressed) == (1, 2)
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 4
+
+    result = apply_retention(conn, config, NOW)
+
+    assert (result.archived, result.compressed) == (1, 2)
+    assert [path.name for path in result.archive_files] == [
+        "items-2024-01-20240601T000000Z.ndjson.gz"
+    ]
+    stored = {row[0] for row in conn.execute("SELECT id FROM items")}
+    assert stored == {"aging", "fresh", "tech-old"}
+    assert {hit["id"] for hit in search_items(conn, "earnings")} == stored
+
+    archived = list(iter_archive(config.archive_dir, contains="CLOUD REVENUE"))
+    assert [item["id"] for item in archived] == ["old"]
+    assert archived[0]["summary_raw"] == SUMMARY
+    since = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    assert list(iter_archive(config.archive_dir, since_utc=since)) == []
+    assert list(iter_archive(config.archive_dir, category="Tech")) == []
+
+    # A feed still listing the archived item does not bring it back.
+    assert insert_items(conn, [_item("old", "2024-06-01T08:00:00+00:00")]) == 0
+
+
+def test_upgrade_moves_old_search_index_onto_view():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    conn.execute("DROP TABLE items_fts")
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE items_fts USING fts5 (
+            title, summary_raw, content = 'items', content_rowid = 'rowid'
+        )
+        """
+    )
+    insert_items(conn, [_item("old", "2024-01-15T08:00:00+00:00")])
+
+    assert upgrade_search_index(conn)
+    assert not upgrade_search_index(conn)
+    assert [hit["id"] for hit in search_items(conn, "earnings")] == ["old"]
+
+
+def test_retention_converts_and_shrinks_file_database(tmp_path):
+    conn = sqlite3.connect(tmp_path / "items.sqlite")
+    init_db(conn)
+    conn.execute("PRAGMA auto_vacuum = NONE")
+    conn.execute("VACUUM")
+    insert_items(
+        conn,
+        [
+            _item(f"item-{index}", f"2024-01-{1 + index % 28:02d}T08:00:00+00:00")
+            for index in range(500)
+        ]
+        + [_item("fresh", "2024-05-31T08:00:00+00:00")],
+    )
+    before = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    result = apply_retention(conn, _config(tmp_path), NOW)
+
+    assert result.archived == 500
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert conn.execute("PRAGMA page_count").fetchone()[0] < before
+    assert result.size_after < result.size_before
+    assert [hit["id"] for hit in search_items(conn, "earnings")] == ["fresh"]
+    assert len(list(iter_archive(tmp_path / "archive"))) == 500
+
+
+def test_incremental_vacuum_returns_free_pages(tmp_path):
+    conn = sqlite3.connect(tmp_path / "items.sqlite")
+    init_db(conn)
+    insert_items(
+        conn, [_item(f"item-{index}", "2024-01-02T08:00:00+00:00") for index in range(500)]
+    )
+    before = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    result = apply_retention(conn, _config(tmp_path), NOW)
+
+    assert result.pages_freed > 0
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert conn.execute("PRAGMA page_count").fetchone()[0] < before
+
+
+def test_dry_run_flag_is_honoured_before_or_after_the_subcommand():
+    parser = _build_parser()
+    assert parser.parse_args(["--dry-run", "retention"]).dry_run
+    assert parser.parse_args(["retention", "--dry-run"]).dry_run
+    assert not parser.parse_args(["retention"]).dry_run
+
+
+def test_plain_sqlite_connections_can_write_items(tmp_path):
+    db_path = tmp_path / "brief.sqlite"
+    conn = sqlite3.connect(db_path)
+    init_db(conn)
+    insert_items(conn, [_item("old", "2024-01-15T08:00:00+00:00")])
+    apply_retention(conn, _config(tmp_path, policies=[RetentionPolicy(compress_after_days=7)]), NOW)
+    conn.close()
+
+    # No package functions registered, as in the sqlite3 shell or an ad-hoc script.
+    plain = sqlite3.connect(db_path)
+    with plain:
+        plain.execute(
+            "INSERT INTO items (id, fetched_at_utc, category, source, title, link, summary_raw) "
+            "VALUES ('manual', '2024-06-01T00:00:00+00:00', 'Tech', 'Wire', 'Manual', 'x', 'y')"
+        )
+        plain.execute("UPDATE items SET title = 'Renamed' WHERE id = 'old'")
+        plain.execute("DELETE FROM items WHERE id = 'old'")
+        plain.execute("INSERT INTO items_fts (items_fts) VALUES ('integrity-check')")
+    plain.close()
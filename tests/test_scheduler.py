@@ -0,0 +1,79 @@
+import pytest
+
+from daily_brief_agent.cli import _build_parser, main
+from daily_brief_agent.config import FeedConfig
+from daily_brief_agent.scheduler import AdaptiveScheduler, Clock
+
+BUSY = FeedConfig(name="Busy", url="https://busy.example/rss", category="Tech")
+QUIET = FeedConfig(name="Quiet", url="https://quiet.example/rss", category="Tech")
+
+
+def _scheduler(clock: Clock) -> AdaptiveScheduler:
+    return AdaptiveScheduler([BUSY, QUIET], clock, min_interval=60, max_interval=3600)
+
+
+def test_all_feeds_are_due_at_start(clock):
+    assert _scheduler(clock).due() == [BUSY, QUIET]
+
+
+def test_busy_feed_polls_more_often_than_quiet_feed(clock):
+    scheduler = _scheduler(clock)
+
+    while clock.now < 20000:
+        for feed in scheduler.due():
+            scheduler.record_success(feed, new_items=5 if feed is BUSY else 0)
+        clock.sleep(scheduler.seconds_until_next())
+
+    busy = scheduler.schedule_for(BUSY)
+    quiet = scheduler.schedule_for(QUIET)
+    assert busy.interval == 60
+    assert quiet.interval == 3600
+
+
+def test_interval_tracks_observed_item_rate(clock):
+    scheduler = _scheduler(clock)
+
+    for _ in range(30):
+        scheduler.record_success(BUSY, new_items=1)
+        clock.sleep(180)
+
+    assert scheduler.schedule_for(BUSY).interval == pytest.approx(180, rel=0.05)
+
+
+def test_failures_back_off_exponentially_and_reset_on_success(clock):
+    scheduler = _scheduler(clock)
+
+    scheduler.record_failure(QUIET)
+    assert scheduler.schedule_for(QUIET).next_due == 120
+    scheduler.record_failure(QUIET)
+    assert scheduler.schedule_for(QUIET).next_due == 240
+    assert scheduler.due() == [BUSY]
+
+    clock.sleep(240)
+    scheduler.record_success(QUIET, new_items=1)
+    assert scheduler.schedule_for(QUIET).failures == 0
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--dry-run", "serve"],
+        ["--date", "2024-01-02", "serve"],
+        ["--no-telegram", "search", "chips"],
+        ["--per-category-limit", "5", "export"],
+    ],
+)
+def test_run_flags_are_rejected_with_subcommands_that_ignore_them(argv, capsys):
+    with pytest.raises(SystemExit):
+        main(argv)
+    assert "cannot be used with" in capsys.readouterr().err
+
+
+def test_serve_reads_report_flags_on_either_side():
+    parser = _build_parser()
+    for argv in (
+        ["serve", "--max-per-feed", "5", "--per-category-limit", "7", "--include-history"],
+        ["--max-per-feed", "5", "--per-category-limit", "7", "--include-history", "serve"],
+    ):
+        args = parser.parse_args(argv)
+        assert (args.max_per_feed, args.per_category_limit, args.include_history) == (5, 7, True)
@@ -0,0 +1,84 @@
+import sqlite3
+from datetime import datetime, timezone
+
+from daily_brief_agent.db import init_db, insert_items, rebuild_search_index, search_items
+
+
+def _item(item_id: str, title: str, summary: str, **overrides) -> dict:
+    item = {
+        "id": item_id,
+        "fetched_at_utc": "2024-01-02T08:00:00+00:00",
+        "published_raw": None,
+        "category": "Tech",
+        "source": "Wire",
+        "title": title,
+        "link": f"https://example.com/{item_id}",
+        "summary_raw": summary,
+    }
+    item.update(overrides)
+    return item
+
+
+def _db() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    insert_items(
+        conn,
+        [
+            _item("a", "Rust toolchain update", "<p>Compiler improvements for python users</p>"),
+            _item("b", "Python 3.13 released", "<p>The new release ships a JIT</p>"),
+            _item(
+                "c",
+                "Café owners adopt Python",
+                "Point of sale scripts",
+                category="Business",
+                source="Daily",
+                fetched_at_utc="2024-03-01T08:00:00+00:00",
+            ),
+        ],
+    )
+    return conn
+
+
+def test_search_ranks_title_matches_first_with_snippets():
+    rows = search_items(_db(), "python")
+
+    assert [row["id"] for row in rows][-1] == "a"
+    assert {row["id"] for row in rows} == {"a", "b", "c"}
+    assert "[Python]" in rows[0]["snippet"]
+
+
+def test_search_filters_and_query_syntax():
+    conn = _db()
+
+    assert [row["id"] for row in search_items(conn, "python", category="Business")] == ["c"]
+    assert [row["id"] for row in search_items(conn, "python", source="Wire", limit=1)] == ["b"]
+    since = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    assert [row["id"] for row in search_items(conn, "python", since_utc=since)] == ["c"]
+    assert [row["id"] for row in search_items(conn, "cafe")] == ["c"]
+    assert [row["id"] for row in search_items(conn, "compil*")] == ["a"]
+    assert search_items(conn, 'python "AND OR (') == []
+    assert search_items(conn, "   ") == []
+
+
+def test_index_follows_deletes_and_updates():
+    conn = _db()
+
+    conn.execute("DELETE FROM items WHERE id = 'b'")
+    conn.execute("UPDATE items SET title = 'Kotlin toolchain update' WHERE id = 'a'")
+
+    assert {row["id"] for row in search_items(conn, "python")} == {"a", "c"}
+    assert [row["id"] for row in search_items(conn, "kotlin")] == ["a"]
+
+
+def test_rebuild_indexes_items_stored_before_the_index_existed():
+    conn = _db()
+    conn.execute("DROP TABLE items_fts")
+    for trigger in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER items_fts_{trigger}")
+
+    init_db(conn)
+    assert search_items(conn, "python") == []
+
+    assert rebuild_search_index(conn) == 3
+    assert len(search_items(conn, "python")) == 3